@@ -5,14 +5,27 @@
 import multiprocessing
 import os
 
+from src.core.log import logging_config
+
 # 기본 서버 설정
-bind = "0.0.0.0:8000"  # 서버가 바인딩될 주소와 포트
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")  # 서버가 바인딩될 주소와 포트
 
 
 # Worker 설정 - 환경변수로 동기/비동기 선택 가능
-worker_type = os.environ.get("WORKER_TYPE", "async")  # "async" 또는 "sync"
-
-if worker_type == "async":
+# 설정별 처리량 / 지연 시간 / 메모리 비교: scripts/bench-workers.py
+worker_type = os.environ.get("WORKER_TYPE", "async")
+
+# 비동기 Worker 종류
+# - async: uvloop / httptools가 있으면 사용 (uvicorn[standard]), 없으면 asyncio / h11
+# - asyncio: 표준 asyncio 루프 + h11 고정
+# - uvloop: uvloop + httptools 고정
+ASYNC_WORKER_CLASSES = {
+    "async": "src.core.workers.GracefulUvicornWorker",
+    "asyncio": "src.core.workers.AsyncioH11Worker",
+    "uvloop": "src.core.workers.UvloopHttptoolsWorker",
+}
+
+if worker_type in ASYNC_WORKER_CLASSES:
     # 비동기 설정 (FastAPI async 기능 활용)
 
     # - UvicornWorker: ASGI 비동기 Worker
@@ -23,8 +36,9 @@ if worker_type == "async":
     workers = int(
         os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
     )
-    worker_class = "uvicorn.workers.UvicornWorker"
-    worker_connections = 1000  # 각 Worker가 처리할 수 있는 동시 연결 수
+    worker_class = ASYNC_WORKER_CLASSES[worker_type]
+    # 각 Worker가 처리할 수 있는 동시 연결 수
+    worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
 
 elif worker_type == "sync":
     # 동기 설정 (CPU 집약적 작업에 적합)
@@ -34,28 +48,56 @@ elif worker_type == "sync":
     # - CPU 집약적 작업에 최적화 (계산, 이미지 처리, 암호화 등)
     # - Worker 수: CPU 코어 수 (CPU 바운드 작업)
     # - 스레드: 각 Worker당 여러 스레드로 동시 처리
+    # - 주의: WSGI Worker이므로 ASGI 앱(src.main:app)은 요청을 처리하지 못함
     workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
     worker_class = "gunicorn.workers.SyncWorker"
     threads = int(os.environ.get("GUNICORN_THREADS", 2))  # 각 Worker당 스레드 수
-    worker_connections = 1000
+    worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+
+# ID 노드 설정 확인 (src/core/ids.py)
+# - NODE_ID는 모든 워커에 같은 값으로 적용되므로 워커가 1개일 때만 사용
+# - NODE_ID가 없으면 워커마다 공유 상태에서 임대하므로 memory 백엔드는 사용 불가
+#   (워커 / 컨테이너마다 따로 임대해 같은 노드 ID → 같은 PK가 생김)
+if os.environ.get("NODE_ID") and workers > 1:
+    raise RuntimeError("NODE_ID는 GUNICORN_WORKERS=1일 때만 지정할 수 있습니다.")
+if (
+    not os.environ.get("NODE_ID")
+    and os.environ.get("SHARED_STATE_BACKEND", "memory") == "memory"
+):
+    raise RuntimeError(
+        "SHARED_STATE_BACKEND=memory에서는 노드 ID를 임대할 수 없습니다. "
+        "SHARED_STATE_BACKEND=redis를 사용하거나 NODE_ID를 지정하세요."
+    )
 
 
 # 요청 처리 설정
-max_requests = 1000  # Worker가 처리할 최대 요청 수 (메모리 누수 방지)
+# Worker가 처리할 최대 요청 수 (메모리 누수 방지, 0이면 재시작하지 않음)
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
 max_requests_jitter = 50  # 재시작 시점에 랜덤성 추가 (동시 재시작 방지)
 
 
 # 로그 설정
+# - 액세스 / 에러 로그 모두 JSON 한 줄씩 stdout으로 출력 (src/core/log.py)
+# - 로그 호출은 queue에 넣기만 하고 별도 스레드가 출력 (느린 로그 파이프가 워커를 막지 않음)
+# - 액세스 로그는 앱의 RequestLogMiddleware가 request_id / 처리 시간과 함께 기록
+#   (LOG_SAMPLE_RATES로 route별 샘플링)
 accesslog = "-"  # 액세스 로그를 stdout으로 출력
 errorlog = "-"  # 에러 로그를 stdout으로 출력
-loglevel = "info"  # 로그 레벨 (debug, info, warning, error, critical)
+loglevel = os.environ.get("LOG_LEVEL", "info").lower()  # 로그 레벨
+logconfig_dict = logging_config(loglevel.upper())
 
 
 # 프로세스 관리 설정
 preload_app = True  # 앱을 미리 로드하여 메모리 사용량 최적화
-keepalive = 2  # Keep-Alive 연결 유지 시간 (초)
+# Keep-Alive 연결 유지 시간 (초)
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 2))
 timeout = 30  # Worker가 응답하지 않을 때 강제 종료 시간 (초)
-graceful_timeout = 30  # Graceful shutdown 대기 시간 (초)
+# Graceful shutdown 대기 시간 (초)
+# 앱은 같은 환경변수를 읽어 종료 시작부터 이 시간 안에 끝냄 (src/core/shutdown.py)
+# - 진행 중인 요청 대기 (WORKER_REQUEST_DRAIN_SECONDS, 기본 graceful_timeout - 15)
+# - AI 상담사 응답 대기 → 재시도 큐 저장 → write-behind 버퍼 저장 → ID 노드 임대 반환
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
 
 
 # 보안 설정
@@ -66,3 +108,15 @@ limit_request_field_size = 8190  # HTTP 헤더 필드 최대 크기
 
 # 성능 최적화 설정
 worker_tmp_dir = "/dev/shm"  # 메모리 기반 임시 디렉토리 사용 (디스크 I/O 감소)
+
+
+# Worker 종료 hook
+def worker_exit(server, worker):
+    """
+    Worker 프로세스가 끝날 때 ID 노드 임대 반환
+    - 보통은 앱 lifespan 종료에서 이미 반환 (반환은 여러 번 호출해도 안전)
+    - lifespan 종료가 끝나지 않은 경우에도 max_requests 재시작마다 임대가 쌓이지 않도록
+    """
+    from src.core.ids import id_generator
+
+    id_generator.release()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+오래된 상담 메시지를 압축 아카이브로 옮기는 배치 작업
+
+사용법:
+    python3 scripts/archive-chat-messages.py --older-than-days 30
+    python3 scripts/archive-chat-messages.py --older-than-days 90 --batch-sessions 200 --dry-run
+
+DATABASE_SHARD_URLS가 설정되어 있으면 모든 샤드를 차례로 처리합니다.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from src.core.database.sharding import chat_session_factories  # noqa: E402
+from src.apps.repository.archive import (  # noqa: E402
+    ARCHIVE_AFTER_DAYS,
+    ChatArchiveRepository,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="상담 메시지 hot/cold 아카이브 작업")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=ARCHIVE_AFTER_DAYS,
+        help=f"이 기간보다 오래된 메시지를 아카이브 (기본값: {ARCHIVE_AFTER_DAYS}일)",
+    )
+    parser.add_argument(
+        "--batch-sessions",
+        type=int,
+        default=100,
+        help="한 번에 조회할 상담 세션 수 (기본값: 100)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="대상 세션만 출력하고 아카이브하지 않음",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+    cutoff = datetime.now() - timedelta(days=args.older_than_days)
+    print(f"🗄️  {cutoff:%Y-%m-%d %H:%M} 이전 상담 메시지 아카이브 시작")
+
+    started = time.monotonic()
+    total_sessions = 0
+    total_messages = 0
+
+    session_factories = chat_session_factories()
+    for shard_no, session_factory in enumerate(session_factories):
+        if len(session_factories) > 1:
+            print(f"📦 샤드 {shard_no}")
+
+        with session_factory() as session:
+            archive_repo = ChatArchiveRepository(session=session)
+            while True:
+                session_ids = archive_repo.get_sessions_to_archive(
+                    cutoff=cutoff, limit=args.batch_sessions
+                )
+                if not session_ids:
+                    break
+
+                if args.dry_run:
+                    print(f"🔍 아카이브 대상 세션: {session_ids}")
+                    break
+
+                for session_id in session_ids:
+                    archived = archive_repo.archive_session(session_id, cutoff=cutoff)
+                    total_sessions += 1
+                    total_messages += archived
+                    print(f"  세션 {session_id}: {archived}개 메시지 아카이브")
+
+    elapsed = time.monotonic() - started
+    print(
+        f"✅ 아카이브 완료: 세션 {total_sessions}개, 메시지 {total_messages}개 "
+        f"({elapsed:.1f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
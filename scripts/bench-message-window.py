@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+메시지 윈도우 캐시 메모리 벤치마크
+
+워커 하나가 최근 메시지 N개(기본 100,000개)를 캐시할 때의 메모리 사용량과
+ChatMessageListSchema JSON 직렬화 시간을 비교합니다.
+- orm: DB에서 읽은 ChatMessage ORM 객체 (세션 identity map 포함)
+- pydantic: ChatMessageSchema 모델
+- window: MessageWindow (열 단위 배열 + 미리 인코딩한 내용)
+
+DB 서버 없이 메모리 SQLite로 실행합니다.
+
+사용법:
+    python3 scripts/bench-message-window.py
+    python3 scripts/bench-message-window.py --messages 100000 --window-size 100
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.apps.model import ChatMessage  # noqa: E402
+from src.apps.schema.response.chat import (  # noqa: E402
+    ChatMessageListSchema,
+    ChatMessageSchema,
+)
+from src.apps.service.message_window import MessageWindow  # noqa: E402
+from src.apps.service.reply import AI_COUNSELOR_RESPONSES  # noqa: E402
+
+USER_CONTENTS = [
+    "요즘 잠을 잘 못 자요.",
+    "회사에서 스트레스를 많이 받고 있어요. 어떻게 해야 할까요?",
+    "친구와 다퉜는데 먼저 연락해야 할지 모르겠어요.",
+    "I have been feeling anxious lately.",
+]
+
+
+def make_rows(total: int, window_size: int) -> list[dict]:
+    """세션마다 window_size개, 사용자/상담사 메시지가 번갈아 있는 행"""
+    random.seed(0)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for index in range(total):
+        is_user = index % 2 == 0
+        rows.append(
+            {
+                "id": index + 1,
+                "user_id": index // window_size % 1000 + 1,
+                "session_id": index // window_size + 1,
+                "message_type": "user" if is_user else "assistant",
+                "content": random.choice(
+                    USER_CONTENTS if is_user else AI_COUNSELOR_RESPONSES
+                ),
+                "created_at": start + timedelta(seconds=index, microseconds=index),
+            }
+        )
+    return rows
+
+
+def measure(build):
+    """build()가 반환한 객체가 유지하는 메모리 (현재 / 최대)와 생성 시간"""
+    # 시간은 tracemalloc 없이 따로 측정 (추적 비용이 생성 시간에 섞이지 않도록)
+    gc.collect()
+    started = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def group_by_session(items) -> list[list]:
+    sessions: dict[int, list] = {}
+    for item in items:
+        sessions.setdefault(item.session_id, []).append(item)
+    return list(sessions.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메시지 윈도우 캐시 메모리 벤치마크")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--window-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3, help="직렬화 반복 횟수")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    ChatMessage.__table__.create(engine)
+    rows = make_rows(args.messages, args.window_size)
+    with engine.begin() as connection:
+        connection.execute(insert(ChatMessage.__table__), rows)
+    print(
+        f"🧪 메시지 {args.messages:,}개 / 세션당 {args.window_size}개 "
+        f"(세션 {args.messages // args.window_size:,}개)"
+    )
+
+    db = Session(engine)
+    table = ChatMessage.__table__
+
+    def fetch_rows():
+        # 캐시를 채울 때처럼 DB에서 새로 읽은 행 (측정 후 버려짐)
+        with engine.connect() as connection:
+            return connection.execute(select(table).order_by(table.c.id)).all()
+
+    def build_orm():
+        db.expunge_all()
+        return group_by_session(db.query(ChatMessage).order_by(ChatMessage.id).all())
+
+    def build_pydantic():
+        return group_by_session(
+            ChatMessageSchema.model_validate(row, from_attributes=True)
+            for row in fetch_rows()
+        )
+
+    def build_window():
+        return [
+            MessageWindow(
+                window[0].session_id,
+                window[0].user_id,
+                (window[-1].id, len(window)),
+                window,
+                complete=True,
+            )
+            for window in group_by_session(fetch_rows())
+        ]
+
+    orm, *orm_stats = measure(build_orm)
+    pydantic, *pydantic_stats = measure(build_pydantic)
+    windows, *window_stats = measure(build_window)
+
+    # 직렬화 시간 (세션마다 ChatMessageListSchema JSON 한 번씩)
+    def serialize_orm():
+        for window in orm:
+            ChatMessageListSchema(
+                chat_messages=[
+                    ChatMessageSchema.model_validate(message) for message in window
+                ]
+            ).model_dump_json()
+
+    def serialize_pydantic():
+        for window in pydantic:
+            ChatMessageListSchema(chat_messages=window).model_dump_json()
+
+    def serialize_window():
+        for window in windows:
+            window.to_json()
+
+    def best_of(function) -> float:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    # JSON 형식이 같은지 확인
+    expected = ChatMessageListSchema(chat_messages=pydantic[0]).model_dump(mode="json")
+    assert json.loads(windows[0].to_json()) == expected, "JSON 형식이 다릅니다"
+
+    results = [
+        ("orm", orm_stats, best_of(serialize_orm)),
+        ("pydantic", pydantic_stats, best_of(serialize_pydantic)),
+        ("window", window_stats, best_of(serialize_window)),
+    ]
+    print()
+    print(
+        f"{'구현':<10}{'유지 메모리':>14}{'최대 메모리':>14}"
+        f"{'메시지당':>12}{'생성':>10}{'직렬화':>10}"
+    )
+    for name, (current, peak, build_seconds), serialize_seconds in results:
+        print(
+            f"{name:<10}{current / 2**20:>12.1f}MB{peak / 2**20:>12.1f}MB"
+            f"{current / args.messages:>10.0f}B"
+            f"{build_seconds * 1000:>8.0f}ms{serialize_seconds * 1000:>8.0f}ms"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
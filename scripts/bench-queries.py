@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Repository 조회 쿼리 Python 오버헤드 마이크로벤치마크
+
+요청마다 실행되는 조회 쿼리를 세 가지 방식으로 만들어 쿼리당 시간을 비교합니다.
+- rebuild: 요청마다 select(...) / session.query(...)를 새로 만듦 (이전 방식)
+- lambda: lambda_stmt로 감싼 쿼리 (lambda 코드 위치로 캐시)
+- cached: repository 모듈에서 한 번만 만든 쿼리 + bindparam (현재 방식)
+
+측정 항목:
+- 생성: 쿼리 객체 생성 + compiled cache 키 계산 (DB에 보내기 전 Python 비용)
+- 실행: 세션에서 실행하고 ORM 객체 / 행을 받기까지 (생성 포함)
+
+DB 서버 없이 메모리 SQLite로 실행하므로 실행 시간은 대부분 SQLAlchemy / ORM 비용입니다.
+
+사용법:
+    python3 scripts/bench-queries.py
+    python3 scripts/bench-queries.py --iterations 20000
+"""
+
+import argparse
+import gc
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from sqlalchemy import create_engine, func, insert, lambda_stmt, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.apps.model import ChatMessage, ChatSession, User  # noqa: E402
+from src.apps.repository import chat as chat_queries  # noqa: E402
+from src.apps.repository import user as user_queries  # noqa: E402
+
+USERNAME = "bench"
+USER_ID = 1
+SESSION_ID = 1
+MESSAGES = 200
+PAGE_SIZE = 20
+
+
+def seed(engine) -> None:
+    """사용자 1명, 상담 세션 1개, 메시지 MESSAGES개"""
+    for table in (User.__table__, ChatSession.__table__, ChatMessage.__table__):
+        table.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User.__table__),
+            [
+                {
+                    "id": USER_ID,
+                    "email": "bench@example.com",
+                    "username": USERNAME,
+                    "hashed_password": "-",
+                }
+            ],
+        )
+        connection.execute(
+            insert(ChatSession.__table__),
+            [{"id": SESSION_ID, "user_id": USER_ID, "title": "bench"}],
+        )
+        connection.execute(
+            insert(ChatMessage.__table__),
+            [
+                {
+                    "id": index + 1,
+                    "user_id": USER_ID,
+                    "session_id": SESSION_ID,
+                    "message_type": "user" if index % 2 == 0 else "assistant",
+                    "content": f"메시지 {index}",
+                    "created_at": datetime(2025, 1, 1),
+                }
+                for index in range(MESSAGES)
+            ],
+        )
+
+
+def rebuild_user_by_username(username=USERNAME):
+    return select(User).where(User.username == username)
+
+
+def lambda_user_by_username(username=USERNAME):
+    return lambda_stmt(lambda: select(User).where(User.username == username))
+
+
+def rebuild_session_by_id(session_id=SESSION_ID, user_id=USER_ID):
+    return select(ChatSession).where(
+        ChatSession.id == session_id, ChatSession.user_id == user_id
+    )
+
+
+def lambda_session_by_id(session_id=SESSION_ID, user_id=USER_ID):
+    return lambda_stmt(
+        lambda: select(ChatSession).where(
+            ChatSession.id == session_id, ChatSession.user_id == user_id
+        )
+    )
+
+
+def rebuild_session_version(session_id=SESSION_ID):
+    return select(func.max(ChatMessage.id), func.count(ChatMessage.id)).where(
+        ChatMessage.session_id == session_id
+    )
+
+
+def lambda_session_version(session_id=SESSION_ID):
+    return lambda_stmt(
+        lambda: select(func.max(ChatMessage.id), func.count(ChatMessage.id)).where(
+            ChatMessage.session_id == session_id
+        )
+    )
+
+
+def rebuild_session_messages(session_id=SESSION_ID, limit=PAGE_SIZE):
+    return (
+        select(ChatMessage)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.id.desc())
+        .limit(limit)
+    )
+
+
+def lambda_session_messages(session_id=SESSION_ID, limit=PAGE_SIZE):
+    return lambda_stmt(
+        lambda: select(ChatMessage)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.id.desc())
+        .limit(limit)
+    )
+
+
+# 쿼리 이름 → (rebuild, lambda, cached 쿼리 생성 함수, cached 파라미터, 결과 형태)
+# 생성 함수는 요청마다 호출되는 부분만 포함 (cached는 모듈 쿼리를 그대로 반환)
+QUERIES = {
+    "user_by_username": (
+        rebuild_user_by_username,
+        lambda_user_by_username,
+        lambda: user_queries.USER_BY_USERNAME,
+        {"username": USERNAME},
+        "scalar",
+    ),
+    "session_by_id": (
+        rebuild_session_by_id,
+        lambda_session_by_id,
+        lambda: chat_queries.SESSION_BY_ID,
+        {"session_id": SESSION_ID, "user_id": USER_ID},
+        "scalar",
+    ),
+    "session_version": (
+        rebuild_session_version,
+        lambda_session_version,
+        lambda: chat_queries.SESSION_VERSION,
+        {"session_id": SESSION_ID},
+        "one",
+    ),
+    "session_messages": (
+        rebuild_session_messages,
+        lambda_session_messages,
+        lambda: chat_queries.SESSION_MESSAGES[(False, True)],
+        {"session_id": SESSION_ID, "before_id": None, "limit": PAGE_SIZE},
+        "all",
+    ),
+}
+
+
+def run_query(db: Session, statement, params: dict, fetch: str):
+    if fetch == "scalar":
+        return db.scalar(statement, params)
+    if fetch == "one":
+        return db.execute(statement, params).one()
+    return db.scalars(statement, params).all()
+
+
+def best_of(function, iterations: int, repeat: int) -> float:
+    """iterations번 실행한 평균 시간 (µs)의 최솟값"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        timings.append((time.perf_counter() - started) / iterations * 1_000_000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Repository 조회 쿼리 오버헤드 벤치마크"
+    )
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    seed(engine)
+    db = Session(engine)
+    print(f"🧪 쿼리당 평균 시간 (µs, {args.iterations:,}회 x {args.repeat} 중 최솟값)")
+    print()
+    print(f"{'쿼리':<20}{'방식':<10}{'생성':>10}{'실행':>10}{'절감':>10}")
+
+    for name, (rebuild, lambda_, cached, params, fetch) in QUERIES.items():
+        # 세 방식의 결과가 같은지 확인
+        expected = run_query(db, rebuild(), {}, fetch)
+        for build in (lambda_, cached):
+            assert run_query(db, build(), params, fetch) == expected, name
+
+        baseline = None
+        for label, build, execute_params in (
+            ("rebuild", rebuild, {}),
+            ("lambda", lambda_, {}),
+            ("cached", cached, params),
+        ):
+            build_us = best_of(
+                lambda: build()._generate_cache_key(), args.iterations, args.repeat
+            )
+
+            def execute():
+                db.expunge_all()
+                run_query(db, build(), execute_params, fetch)
+
+            execute_us = best_of(execute, args.iterations, args.repeat)
+            baseline = baseline or execute_us
+            saved = (baseline - execute_us) / baseline * 100
+            print(
+                f"{name:<20}{label:<10}{build_us:>10.1f}{execute_us:>10.1f}"
+                f"{saved:>9.0f}%"
+            )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+gunicorn worker 설정 벤치마크
+
+worker 종류 / worker 수 / 스레드 수 / keepalive 조합마다 gunicorn을 띄우고
+채팅 트래픽을 재현해서 처리량, p50/p99 지연 시간, worker당 메모리(RSS)를 비교합니다.
+- worker 종류는 gunicorn.py의 WORKER_TYPE (async / asyncio / uvloop / sync)
+  asyncio = asyncio + h11, uvloop = uvloop + httptools (uvicorn[standard] 필요)
+- 트래픽 구성은 접근 로그(JSON, gunicorn.access)의 route별 요청 수를 그대로 사용
+  (--traffic이 없으면 기본 구성 사용)
+- 실행 환경의 DB 설정(DATABASE_URL 등)을 그대로 사용하므로 DB를 먼저 실행
+- 부하 생성기는 같은 머신의 스레드로 실행 (절대값보다 설정 간 비교용)
+
+사용법:
+    python3 scripts/bench-workers.py
+    python3 scripts/bench-workers.py --worker-type async,asyncio --workers 1,2,4 --keepalive 2,5
+    python3 scripts/bench-workers.py --traffic access.log --duration 60 --output bench-workers.md
+"""
+
+import argparse
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.client import HTTPConnection
+from pathlib import Path
+from random import Random
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+gunicorn_config = project_root / ".deploy" / "production" / "gunicorn.py"
+
+CHAT = "/api/api/chat"
+Route = Tuple[str, str]
+
+# 접근 로그가 없을 때의 트래픽 구성 (method, route) → 비율
+DEFAULT_MIX: Dict[Route, float] = {
+    ("GET", f"{CHAT}/sessions"): 30,
+    ("GET", f"{CHAT}/sessions/{{session_id}}/messages"): 40,
+    ("POST", f"{CHAT}/send"): 20,
+    ("POST", "/api/api/users/login"): 5,
+    ("GET", "/health"): 5,
+}
+SEND_ROUTE: Route = ("POST", f"{CHAT}/send")
+
+# worker 종류별로 의미 있는 스레드 수 (비동기 worker는 스레드를 쓰지 않음)
+THREADED_WORKER_TYPES = {"sync"}
+
+
+class BenchUser(NamedTuple):
+    username: str
+    password: str
+    user_id: int
+    session_id: int
+    token: str
+
+
+class Cell(NamedTuple):
+    worker_type: str
+    workers: int
+    threads: int
+    keepalive: int
+
+
+class Sample(NamedTuple):
+    route: Route
+    status: int
+    seconds: float
+
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def load_traffic(path: Path) -> Dict[Route, float]:
+    """접근 로그에서 재현 가능한 route별 요청 수"""
+    counts: Counter = Counter()
+    skipped: Counter = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("logger") != "gunicorn.access":
+                continue
+            route = (record.get("method"), record.get("route"))
+            if route in DEFAULT_MIX:
+                counts[route] += 1
+            else:
+                skipped[route] += 1
+    if not counts:
+        raise SystemExit(f"❌ {path}에서 재현할 수 있는 요청을 찾지 못했습니다.")
+    if skipped:
+        print(
+            f"ℹ️  재현하지 않는 route {len(skipped)}개 ({sum(skipped.values())}건) 제외"
+        )
+    return dict(counts)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(
+    connection: HTTPConnection,
+    method: str,
+    path: str,
+    body: Optional[dict] = None,
+    token: Optional[str] = None,
+) -> Tuple[int, bytes]:
+    headers = {}
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        headers["Content-Type"] = "application/json"
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    connection.request(method, path, body=data, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def start_server(
+    cell: Cell, port: int, max_requests: int, log_file
+) -> subprocess.Popen:
+    env = os.environ.copy()
+    env.update(
+        WORKER_TYPE=cell.worker_type,
+        GUNICORN_WORKERS=str(cell.workers),
+        GUNICORN_THREADS=str(cell.threads),
+        GUNICORN_KEEPALIVE=str(cell.keepalive),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_MAX_REQUESTS=str(max_requests),
+        # 벤치마크 중에는 느린 요청 / 5xx만 접근 로그에 기록
+        LOG_SAMPLE_DEFAULT="0",
+    )
+    # 워커마다 ID 노드를 임대하려면 워커 간 공유 상태 필요 (단일 호스트라 mmap으로 충분)
+    env.setdefault("SHARED_STATE_BACKEND", "mmap")
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", str(gunicorn_config), "src.main:app"],
+        cwd=app_path,
+        env=env,
+        stdout=log_file,
+        stderr=log_file,
+    )
+
+
+def wait_ready(port: int, process: subprocess.Popen, timeout: float = 60) -> bool:
+    """/health가 200을 반환할 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            connection = HTTPConnection("127.0.0.1", port, timeout=2)
+            status, _ = request(connection, "GET", "/health")
+            connection.close()
+            if status == 200:
+                return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    """gunicorn 마스터의 자식 프로세스 (Linux /proc)"""
+    pids = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # pid (comm) state ppid ...
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        if ppid == master_pid:
+            pids.append(int(entry.name))
+    return pids
+
+
+def rss_mb(pid: int) -> Tuple[float, float]:
+    """(현재 RSS, 최대 RSS) MB"""
+    values = {}
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return values.get("VmRSS", 0.0), values.get("VmHWM", 0.0)
+
+
+def create_users(port: int, count: int) -> List[BenchUser]:
+    """벤치마크 사용자 생성 (회원가입 → 로그인 → 첫 메시지로 상담 세션 생성)"""
+    run_id = datetime.now().strftime("%m%d%H%M%S")
+    connection = HTTPConnection("127.0.0.1", port, timeout=30)
+    users = []
+    for index in range(count):
+        username = f"bench{run_id}_{index}"
+        password = "bench-password"
+        status, body = request(
+            connection,
+            "POST",
+            "/api/api/users/register",
+            {
+                "username": username,
+                "email": f"{username}@bench.local",
+                "password": password,
+            },
+        )
+        if status != 201:
+            raise SystemExit(f"❌ 벤치마크 사용자 생성 실패: {status} {body[:200]!r}")
+        user_id = json.loads(body)["id"]
+        status, body = request(
+            connection,
+            "POST",
+            "/api/api/users/login",
+            {"username": username, "password": password},
+        )
+        token = json.loads(body)["access_token"]
+        status, body = request(
+            connection,
+            "POST",
+            f"{CHAT}/send",
+            {"user_id": user_id, "message_type": "user", "content": "벤치마크 시작"},
+            token,
+        )
+        session_id = json.loads(body)["session_id"]
+        users.append(BenchUser(username, password, user_id, session_id, token))
+    connection.close()
+    return users
+
+
+def replay(
+    connection: HTTPConnection, route: Route, user: BenchUser, index: int
+) -> int:
+    """route 하나를 사용자 데이터로 요청하고 상태 코드 반환"""
+    method, path = route
+    if route == SEND_ROUTE:
+        body = {
+            "user_id": user.user_id,
+            "session_id": user.session_id,
+            "message_type": "user",
+            "content": f"벤치마크 메시지 {index}",
+        }
+        return request(connection, method, path, body, user.token)[0]
+    if path == "/api/api/users/login":
+        body = {"username": user.username, "password": user.password}
+        return request(connection, method, path, body)[0]
+    if "{session_id}" in path:
+        path = path.format(session_id=user.session_id) + "?limit=50"
+    return request(connection, method, path, token=user.token)[0]
+
+
+def run_load(
+    port: int,
+    mix: Dict[Route, float],
+    users: List[BenchUser],
+    concurrency: int,
+    seconds: float,
+) -> Tuple[List[Sample], int]:
+    """concurrency개의 keep-alive 연결로 seconds 동안 요청 (샘플, 연결 오류 수)"""
+    routes = list(mix)
+    weights = [mix[route] for route in routes]
+    deadline = time.monotonic() + seconds
+    lock = threading.Lock()
+    samples: List[Sample] = []
+    errors = 0
+
+    def client(seed: int) -> None:
+        nonlocal errors
+        random = Random(seed)
+        local: List[Sample] = []
+        local_errors = 0
+        connection = HTTPConnection("127.0.0.1", port, timeout=60)
+        index = 0
+        while time.monotonic() < deadline:
+            route = random.choices(routes, weights)[0]
+            user = random.choice(users)
+            started = time.perf_counter()
+            try:
+                status = replay(connection, route, user, index)
+            except Exception:
+                # 서버가 keep-alive 연결을 닫은 경우 등: 다시 연결
+                local_errors += 1
+                connection.close()
+                connection = HTTPConnection("127.0.0.1", port, timeout=60)
+                continue
+            local.append(Sample(route, status, time.perf_counter() - started))
+            index += 1
+        connection.close()
+        with lock:
+            samples.extend(local)
+            errors += local_errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(client, range(concurrency)))
+    return samples, errors
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+
+
+def summarize(
+    cell: Cell, samples: List[Sample], errors: int, seconds: float, rss: List[Tuple]
+) -> dict:
+    latencies = [sample.seconds for sample in samples]
+    without_send = [s.seconds for s in samples if s.route != SEND_ROUTE]
+    statuses = Counter(sample.status for sample in samples)
+    return {
+        **cell._asdict(),
+        "requests": len(samples),
+        "rps": len(samples) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "p99_without_send_ms": percentile(without_send, 0.99) * 1000,
+        "errors": errors
+        + sum(n for code, n in statuses.items() if code >= 500 and code != 503),
+        "shed": statuses.get(503, 0),
+        "rss_mb": sum(current for current, _ in rss) / len(rss) if rss else 0.0,
+        "rss_peak_mb": max((peak for _, peak in rss), default=0.0),
+    }
+
+
+def format_report(results: List[dict], args, mix: Dict[Route, float]) -> str:
+    total = sum(mix.values())
+    lines = [
+        f"# gunicorn worker 벤치마크 ({datetime.now():%Y-%m-%d %H:%M})",
+        "",
+        f"- 동시 연결 {args.concurrency}개, 측정 {args.duration}초 (워밍업 {args.warmup}초)",
+        "- 트래픽 구성: "
+        + ", ".join(
+            f"{method} {route} {weight / total:.0%}"
+            for (method, route), weight in mix.items()
+        ),
+        "- /send는 AI 응답 지연(1-3초)을 포함하므로 p99는 /send 제외 값도 함께 표시",
+        "",
+        "| WORKER_TYPE | workers | threads | keepalive | req/s | p50 ms | p99 ms "
+        "| p99 ms (send 제외) | 오류 | 503 | RSS/worker MB | 최대 RSS MB |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for result in sorted(results, key=lambda r: r.get("rps", 0), reverse=True):
+        if result.get("failed"):
+            lines.append(
+                f"| {result['worker_type']} | {result['workers']} | {result['threads']} "
+                f"| {result['keepalive']} | 시작 실패 | | | | | | | |"
+            )
+            continue
+        lines.append(
+            f"| {result['worker_type']} | {result['workers']} | {result['threads']} "
+            f"| {result['keepalive']} | {result['rps']:.1f} | {result['p50_ms']:.1f} "
+            f"| {result['p99_ms']:.1f} | {result['p99_without_send_ms']:.1f} "
+            f"| {result['errors']} | {result['shed']} | {result['rss_mb']:.1f} "
+            f"| {result['rss_peak_mb']:.1f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn worker 설정 벤치마크")
+    parser.add_argument("--worker-type", default="async,asyncio")
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--threads", default="1", help="sync worker에만 적용")
+    parser.add_argument("--keepalive", default="2,5")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=0,
+        help="측정 중 worker 재시작 (0이면 재시작하지 않음)",
+    )
+    parser.add_argument("--traffic", type=Path, help="재현할 JSON 접근 로그")
+    parser.add_argument("--output", type=Path, default=Path("bench-workers.md"))
+    args = parser.parse_args()
+
+    mix = load_traffic(args.traffic) if args.traffic else DEFAULT_MIX
+    cells = []
+    threads = parse_list(args.threads, int)
+    for worker_type, workers, keepalive in itertools.product(
+        parse_list(args.worker_type),
+        parse_list(args.workers, int),
+        parse_list(args.keepalive, int),
+    ):
+        # 비동기 worker는 스레드 수와 관계없으므로 한 번만 측정
+        for thread_count in threads if worker_type in THREADED_WORKER_TYPES else [1]:
+            cells.append(Cell(worker_type, workers, thread_count, keepalive))
+    print(f"🧪 설정 {len(cells)}개 x {args.warmup + args.duration:.0f}초")
+
+    users: List[BenchUser] = []
+    results = []
+    log_path = args.output.with_suffix(".log")
+    with open(log_path, "w") as log_file:
+        for cell in cells:
+            print(f"▶️  {cell}")
+            port = free_port()
+            process = start_server(cell, port, args.max_requests, log_file)
+            try:
+                if not wait_ready(port, process):
+                    print(f"❌ 시작 실패 (로그: {log_path})")
+                    results.append({**cell._asdict(), "failed": True})
+                    continue
+                if not users:
+                    users = create_users(port, args.users)
+                run_load(port, mix, users, args.concurrency, args.warmup)
+                samples, errors = run_load(
+                    port, mix, users, args.concurrency, args.duration
+                )
+                rss = [rss_mb(pid) for pid in worker_pids(process.pid)]
+                result = summarize(cell, samples, errors, args.duration, rss)
+                results.append(result)
+                print(
+                    f"   {result['rps']:.1f} req/s, p99 {result['p99_ms']:.1f}ms, "
+                    f"RSS/worker {result['rss_mb']:.1f}MB"
+                )
+            finally:
+                stop_server(process)
+
+    report = format_report(results, args, mix)
+    args.output.write_text(report, encoding="utf-8")
+    print()
+    print(report)
+    print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
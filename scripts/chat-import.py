@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+상담 채팅 데이터 대량 적재 / 합성 데이터 생성 도구
+
+NDJSON 한 줄이 한 행이며, kind 필드로 테이블을 구분합니다.
+    {"kind": "user", "id": 1, "username": "...", "email": "...", "hashed_password": "..."}
+    {"kind": "session", "id": 1, "user_id": 1, "title": "...", "created_at": "..."}
+    {"kind": "message", "id": 1, "user_id": 1, "session_id": 1, "message_type": "user", ...}
+kind가 없는 행은 message로 처리합니다. (/api/chat/export NDJSON 형식과 호환)
+DATABASE_SHARD_URLS가 설정되어 있으면 session/message 행은 user_id의 샤드 DB에 적재합니다.
+
+사용법:
+    # 1만 명 × 세션 5개 × 메시지 20개 합성 데이터 생성
+    python3 scripts/chat-import.py generate --users 10000 --output seed.ndjson.gz
+
+    # 5천 행 단위 multi-row INSERT, 5만 행마다 커밋
+    python3 scripts/chat-import.py import seed.ndjson.gz --batch-size 5000 --commit-every 50000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from src.core.database.connection import SessionFactory  # noqa: E402
+from src.core.database.sharding import shard_router  # noqa: E402
+from src.core.model import Base  # noqa: E402
+from src.apps.model import User, ChatSession, ChatMessage  # noqa: E402
+from src.apps.service.reply import AI_COUNSELOR_RESPONSES  # noqa: E402
+from src.apps.service.user import UserService  # noqa: E402
+
+# kind별 대상 테이블 (FK 순서대로 flush, user는 항상 primary DB)
+TABLES = {
+    "user": User.__table__,
+    "session": ChatSession.__table__,
+    "message": ChatMessage.__table__,
+}
+
+USER_MESSAGES = [
+    "요즘 잠을 잘 못 자요.",
+    "회사 일 때문에 스트레스가 많아요.",
+    "친구와 사이가 멀어진 것 같아요.",
+    "진로 고민이 있어요.",
+    "가족과 대화하기가 어려워요.",
+    "최근에 자신감이 많이 떨어졌어요.",
+]
+
+
+def open_file(path: str, mode: str):
+    """.gz 확장자면 gzip으로 열기 ("-"는 표준 입출력)"""
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def generate(args):
+    """합성 상담 데이터 NDJSON 생성"""
+    rng = random.Random(args.seed)
+    # 모든 합성 사용자는 같은 비밀번호 (bcrypt는 한 번만 계산)
+    hashed_password = UserService().hash_password(plain_password=args.password)
+    now = datetime.now()
+
+    session_id = args.start_session_id
+    message_id = args.start_message_id
+    started = time.monotonic()
+    rows = 0
+
+    with open_file(args.output, "w") as out:
+        for offset in range(args.users):
+            user_id = args.start_user_id + offset
+            out.write(
+                json.dumps(
+                    {
+                        "kind": "user",
+                        "id": user_id,
+                        "username": f"seed_user_{user_id}",
+                        "email": f"seed_user_{user_id}@example.com",
+                        "hashed_password": hashed_password,
+                    }
+                )
+                + "\n"
+            )
+            rows += 1
+
+            for _ in range(args.sessions_per_user):
+                created_at = now - timedelta(seconds=rng.randint(0, args.days * 86400))
+                out.write(
+                    json.dumps(
+                        {
+                            "kind": "session",
+                            "id": session_id,
+                            "user_id": user_id,
+                            "title": f"채팅 {created_at:%Y-%m-%d %H:%M}",
+                            "created_at": created_at.isoformat(),
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+                rows += 1
+
+                for index in range(args.messages_per_session):
+                    is_user = index % 2 == 0
+                    content = rng.choice(
+                        USER_MESSAGES if is_user else AI_COUNSELOR_RESPONSES
+                    )
+                    created_at += timedelta(seconds=rng.randint(1, 120))
+                    out.write(
+                        json.dumps(
+                            {
+                                "kind": "message",
+                                "id": message_id,
+                                "user_id": user_id,
+                                "session_id": session_id,
+                                "message_type": "user" if is_user else "assistant",
+                                "content": content,
+                                "created_at": created_at.isoformat(),
+                            },
+                            ensure_ascii=False,
+                        )
+                        + "\n"
+                    )
+                    message_id += 1
+                    rows += 1
+                session_id += 1
+
+            if (offset + 1) % 1000 == 0:
+                print(f"  사용자 {offset + 1}/{args.users} 생성", file=sys.stderr)
+
+    elapsed = time.monotonic() - started
+    print(
+        f"✅ {rows}행 생성 완료 ({elapsed:.1f}초, {rows / max(elapsed, 1e-9):,.0f} rows/sec)",
+        file=sys.stderr,
+    )
+
+
+class BatchImporter:
+    """(kind, 대상 DB)별 버퍼에 모았다가 executemany(multi-row INSERT)로 적재"""
+
+    def __init__(self, session, batch_size: int, commit_every: int, fast: bool = False):
+        self.session = session
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.fast = fast
+        # 대상 DB: None은 primary, 숫자는 샤드 번호
+        self.shard_sessions = {}
+        self.buffers = {}
+        self.inserted = {kind: 0 for kind in TABLES}
+        self.uncommitted = 0
+        self.started = time.monotonic()
+
+    def add(self, row: dict):
+        kind = row.pop("kind", "message")
+        if kind not in TABLES:
+            raise ValueError(f"알 수 없는 kind 입니다: {kind}")
+        if row.get("created_at"):
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+
+        target = None
+        if kind != "user" and shard_router.enabled:
+            target = shard_router.shard_for_user(row["user_id"])
+
+        buffer = self.buffers.setdefault((kind, target), [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def session_for(self, target):
+        if target is None:
+            return self.session
+        if target not in self.shard_sessions:
+            session = shard_router.session_factories[target]()
+            if self.fast:
+                disable_checks(session)
+            self.shard_sessions[target] = session
+        return self.shard_sessions[target]
+
+    def flush(self):
+        # FK 순서 (user → session → message)대로 비움
+        for kind, table in TABLES.items():
+            for (buffer_kind, target), rows in self.buffers.items():
+                if buffer_kind != kind or not rows:
+                    continue
+                self.session_for(target).execute(insert(table), rows)
+                self.inserted[kind] += len(rows)
+                self.uncommitted += len(rows)
+        self.buffers = {}
+
+        if self.uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.session.commit()
+        for session in self.shard_sessions.values():
+            session.commit()
+        self.uncommitted = 0
+        total = sum(self.inserted.values())
+        elapsed = time.monotonic() - self.started
+        print(
+            f"  커밋: 사용자 {self.inserted['user']:,} / 세션 {self.inserted['session']:,} "
+            f"/ 메시지 {self.inserted['message']:,} "
+            f"({total / max(elapsed, 1e-9):,.0f} rows/sec)"
+        )
+
+    def close(self):
+        self.flush()
+        if self.uncommitted:
+            self.commit()
+        for session in self.shard_sessions.values():
+            session.close()
+
+
+def disable_checks(session):
+    """대량 적재 동안 현재 연결의 FK/UNIQUE 검사 생략 (MariaDB)"""
+    if session.get_bind().dialect.name == "mysql":
+        session.execute(text("SET foreign_key_checks = 0"))
+        session.execute(text("SET unique_checks = 0"))
+
+
+def import_file(args):
+    """NDJSON 파일을 배치 INSERT로 적재"""
+    print(
+        f"📥 '{args.file}' 적재 시작 (batch={args.batch_size}, commit={args.commit_every})"
+    )
+
+    with SessionFactory() as session:
+        if args.create_tables:
+            Base.metadata.create_all(bind=session.get_bind())
+            shard_router.create_tables()
+
+        if args.fast:
+            disable_checks(session)
+
+        importer = BatchImporter(
+            session,
+            batch_size=args.batch_size,
+            commit_every=args.commit_every,
+            fast=args.fast,
+        )
+        with open_file(args.file, "r") as source:
+            for line in source:
+                if line.strip():
+                    importer.add(json.loads(line))
+        importer.close()
+
+    total = sum(importer.inserted.values())
+    elapsed = time.monotonic() - importer.started
+    print(
+        f"✅ 적재 완료: {total:,}행 ({elapsed:.1f}초, {total / max(elapsed, 1e-9):,.0f} rows/sec)"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="상담 채팅 데이터 대량 적재 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="합성 데이터 NDJSON 생성")
+    generate_parser.add_argument("--users", type=int, default=1000)
+    generate_parser.add_argument("--sessions-per-user", type=int, default=5)
+    generate_parser.add_argument("--messages-per-session", type=int, default=20)
+    generate_parser.add_argument(
+        "--days", type=int, default=90, help="메시지 생성 시각 분포 기간 (일)"
+    )
+    generate_parser.add_argument(
+        "--start-user-id", type=int, default=1, help="기존 데이터보다 큰 값으로 지정"
+    )
+    generate_parser.add_argument("--start-session-id", type=int, default=1)
+    generate_parser.add_argument("--start-message-id", type=int, default=1)
+    generate_parser.add_argument("--password", default="password123")
+    generate_parser.add_argument("--seed", type=int, default=42)
+    generate_parser.add_argument(
+        "--output", default="-", help="출력 파일 (.gz면 압축, 기본값: stdout)"
+    )
+    generate_parser.set_defaults(func=generate)
+
+    import_parser = subparsers.add_parser("import", help="NDJSON 파일 적재")
+    import_parser.add_argument("file", help="입력 파일 (.gz 지원, '-'는 stdin)")
+    import_parser.add_argument(
+        "--batch-size", type=int, default=5000, help="INSERT 한 번에 보낼 행 수"
+    )
+    import_parser.add_argument(
+        "--commit-every", type=int, default=50000, help="커밋 단위 (행 수)"
+    )
+    import_parser.add_argument(
+        "--create-tables", action="store_true", help="테이블이 없으면 생성"
+    )
+    import_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="MariaDB에서 적재 중 FK/UNIQUE 검사 생략 (신뢰할 수 있는 데이터만)",
+    )
+    import_parser.set_defaults(func=import_file)
+
+    return parser.parse_args()
+
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+기존 MariaDB 채팅 테이블을 애플리케이션 ID(snowflake) / 샤딩 구조로 바꾸는 마이그레이션
+
+create_all은 이미 있는 테이블을 바꾸지 않으므로, 샤딩 / 전역 ID 도입 전에 만든 DB는
+이 스크립트로 한 번 변경해야 합니다 (새로 만든 DB는 필요 없음).
+
+변경 내용 (채팅 테이블이 있는 primary / 모든 샤드 DB):
+1. chat_sessions / chat_messages / chat_message_archives의 users FK 삭제
+   (users는 primary에만 있으므로 샤드에서는 FK를 둘 수 없음)
+2. ID 컬럼을 AUTO_INCREMENT 없는 BIGINT로 변경 (session_id FK는 잠시 삭제 후 다시 생성)
+3. chat_sessions.user_id 인덱스 생성 (users FK가 만들던 인덱스 대체)
+
+기존 ID는 그대로 유지됩니다 (새 ID는 시각 기반이라 항상 기존 ID보다 큼).
+실행 전 DB 백업, 실행 중에는 앱을 중지하세요.
+
+사용법:
+    python3 scripts/migrate-chat-ids.py --dry-run
+    python3 scripts/migrate-chat-ids.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from sqlalchemy import inspect, text  # noqa: E402
+
+from src.core.database.connection import engine  # noqa: E402
+from src.core.database.sharding import shard_router  # noqa: E402
+
+# 테이블 → BIGINT로 바꿀 ID 컬럼
+ID_COLUMNS = {
+    "chat_sessions": ["id"],
+    "chat_messages": ["id", "session_id"],
+    "chat_message_archives": [
+        "id",
+        "session_id",
+        "first_message_id",
+        "last_message_id",
+    ],
+}
+# 컬럼 변경 후 다시 만드는 세션 FK (테이블, FK 이름)
+SESSION_FOREIGN_KEYS = [
+    ("chat_messages", "fk_chat_messages_session_id"),
+    ("chat_message_archives", "fk_chat_message_archives_session_id"),
+]
+
+
+def migration_statements(db_engine) -> List[str]:
+    """DB의 현재 스키마를 보고 필요한 ALTER 문 목록 생성 (이미 바뀐 부분은 건너뜀)"""
+    inspector = inspect(db_engine)
+    tables = [name for name in ID_COLUMNS if inspector.has_table(name)]
+    if not tables:
+        return []
+
+    # ID 컬럼 중 AUTO_INCREMENT 없는 BIGINT가 아닌 것
+    changes = {}
+    for table in tables:
+        columns = {column["name"]: column for column in inspector.get_columns(table)}
+        changes[table] = [
+            f"MODIFY {name} BIGINT NOT NULL"
+            for name in ID_COLUMNS[table]
+            if name in columns
+            and (
+                str(columns[name]["type"]).upper() != "BIGINT"
+                or columns[name].get("autoincrement") is True
+            )
+        ]
+    alter_ids = any(changes.values())
+
+    statements = []
+    # 1. users FK 삭제, ID 컬럼을 바꿀 때는 세션 FK도 삭제 (컬럼 변경 후 다시 생성)
+    for table in tables:
+        for foreign_key in inspector.get_foreign_keys(table):
+            referred = foreign_key["referred_table"]
+            if referred == "users" or (alter_ids and referred == "chat_sessions"):
+                statements.append(
+                    f"ALTER TABLE {table} DROP FOREIGN KEY {foreign_key['name']}"
+                )
+
+    # 2. ID 컬럼을 AUTO_INCREMENT 없는 BIGINT로 변경
+    for table in tables:
+        if changes[table]:
+            statements.append(f"ALTER TABLE {table} " + ", ".join(changes[table]))
+
+    # 3. 세션 FK 다시 생성, chat_sessions.user_id 인덱스
+    for table, name in SESSION_FOREIGN_KEYS:
+        if alter_ids and table in tables and "chat_sessions" in tables:
+            statements.append(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+                "FOREIGN KEY (session_id) REFERENCES chat_sessions (id)"
+            )
+    if "chat_sessions" in tables:
+        indexed = {
+            tuple(index["column_names"])
+            for index in inspector.get_indexes("chat_sessions")
+        }
+        if ("user_id",) not in indexed:
+            statements.append(
+                "CREATE INDEX ix_chat_sessions_user_id ON chat_sessions (user_id)"
+            )
+    return statements
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="채팅 테이블 ID / FK 마이그레이션 (MariaDB)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="실행할 SQL만 출력하고 변경하지 않음",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+    databases = [("primary", engine)] + [
+        (f"샤드 {shard_no}", shard_engine)
+        for shard_no, shard_engine in enumerate(shard_router.engines)
+    ]
+    for name, db_engine in databases:
+        url = db_engine.url.render_as_string(hide_password=True)
+        if db_engine.dialect.name not in ("mysql", "mariadb"):
+            print(f"⏭️  {name}: MariaDB가 아니므로 건너뜀 ({url})")
+            continue
+
+        statements = migration_statements(db_engine)
+        if not statements:
+            print(f"✅ {name}: 변경할 내용 없음 ({url})")
+            continue
+
+        print(f"📦 {name} ({url})")
+        for statement in statements:
+            print(f"  {statement};")
+        if args.dry_run:
+            continue
+        # DDL은 MariaDB에서 문장마다 자동 커밋
+        with db_engine.connect() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+        print(f"✅ {name}: {len(statements)}개 변경 완료")
+
+
+if __name__ == "__main__":
+    main()
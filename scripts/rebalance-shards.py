@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+사용자 채팅 데이터를 다른 샤드로 옮기는 재배치 도구
+
+순서:
+1. 세션 / 메시지 / 아카이브를 대상 샤드로 복사 (복사한 원본 행 ID 기록)
+2. 샤드 디렉터리(user_shards)를 대상 샤드로 변경
+3. 워커의 디렉터리 캐시가 만료될 때까지 대기 (SHARD_DIRECTORY_CACHE_SECONDS)
+4. 대기하는 동안 원래 샤드에서 바뀐 내용을 대상 샤드에 반영
+   - 새로 저장된 행은 복사
+   - 1에서 복사한 뒤 원래 샤드에서 삭제된 행 (세션 삭제 / 아카이브)은 대상 샤드에서도 삭제
+   - 1에서 복사했지만 대상 샤드에 없는 행은 디렉터리 변경 후 삭제된 것이므로 다시 복사하지 않음
+5. 원래 샤드에서 삭제
+
+채팅 행은 저장 / 삭제만 하고 수정하지 않으므로 행 ID만으로 변경 내용을 맞출 수 있습니다.
+
+사용법:
+    python3 scripts/rebalance-shards.py status
+    python3 scripts/rebalance-shards.py move --user-id 42 --to-shard 2
+    python3 scripts/rebalance-shards.py move --user-id 42 --user-id 43 --to-shard 0 --dry-run
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Set
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from sqlalchemy import delete, func, insert, select  # noqa: E402
+
+from src.core.database.sharding import (  # noqa: E402
+    SHARD_DIRECTORY_CACHE_SECONDS,
+    UserShard,
+    shard_router,
+)
+from src.apps.model import ChatSession, ChatMessage, ChatMessageArchive  # noqa: E402
+
+# 복사 순서 (삭제는 역순)
+TABLES = [ChatSession.__table__, ChatMessage.__table__, ChatMessageArchive.__table__]
+
+
+def copy_user_rows(
+    source, target, user_id: int, batch_size: int, copied_ids: Dict[str, Set[int]]
+) -> int:
+    """
+    source 샤드의 사용자 행 중 처음 보는 행을 target에 복사 (복사한 행 수 반환)
+    - copied_ids: 테이블별로 이미 복사한 source 행 ID (복사한 행을 추가)
+    - 이미 복사한 행은 target에 없어도 다시 복사하지 않음 (target에서 삭제된 행)
+    """
+    copied = 0
+    for table in TABLES:
+        seen = copied_ids.setdefault(table.name, set())
+        last_id = 0
+        while True:
+            rows = (
+                source.execute(
+                    select(table)
+                    .where(table.c.user_id == user_id, table.c.id > last_id)
+                    .order_by(table.c.id.asc())
+                    .limit(batch_size)
+                )
+                .mappings()
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            rows = [row for row in rows if row["id"] not in seen]
+            if not rows:
+                continue
+            existing = set(
+                target.scalars(
+                    select(table.c.id).where(
+                        table.c.id.in_([row["id"] for row in rows])
+                    )
+                )
+            )
+            missing = [dict(row) for row in rows if row["id"] not in existing]
+            if missing:
+                target.execute(insert(table), missing)
+                target.commit()
+                copied += len(missing)
+            seen.update(row["id"] for row in rows)
+    return copied
+
+
+def delete_removed_rows(
+    source, target, batch_size: int, copied_ids: Dict[str, Set[int]]
+) -> int:
+    """복사한 뒤 source에서 삭제된 행을 target에서도 삭제 (삭제한 행 수 반환)"""
+    deleted = 0
+    for table in reversed(TABLES):
+        ids = sorted(copied_ids.get(table.name, ()))
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            remaining = set(
+                source.scalars(select(table.c.id).where(table.c.id.in_(batch)))
+            )
+            removed = [row_id for row_id in batch if row_id not in remaining]
+            if removed:
+                deleted += target.execute(
+                    delete(table).where(table.c.id.in_(removed))
+                ).rowcount
+                copied_ids[table.name].difference_update(removed)
+    target.commit()
+    return deleted
+
+
+def delete_user_rows(session, user_id: int) -> int:
+    deleted = 0
+    for table in reversed(TABLES):
+        deleted += session.execute(
+            delete(table).where(table.c.user_id == user_id)
+        ).rowcount
+    session.commit()
+    return deleted
+
+
+def move_user(user_id: int, to_shard: int, batch_size: int, dry_run: bool):
+    from_shard = shard_router.shard_for_user(user_id)
+    if from_shard == to_shard:
+        print(f"  사용자 {user_id}: 이미 샤드 {to_shard}에 있습니다.")
+        return
+
+    source = shard_router.session_factories[from_shard]()
+    target = shard_router.session_factories[to_shard]()
+    try:
+        if dry_run:
+            count = source.scalar(
+                select(func.count(ChatMessage.id)).where(ChatMessage.user_id == user_id)
+            )
+            print(
+                f"🔍 사용자 {user_id}: 샤드 {from_shard} → {to_shard} (메시지 {count}개)"
+            )
+            return
+
+        copied_ids: Dict[str, Set[int]] = {}
+        copied = copy_user_rows(source, target, user_id, batch_size, copied_ids)
+        shard_router.assign(user_id, to_shard)
+        print(
+            f"  사용자 {user_id}: {copied}행 복사, 디렉터리 변경 "
+            f"(캐시 만료까지 {SHARD_DIRECTORY_CACHE_SECONDS:g}초 대기)"
+        )
+        time.sleep(SHARD_DIRECTORY_CACHE_SECONDS)
+
+        removed = delete_removed_rows(source, target, batch_size, copied_ids)
+        copied = copy_user_rows(source, target, user_id, batch_size, copied_ids)
+        deleted = delete_user_rows(source, user_id)
+        print(
+            f"✅ 사용자 {user_id}: 샤드 {from_shard} → {to_shard} "
+            f"(추가 복사 {copied}행, 대기 중 삭제된 {removed}행 반영, "
+            f"원본 {deleted}행 삭제)"
+        )
+    finally:
+        source.close()
+        target.close()
+
+
+def show_status(args):
+    with shard_router.primary.connect() as connection:
+        counts = dict(
+            connection.execute(
+                select(UserShard.shard_no, func.count()).group_by(UserShard.shard_no)
+            ).all()
+        )
+    for shard_no, shard_engine in enumerate(shard_router.engines):
+        url = shard_engine.url.render_as_string(hide_password=True)
+        print(f"  샤드 {shard_no}: 사용자 {counts.get(shard_no, 0):,}명 ({url})")
+
+
+def move(args):
+    if not 0 <= args.to_shard < len(shard_router.engines):
+        print(f"❌ 샤드 번호는 0~{len(shard_router.engines) - 1} 사이여야 합니다.")
+        sys.exit(1)
+    for user_id in args.user_id:
+        move_user(user_id, args.to_shard, args.batch_size, args.dry_run)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="채팅 샤드 재배치 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    status_parser = subparsers.add_parser("status", help="샤드별 사용자 수")
+    status_parser.set_defaults(func=show_status)
+
+    move_parser = subparsers.add_parser("move", help="사용자를 다른 샤드로 이동")
+    move_parser.add_argument("--user-id", type=int, action="append", required=True)
+    move_parser.add_argument("--to-shard", type=int, required=True)
+    move_parser.add_argument("--batch-size", type=int, default=1000)
+    move_parser.add_argument("--dry-run", action="store_true")
+    move_parser.set_defaults(func=move)
+
+    return parser.parse_args()
+
+
+def main():
+    """메인 함수"""
+    if not shard_router.enabled:
+        print("❌ DATABASE_SHARD_URLS 환경변수가 설정되지 않았습니다.")
+        sys.exit(1)
+    args = parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+상담 메시지 사용량 집계 작업 (사용자 / 날짜 / 메시지 종류별 메시지 수)
+
+명령:
+- run: high-water mark 이후의 메시지를 집계 (cron 등으로 주기 실행, --loop로 반복 실행)
+- backfill: 집계를 비우고 아카이브 + 기존 메시지 전체를 다시 집계
+  (처음 배포할 때 한 번, 아카이브 작업과 동시에 실행하지 않음)
+- status: 채팅 DB별 집계 위치
+
+사용법:
+    python3 scripts/rollup-chat-usage.py run
+    python3 scripts/rollup-chat-usage.py run --loop 60
+    python3 scripts/rollup-chat-usage.py backfill
+    python3 scripts/rollup-chat-usage.py status
+
+DATABASE_SHARD_URLS가 설정되어 있으면 모든 샤드를 차례로 처리합니다.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# src 패키지를 import하기 위해 sys.path에 server/app 디렉토리 추가
+project_root = Path(__file__).resolve().parent.parent
+app_path = project_root / "server" / "app"
+if str(app_path) not in sys.path:
+    sys.path.insert(0, str(app_path))
+
+from src.core.database.connection import SessionFactory, engine  # noqa: E402
+from src.core.ids import id_to_datetime  # noqa: E402
+from src.core.model import Base  # noqa: E402
+from src.apps.repository.usage import UsageRollupRepository  # noqa: E402
+from src.apps.service.usage import (  # noqa: E402
+    USAGE_ROLLUP_BATCH_SIZE,
+    USAGE_ROLLUP_SETTLE_SECONDS,
+    UsageRollupService,
+    chat_sources,
+)
+from src.apps.model import (  # noqa: E402
+    ChatUsageDaily,
+    ChatUsageUserDaily,
+    ChatUsageWatermark,
+)
+
+USAGE_TABLES = [
+    ChatUsageUserDaily.__table__,
+    ChatUsageDaily.__table__,
+    ChatUsageWatermark.__table__,
+]
+
+
+def print_counts(counts: dict, elapsed: float) -> None:
+    for source, count in counts.items():
+        print(f"  {source}: 메시지 {count:,}개")
+    print(f"✅ 집계 완료: 메시지 {sum(counts.values()):,}개 ({elapsed:.1f}초)")
+
+
+def run(args, service: UsageRollupService):
+    while True:
+        started = time.monotonic()
+        counts = service.run(max_batches=args.max_batches)
+        print_counts(counts, time.monotonic() - started)
+        if not args.loop:
+            return
+        time.sleep(args.loop)
+
+
+def backfill(args, service: UsageRollupService):
+    print("🔄 사용량 집계 backfill 시작 (기존 집계 삭제)")
+    started = time.monotonic()
+    counts = service.backfill()
+    print_counts(counts, time.monotonic() - started)
+
+
+def show_status(args, service: UsageRollupService):
+    with SessionFactory() as session:
+        watermarks = UsageRollupRepository(session=session).get_watermarks(primary=True)
+    for source, _ in chat_sources():
+        last_id = watermarks.get(source)
+        if not last_id:
+            print(f"  {source}: 집계 전")
+            continue
+        print(
+            f"  {source}: {id_to_datetime(last_id):%Y-%m-%d %H:%M:%S} 이전 메시지까지"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="상담 메시지 사용량 집계 작업")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=USAGE_ROLLUP_BATCH_SIZE,
+        help=f"한 번에 집계하는 메시지 수 (기본값: {USAGE_ROLLUP_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=USAGE_ROLLUP_SETTLE_SECONDS,
+        help=f"최근 이 시간 동안의 메시지는 다음 실행에서 집계 "
+        f"(기본값: {USAGE_ROLLUP_SETTLE_SECONDS:g}초)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="증분 집계")
+    run_parser.add_argument(
+        "--loop", type=float, default=0, help="이 간격(초)으로 계속 실행"
+    )
+    run_parser.add_argument(
+        "--max-batches", type=int, default=None, help="채팅 DB별 최대 배치 수"
+    )
+    run_parser.set_defaults(func=run)
+
+    backfill_parser = subparsers.add_parser("backfill", help="전체 다시 집계")
+    backfill_parser.set_defaults(func=backfill)
+
+    status_parser = subparsers.add_parser("status", help="채팅 DB별 집계 위치")
+    status_parser.set_defaults(func=show_status)
+
+    return parser.parse_args()
+
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+    # 집계 테이블이 없으면 생성 (앱보다 먼저 배포된 경우, primary DB)
+    Base.metadata.create_all(bind=engine, tables=USAGE_TABLES)
+    service = UsageRollupService(
+        batch_size=args.batch_size, settle_seconds=args.settle_seconds
+    )
+    args.func(args, service)
+
+
+if __name__ == "__main__":
+    main()
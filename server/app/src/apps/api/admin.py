@@ -0,0 +1,119 @@
+"""
+관리자 진단 API
+=============
+
+운영 중인 워커의 상태를 확인하기 위한 관리자 전용 API입니다.
+- ADMIN_USERNAMES 환경변수(쉼표로 구분)에 있는 사용자만 사용 가능 (그 외 403)
+- 요청을 처리한 워커 하나만 프로파일링 (응답의 X-Worker-PID 헤더로 확인)
+- 한 워커에서 동시에 하나의 프로파일링만 실행 (실행 중이면 409)
+
+API 엔드포인트:
+- GET /profile?seconds=10: 스택 샘플링 결과 (collapsed stack, flamegraph.pl / speedscope 입력)
+- GET /memory?seconds=10&limit=20: tracemalloc 메모리 할당 상위 위치
+"""
+
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from ..model.user import User
+from ..repository.user import UserRepository
+from ..service.user import UserService, get_user_service
+from ...core.load import Priority, load_priority
+from ...core.profiler import (
+    PROFILE_INTERVAL_MS,
+    PROFILE_MAX_SECONDS,
+    ProfilerBusy,
+    profiler,
+)
+from ...security import get_access_token
+
+ADMIN_USERNAMES = {
+    username.strip()
+    for username in os.getenv("ADMIN_USERNAMES", "").split(",")
+    if username.strip()
+}
+
+router = APIRouter()
+
+
+def get_admin_user(
+    access_token: str = Depends(get_access_token),
+    user_service: UserService = Depends(get_user_service),
+    user_repo: UserRepository = Depends(),
+) -> User:
+    """관리자 사용자 확인"""
+    username: str = user_service.decode_jwt(access_token=access_token)
+    user: User = user_repo.get_user_by_username(username=username)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    if user.username not in ADMIN_USERNAMES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return user
+
+
+def profiler_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Profiling is already running on this worker",
+    )
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+@load_priority(Priority.CRITICAL)
+async def profile_stacks(
+    seconds: float = Query(default=10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(default=PROFILE_INTERVAL_MS, ge=1, le=1000),
+    idle: bool = Query(default=False),
+    admin: User = Depends(get_admin_user),
+) -> PlainTextResponse:
+    """
+    스택 샘플링 프로파일
+    =================
+    - seconds 동안 interval_ms마다 워커의 모든 스레드 스택을 기록
+    - 응답: collapsed stack ("스레드;호출자;...;함수 (파일:줄) 횟수" 한 줄씩)
+      flamegraph.pl profile.txt > profile.svg 또는 speedscope에서 바로 열기
+    - idle=true면 이벤트 루프 대기 / 유휴 스레드 스택도 포함
+    """
+    try:
+        sampler = await profiler.sample_stacks(seconds, interval_ms / 1000, idle)
+    except ProfilerBusy:
+        raise profiler_busy()
+
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "X-Worker-PID": str(os.getpid()),
+            "X-Profile-Samples": str(sampler.samples),
+        },
+    )
+
+
+@router.get("/memory")
+@load_priority(Priority.CRITICAL)
+async def memory_snapshot(
+    seconds: float = Query(default=10, ge=0, le=PROFILE_MAX_SECONDS),
+    limit: int = Query(default=20, ge=1, le=200),
+    group_by: Literal["lineno", "filename", "traceback"] = Query(default="lineno"),
+    admin: User = Depends(get_admin_user),
+) -> JSONResponse:
+    """
+    메모리 할당 상위 위치 (tracemalloc)
+    ===============================
+    - seconds > 0: 그 동안 증가한 메모리 기준 (누수 위치 확인)
+    - seconds = 0: 현재 추적 중인 할당 기준 (추적을 막 시작했다면 거의 비어 있음)
+    - group_by=traceback이면 할당 위치의 호출 스택 전체 (PROFILE_TRACEMALLOC_FRAMES 깊이)
+    """
+    try:
+        statistics = await profiler.memory_snapshot(seconds, limit, group_by)
+    except ProfilerBusy:
+        raise profiler_busy()
+
+    return JSONResponse(
+        {"pid": os.getpid(), "seconds": seconds, "statistics": statistics},
+        headers={"X-Worker-PID": str(os.getpid())},
+    )
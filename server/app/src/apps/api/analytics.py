@@ -0,0 +1,141 @@
+"""
+상담 메시지 사용량 통계 API
+======================
+
+사용자 / 날짜 / 메시지 종류별 메시지 수를 집계 테이블에서 조회합니다.
+- chat_messages를 읽지 않고 집계 테이블의 날짜 범위만 조회 (읽기 복제본)
+- 집계는 scripts/rollup-chat-usage.py가 증분으로 갱신 (updated_through 이전 메시지까지 반영)
+- 조회 기간은 최대 ANALYTICS_MAX_DAYS일 (기본: 최근 30일)
+
+API 엔드포인트:
+- GET /usage/me: 현재 사용자의 사용량
+- GET /usage/daily: 전체 날짜별 사용량과 메시지를 보낸 사용자 수 (관리자)
+- GET /usage/users/{user_id}: 특정 사용자의 사용량 (관리자)
+"""
+
+import os
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from ..model.user import User
+from ..repository.user import UserRepository
+from ..repository.usage import UsageRollupRepository
+from ..schema.response.usage import UsageDaySchema, UsageSchema
+from ..service.usage import UsageRollupService
+from ..service.user import UserService, get_user_service
+from ...core.load import Priority, load_priority
+from ...security import get_access_token
+from .admin import get_admin_user
+
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))
+ANALYTICS_DEFAULT_DAYS = 30
+
+router = APIRouter()
+
+
+def usage_period(
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+) -> tuple:
+    """조회 기간 (start ~ end, 양 끝 포함)"""
+    end = end or date.today()
+    start = start or end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="start must be <= end"
+        )
+    if (end - start).days + 1 > ANALYTICS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Period must be at most {ANALYTICS_MAX_DAYS} days",
+        )
+    return start, end
+
+
+def build_usage(
+    rows: Iterable,
+    start: date,
+    end: date,
+    rollups: UsageRollupRepository,
+    user_id: Optional[int] = None,
+    with_users: bool = False,
+) -> UsageSchema:
+    """집계 행 → 날짜별 응답"""
+    days: Dict[date, UsageDaySchema] = {}
+    totals: Counter = Counter()
+    for row in rows:
+        day = days.setdefault(
+            row.day,
+            UsageDaySchema(
+                day=row.day, message_counts={}, user_counts={} if with_users else None
+            ),
+        )
+        day.message_counts[row.message_type] = row.message_count
+        if with_users:
+            day.user_counts[row.message_type] = row.user_count
+        totals[row.message_type] += row.message_count
+
+    return UsageSchema(
+        user_id=user_id,
+        start=start,
+        end=end,
+        updated_through=UsageRollupService().freshness(rollups),
+        totals=dict(totals),
+        days=list(days.values()),
+    )
+
+
+@router.get("/usage/me", status_code=status.HTTP_200_OK, response_model=UsageSchema)
+@load_priority(Priority.LOW)
+async def get_my_usage(
+    period: tuple = Depends(usage_period),
+    access_token: str = Depends(get_access_token),
+    user_service: UserService = Depends(get_user_service),
+    user_repo: UserRepository = Depends(),
+    rollups: UsageRollupRepository = Depends(),
+) -> UsageSchema:
+    """현재 사용자의 날짜 / 메시지 종류별 메시지 수"""
+    username: str = user_service.decode_jwt(access_token=access_token)
+    user: User = user_repo.get_user_by_username(username=username)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    start, end = period
+    rows = rollups.get_user_usage(user.id, start, end)
+    return build_usage(rows, start, end, rollups, user_id=user.id)
+
+
+@router.get("/usage/daily", status_code=status.HTTP_200_OK, response_model=UsageSchema)
+@load_priority(Priority.LOW)
+async def get_daily_usage(
+    period: tuple = Depends(usage_period),
+    admin: User = Depends(get_admin_user),
+    rollups: UsageRollupRepository = Depends(),
+) -> UsageSchema:
+    """전체 날짜 / 메시지 종류별 메시지 수와 메시지를 보낸 사용자 수 (관리자)"""
+    start, end = period
+    rows = rollups.get_daily_usage(start, end)
+    return build_usage(rows, start, end, rollups, with_users=True)
+
+
+@router.get(
+    "/usage/users/{user_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=UsageSchema,
+)
+@load_priority(Priority.LOW)
+async def get_user_usage(
+    user_id: int,
+    period: tuple = Depends(usage_period),
+    admin: User = Depends(get_admin_user),
+    rollups: UsageRollupRepository = Depends(),
+) -> UsageSchema:
+    """특정 사용자의 날짜 / 메시지 종류별 메시지 수 (관리자)"""
+    start, end = period
+    rows = rollups.get_user_usage(user_id, start, end)
+    return build_usage(rows, start, end, rollups, user_id=user_id)
@@ -12,18 +12,25 @@ AI 상담 서비스 플로우:
 API 엔드포인트:
 - POST /send: 상담 메시지 전송 및 AI 응답 (핵심 - 상담방 자동 생성)
 - GET /sessions: 사용자의 상담 세션 목록 조회
-- GET /sessions/{id}/messages: 특정 상담 세션의 메시지 목록 조회
+- GET /sessions/recent-messages?session_id=1&session_id=2&limit=K: 여러 상담 세션의 최근 메시지 K개씩
+- GET /sessions/{id}/messages: 특정 상담 세션의 메시지 목록 조회 (limit/before_id 페이징)
+- GET /sessions/{id}/messages?since=<id>&wait=25: 새 메시지 long-poll
+- GET /sessions/{id}/export: 특정 상담 세션 대화 내보내기 (NDJSON/CSV 스트리밍)
+- GET /export: 사용자의 전체 상담 대화 내보내기 (NDJSON/CSV 스트리밍)
 - DELETE /sessions/{id}: 상담 세션 삭제
 
 AI 상담 UX:
 - 첫 상담 메시지 전송 → 상담방 자동 생성
 - 상담 메시지 전송 → AI 상담사 응답 (1-3초 지연)
 - 상담방 목록에서 상담 이어가기
+- 워커 종료 중에는 /send를 503으로 거절, 끝내지 못한 응답은 재시도 큐에서 저장
+- /send의 Idempotency-Key 헤더로 재시도 시 중복 저장 방지
 """
 
-import random
 import asyncio
+import logging
 from datetime import datetime
+from typing import Literal, Optional
 
 from ..model.user import User
 from ..model.chat import ChatSession, ChatMessage
@@ -35,28 +42,43 @@ from ..schema.response.chat import (
     ChatSessionListSchema,
     ChatSessionSchema,
     ChatMessageListSchema,
+    ChatSessionMessagesSchema,
+    ChatRecentMessagesSchema,
 )
-from ..service.user import UserService
+from ..service.user import UserService, get_user_service
+from ..service.export import ChatExportService
+from ..service.message_window import message_windows
+from ..service.reply import ReplyDeferred, reply_service
+from ...core.database.unit_of_work import open_unit_of_work
+from ...core.idempotency import idempotency_store, request_fingerprint
+from ...core.load import Priority, load_priority
+from ...core.pubsub import broker, session_channel
+from ...core.shutdown import worker_shutdown
+from ...core.http import is_not_modified, make_etag, not_modified, set_cache_headers
 from ...security import get_access_token
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# AI 상담사 더미 응답 데이터 (1-3초 랜덤 지연으로 실제 상담사처럼 동작)
-AI_COUNSELOR_RESPONSES = [
-    "안녕하세요! 무엇을 도와드릴까요?",
-    "좋은 질문이네요. 좀 더 자세히 설명해주시겠어요?",
-    "이해했습니다. 그런 상황이시군요.",
-    "제가 도울 수 있는 방법이 있을 것 같습니다.",
-    "흥미로운 관점이네요. 다른 각도에서 생각해보면 어떨까요?",
-    "그런 고민이 있으시는군요. 함께 해결책을 찾아보겠습니다.",
-    "좋은 아이디어입니다! 더 구체적으로 계획을 세워보시는 것은 어떨까요?",
-    "이해하기 어려운 부분이 있으시다면 언제든 말씀해주세요.",
-    "그런 상황에서는 이런 방법도 고려해볼 수 있습니다.",
-    "정말 좋은 질문입니다. 이에 대해 자세히 설명드리겠습니다.",
-]
+# 최근 메시지 일괄 조회에서 한 번에 요청할 수 있는 최대 세션 수
+RECENT_MESSAGES_MAX_SESSIONS = 50
+# long-poll 최대 대기 시간 (초, gunicorn graceful_timeout / timeout 30초보다 짧게)
+LONG_POLL_MAX_SECONDS = 25
+
 
 # POST /sessions 엔드포인트 제거
 # AI 상담 서비스처럼 상담 메시지 전송 시 자동으로 상담방 생성
@@ -66,8 +88,10 @@ AI_COUNSELOR_RESPONSES = [
     "/sessions", status_code=status.HTTP_200_OK, response_model=ChatSessionListSchema
 )
 async def get_chat_sessions(
+    request: Request,
+    response: Response,
     access_token: str = Depends(get_access_token),
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
     user_repo: UserRepository = Depends(),
     chat_repo: ChatRepository = Depends(),
 ) -> ChatSessionListSchema:
@@ -75,8 +99,9 @@ async def get_chat_sessions(
     2단계: 사용자의 AI 상담 세션 목록 조회
     ===================================
     - 현재 로그인한 사용자의 모든 AI 상담 세션 목록 반환
-    - 최신 순으로 정렬 (created_at desc)
+    - 최신 순으로 정렬 (id desc, ID가 생성 시각 순)
     - 사용자별로 격리된 상담 데이터만 조회 (보안)
+    - ETag가 If-None-Match와 같으면 목록을 조회하지 않고 304 반환
     """
     # 사용자 정보 조회
     username: str = user_service.decode_jwt(access_token=access_token)
@@ -85,6 +110,13 @@ async def get_chat_sessions(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
+
+    # 변경 여부 확인 (집계 쿼리만 사용)
+    etag = make_etag("sessions", user.id, *chat_repo.get_user_sessions_version(user.id))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
     sessions: list[ChatSession] = chat_repo.get_user_sessions(user_id=user.id)
 
     # SQLAlchemy 모델을 Pydantic 스키마로 변환
@@ -92,15 +124,72 @@ async def get_chat_sessions(
     return ChatSessionListSchema(chat_sessions=chat_sessions)
 
 
+@router.get(
+    "/sessions/recent-messages",
+    status_code=status.HTTP_200_OK,
+    response_model=ChatRecentMessagesSchema,
+)
+@load_priority(Priority.LOW)
+async def get_recent_chat_messages(
+    session_ids: list[int] = Query(
+        alias="session_id", min_length=1, max_length=RECENT_MESSAGES_MAX_SESSIONS
+    ),
+    limit: int = Query(default=1, ge=1, le=50),
+    access_token: str = Depends(get_access_token),
+    user_service: UserService = Depends(get_user_service),
+    user_repo: UserRepository = Depends(),
+    chat_repo: ChatRepository = Depends(),
+) -> ChatRecentMessagesSchema:
+    """
+    여러 AI 상담 세션의 최근 메시지 일괄 조회
+    =====================================
+    - 상담 세션마다 최근 메시지 limit개를 시간 순으로 반환 (세션 목록 미리보기)
+    - 세션별 요청 대신 ROW_NUMBER() 윈도우 함수 쿼리 한 번으로 조회
+    - 요청한 순서대로 모든 세션 ID를 반환 (중복 ID는 한 번만)
+    - 사용자 소유가 아니거나 없는 세션은 빈 목록 (보안, 존재 여부를 노출하지 않음)
+    """
+    # 사용자 정보 조회
+    username: str = user_service.decode_jwt(access_token=access_token)
+    user: User = user_repo.get_user_by_username(username=username)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    session_ids = list(dict.fromkeys(session_ids))
+    messages = chat_repo.get_recent_messages(user.id, session_ids, limit)
+
+    # SQLAlchemy 모델을 Pydantic 스키마로 변환 (빈 배열도 처리)
+    return ChatRecentMessagesSchema(
+        sessions=[
+            ChatSessionMessagesSchema(
+                session_id=session_id,
+                chat_messages=[
+                    ChatMessageSchema.model_validate(message)
+                    for message in messages[session_id]
+                ],
+            )
+            for session_id in session_ids
+        ]
+    )
+
+
 @router.get(
     "/sessions/{session_id}/messages",
     status_code=status.HTTP_200_OK,
     response_model=ChatMessageListSchema,
 )
+@load_priority(Priority.LOW, long_poll_param="since")
 async def get_chat_messages(
     session_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    before_id: Optional[int] = Query(default=None, ge=1),
+    since: Optional[int] = Query(default=None, ge=0),
+    wait: int = Query(default=0, ge=0, le=LONG_POLL_MAX_SECONDS),
     access_token: str = Depends(get_access_token),
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
     user_repo: UserRepository = Depends(),
     chat_repo: ChatRepository = Depends(),
 ) -> ChatMessageListSchema:
@@ -110,6 +199,14 @@ async def get_chat_messages(
     - 특정 AI 상담 세션의 모든 상담 메시지 조회
     - 상담 세션 소유권 확인 (보안)
     - 시간 순으로 정렬 (오래된 상담 메시지부터)
+    - limit/before_id로 최근 메시지부터 역방향 페이징
+    - limit이 없으면 hot 테이블의 메시지만 반환하고, 아카이브된 더 오래된 메시지가 있으면
+      next_before_id로 이어서 페이징 (아카이브 블록은 limit/before_id 페이징에서만 해제)
+    - ETag가 If-None-Match와 같으면 메시지 본문을 조회하지 않고 304 반환
+    - 최근 메시지(before_id 없음)는 워커의 메시지 윈도우 캐시에서 응답
+    - since가 있으면 그 이후의 새 메시지만 반환 (long-poll)
+      새 메시지가 없으면 최대 wait초(25초까지) 동안 새 메시지 알림을 기다림
+      (워커가 종료를 시작하면 빈 목록으로 바로 응답 → 클라이언트는 다시 요청)
     """
     # 사용자 정보 조회
     username: str = user_service.decode_jwt(access_token=access_token)
@@ -126,19 +223,185 @@ async def get_chat_messages(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="AI counseling session not found",
         )
+
+    # long-poll: since 이후의 새 메시지만 전달
+    if since is not None:
+        messages = await wait_for_new_messages(
+            chat_repo, session_id, user.id, since, wait
+        )
+        chat_messages = [
+            ChatMessageSchema.model_validate(message) for message in messages
+        ]
+        return ChatMessageListSchema(chat_messages=chat_messages)
+
+    # 변경 여부 확인 (최신 메시지 ID / 개수만 조회)
+    version = chat_repo.get_session_version(session_id, user.id)
+    etag = make_etag("messages", session_id, limit, before_id, *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
+    # 최근 메시지 조회는 워커 메모리의 메시지 윈도우에서 바로 JSON 응답
+    if before_id is None and message_windows.accepts(limit, version):
+        window = message_windows.get(session_id, version)
+        if window is None or not window.covers(limit):
+            messages = chat_repo.get_session_messages(
+                session_id, user.id, limit=message_windows.fetch_limit(limit)
+            )
+            window = message_windows.put(session_id, user.id, version, messages)
+            if not window.covers(limit):
+                # 윈도우보다 긴 전체 조회 또는 아카이브가 있는 세션의 전체 조회
+                return message_list(chat_repo, session_id, user.id, limit, messages)
+        return Response(
+            content=window.to_json(limit),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
+
     # Repository를 통한 메시지 조회 (시간 순)
-    messages = chat_repo.get_session_messages(session_id)
+    messages = chat_repo.get_session_messages(
+        session_id, user.id, limit=limit, before_id=before_id
+    )
+
+    return message_list(
+        chat_repo, session_id, user.id, limit, messages, before_id=before_id
+    )
+
+
+def message_list(
+    chat_repo: ChatRepository,
+    session_id: int,
+    user_id: int,
+    limit: Optional[int],
+    messages: list[ChatMessage],
+    before_id: Optional[int] = None,
+) -> ChatMessageListSchema:
+    """메시지 목록 응답 (limit 없는 조회는 아카이브를 이어서 조회할 next_before_id 포함)"""
+    next_before_id = None
+    if limit is None:
+        next_before_id = chat_repo.get_archive_cursor(
+            session_id, user_id, messages[0].id if messages else before_id
+        )
 
     # SQLAlchemy 모델을 Pydantic 스키마로 변환 (빈 배열도 처리)
     chat_messages = [ChatMessageSchema.model_validate(message) for message in messages]
-    return ChatMessageListSchema(chat_messages=chat_messages)
+    return ChatMessageListSchema(
+        chat_messages=chat_messages, next_before_id=next_before_id
+    )
+
+
+async def wait_for_new_messages(
+    chat_repo: ChatRepository, session_id: int, user_id: int, since: int, wait: int
+) -> list[ChatMessage]:
+    """
+    새 메시지 long-poll
+    - 조회 전에 먼저 구독해서 조회와 대기 사이에 저장된 메시지 알림을 놓치지 않음
+    - 대기하는 동안에는 DB 연결을 풀에 반환
+    - 워커 종료가 시작되면 기다리지 않음 (subscription.wait도 바로 False)
+    """
+    async with broker.subscribe(session_channel(session_id)) as subscription:
+        messages = chat_repo.get_messages_since(session_id, user_id, since_id=since)
+        if messages or wait == 0 or worker_shutdown.stopping:
+            return messages
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while (remaining := deadline - loop.time()) > 0:
+            chat_repo.release()
+            if not await subscription.wait(timeout=remaining):
+                break
+            messages = chat_repo.get_messages_since(session_id, user_id, since_id=since)
+            if messages:
+                return messages
+    return []
+
+
+@router.get("/sessions/{session_id}/export", status_code=status.HTTP_200_OK)
+@load_priority(Priority.LOW)
+async def export_chat_session(
+    session_id: int,
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    gzip: bool = Query(default=False),
+    access_token: str = Depends(get_access_token),
+    user_service: UserService = Depends(get_user_service),
+    user_repo: UserRepository = Depends(),
+    chat_repo: ChatRepository = Depends(),
+    export_service: ChatExportService = Depends(),
+) -> StreamingResponse:
+    """
+    특정 AI 상담 세션 대화 내보내기
+    ============================
+    - 상담 세션 소유권 확인 (보안)
+    - 서버 사이드 커서로 행을 읽는 즉시 NDJSON/CSV로 스트리밍 (메모리 사용량 일정)
+    - gzip=true이면 Content-Encoding: gzip으로 압축해서 전송
+    """
+    # 사용자 정보 조회
+    username: str = user_service.decode_jwt(access_token=access_token)
+    user: User = user_repo.get_user_by_username(username=username)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    # 상담 세션 소유권 확인 (보안 검증)
+    session = chat_repo.get_session_by_id(session_id, user.id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="AI counseling session not found",
+        )
+
+    rows = chat_repo.iter_message_rows(user_id=user.id, session_id=session_id)
+    return StreamingResponse(
+        export_service.stream(rows, export_format=format, compress=gzip),
+        media_type=export_service.media_type(format),
+        headers=export_service.headers(f"chat-session-{session_id}", format, gzip),
+    )
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+@load_priority(Priority.LOW)
+async def export_chat_history(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    gzip: bool = Query(default=False),
+    access_token: str = Depends(get_access_token),
+    user_service: UserService = Depends(get_user_service),
+    user_repo: UserRepository = Depends(),
+    chat_repo: ChatRepository = Depends(),
+    export_service: ChatExportService = Depends(),
+) -> StreamingResponse:
+    """
+    사용자의 전체 AI 상담 대화 내보내기
+    ===============================
+    - 현재 로그인한 사용자의 모든 상담 세션 메시지 (세션 순, 시간 순)
+    - 아카이브된 메시지 포함
+    - 서버 사이드 커서로 행을 읽는 즉시 NDJSON/CSV로 스트리밍 (메모리 사용량 일정)
+    """
+    # 사용자 정보 조회
+    username: str = user_service.decode_jwt(access_token=access_token)
+    user: User = user_repo.get_user_by_username(username=username)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    rows = chat_repo.iter_message_rows(user_id=user.id)
+    return StreamingResponse(
+        export_service.stream(rows, export_format=format, compress=gzip),
+        media_type=export_service.media_type(format),
+        headers=export_service.headers(f"chat-history-{user.id}", format, gzip),
+    )
 
 
 @router.post("/send", status_code=status.HTTP_200_OK, response_model=ChatMessageSchema)
+@load_priority(Priority.HIGH)
 async def send_message(
     request: ChatMessageRequest,
+    idempotency_key: Optional[str] = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
     access_token: str = Depends(get_access_token),
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
     user_repo: UserRepository = Depends(),
     chat_repo: ChatRepository = Depends(),
 ):
@@ -157,7 +420,23 @@ async def send_message(
     3. AI 상담사 응답 생성 (지연)
     4. AI 상담사 응답 저장
     5. 상담 응답 반환
+
+    재시도 (Idempotency-Key 헤더):
+    - 같은 키의 재요청은 메시지를 다시 저장하지 않고 처음 응답을 반환
+      (Idempotent-Replayed: true, 실행 중이면 끝날 때까지 대기)
+    - 같은 키로 다른 내용을 보내면 422
+
+    워커 종료 중:
+    - 새 요청은 503 + Retry-After (다른 워커로 재시도)
+    - 응답을 끝내지 못하면 202 반환, 응답은 재시도 큐를 거쳐 세션에 저장됨
+      (messages?since=<user_message_id>로 수신)
     """
+    if not reply_service.accepting:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is shutting down",
+            headers={"Retry-After": "1"},
+        )
 
     # 사용자 정보 조회
     username: str = user_service.decode_jwt(access_token=access_token)
@@ -167,10 +446,44 @@ async def send_message(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    if idempotency_key is None:
+        status_code, body = await send_and_reply(request, user.id, chat_repo)
+        return JSONResponse(status_code=status_code, content=body)
+
+    user_id = user.id
+    (status_code, body), replayed = await idempotency_store.run_once(
+        scope=str(user_id),
+        key=idempotency_key,
+        fingerprint=request_fingerprint(request.model_dump(exclude={"user_id"})),
+        handler=lambda: send_and_reply_detached(request, user_id),
+    )
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(status_code=status_code, content=body, headers=headers)
+
+
+async def send_and_reply_detached(
+    request: ChatMessageRequest, user_id: int
+) -> tuple[int, dict]:
+    """
+    요청과 분리된 task에서 send_and_reply 실행 (Idempotency-Key)
+    - 처음 요청이 끝나도 계속 실행되므로 요청의 UnitOfWork 대신 새 UnitOfWork 사용
+    """
+    with open_unit_of_work() as uow:
+        return await send_and_reply(request, user_id, ChatRepository(uow=uow))
+
+
+async def send_and_reply(
+    request: ChatMessageRequest, user_id: int, chat_repo: ChatRepository
+) -> tuple[int, dict]:
+    """
+    상담 메시지 저장 후 AI 상담사 응답 (상태 코드, 응답 본문) 반환
+    - 사용자 메시지를 저장한 뒤의 실패는 예외 대신 500 결과로 반환
+      (Idempotency-Key 재시도가 메시지를 다시 저장하지 않고 이 결과를 받도록)
+    """
     # 1. 상담 세션 확인 또는 자동 생성 (AI 상담 스타일)
     if request.session_id:
         # 기존 상담방 사용
-        session: ChatSession = chat_repo.get_session_by_id(request.session_id, user.id)
+        session: ChatSession = chat_repo.get_session_by_id(request.session_id, user_id)
         if not session:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -179,40 +492,46 @@ async def send_message(
     else:
         # 🚀 AI 상담 서비스처럼 첫 상담 메시지 전송 시 상담방 자동 생성
         session: ChatSession = ChatSession.create(
-            user_id=user.id, title=f"채팅 {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            user_id=user_id, title=f"채팅 {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         )
         session: ChatSession = chat_repo.create_session(session=session)
 
     # 2. 사용자 상담 메시지 저장
     user_message: ChatMessage = ChatMessage.create(
-        user_id=user.id,
+        user_id=user_id,
         session_id=session.id,
         message_type=request.message_type,
         content=request.content,
     )
-    user_message: ChatMessage = chat_repo.create_message(message=user_message)
-    # 3. AI 상담사 응답 생성 (1-3초 랜덤 지연으로 실제 상담사처럼 동작)
-    delay = random.uniform(1.0, 3.0)
-    await asyncio.sleep(delay)
+    user_message: ChatMessage = await chat_repo.save_message(message=user_message)
 
-    # AI의 응답 가능은 실제 AI를 사용하지 말고 임의의 더미 데이터를 답변.
-    ai_response = random.choice(AI_COUNSELOR_RESPONSES)
+    # 응답을 기다리는 동안 DB 연결을 풀에 반환
+    chat_repo.release()
 
-    # 4. AI 상담사 응답 메시지 저장
-    ai_message: ChatMessage = ChatMessage.create(
-        user_id=user.id,
-        session_id=session.id,
-        message_type="assistant",
-        content=ai_response,
-    )
-    ai_message: ChatMessage = chat_repo.create_message(message=ai_message)
+    # 3-4. AI 상담사 응답 생성 및 저장 (1-3초 랜덤 지연으로 실제 상담사처럼 동작)
+    try:
+        ai_message: ChatMessage = await reply_service.reply(user_message)
+    except ReplyDeferred:
+        return status.HTTP_202_ACCEPTED, {
+            "status": "pending",
+            # ChatMessageSchema와 같이 ID는 문자열 (JavaScript number 정밀도)
+            "session_id": str(session.id),
+            "user_message_id": str(user_message.id),
+        }
+    except Exception:
+        logger.exception(f"AI 상담사 응답 실패 (메시지 {user_message.id})")
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+            "detail": "AI counselor reply failed",
+            "session_id": str(session.id),
+            "user_message_id": str(user_message.id),
+        }
 
     # 5. 상담 응답 반환
-    return ChatMessageSchema(
+    return status.HTTP_200_OK, ChatMessageSchema(
         id=ai_message.id,
-        user_id=user.id,
+        user_id=user_id,
         session_id=session.id,
         message_type="assistant",
-        content=ai_response,
+        content=ai_message.content,
         created_at=ai_message.created_at,
-    )
+    ).model_dump(mode="json")
@@ -1,11 +1,10 @@
-import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from ..repository.user import UserRepository
 from ..schema.request import LoginRequest, SignUpRequest
 from ..schema.response import JWTResponse, UserSchema
 from ..model.user import User
-from ..service.user import UserService
+from ..service.user import UserService, get_user_service
 
 router = APIRouter()
 
@@ -15,19 +14,18 @@ router = APIRouter()
 )
 async def register(
     request: SignUpRequest,
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
     user_repo: UserRepository = Depends(),
 ):
 
     # 1. 사용자명 중복 확인
-    if user_repo.get_user_by_username(request.username):
+    if user_repo.get_user_by_username(request.username, primary=True):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken"
         )
 
     # 2. 비밀번호 해싱
     hashed_password: str = user_service.hash_password(plain_password=request.password)
-    logging.info(f"hashed_password: {hashed_password}")
     user: User = User.create(
         username=request.username, email=request.email, hashed_password=hashed_password
     )
@@ -40,7 +38,7 @@ async def register(
 @router.post("/login", status_code=status.HTTP_200_OK, response_model=JWTResponse)
 async def login(
     request: LoginRequest,
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
     user_repo: UserRepository = Depends(),
 ):
     """사용자 로그인"""
@@ -1,4 +1,14 @@
 from .user import User
-from .chat import ChatSession, ChatMessage
+from .chat import ChatSession, ChatMessage, ChatMessageArchive, ChatPendingReply
+from .usage import ChatUsageUserDaily, ChatUsageDaily, ChatUsageWatermark
 
-__all__ = ["User", "ChatSession", "ChatMessage"]
+__all__ = [
+    "User",
+    "ChatSession",
+    "ChatMessage",
+    "ChatMessageArchive",
+    "ChatPendingReply",
+    "ChatUsageUserDaily",
+    "ChatUsageDaily",
+    "ChatUsageWatermark",
+]
@@ -1,23 +1,47 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    LargeBinary,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from ..schema.request.chat import ChatSessionRequest, ChatMessageRequest
 
+from ...core.ids import generate_id
 from ...core.model import Base
 
+# 샤딩 시 users 테이블은 primary DB에만 있으므로, 채팅 테이블의 user_id에는
+# FK 제약을 두지 않고 애플리케이션에서 소유권을 확인함
+
+# id / created_at은 애플리케이션에서 정해서 INSERT (저장 후 다시 읽지 않음)
+# 같은 세션 안의 순서는 id로만 정렬 (created_at은 같은 초에 겹칠 수 있음)
+
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    id = Column(BigInteger, primary_key=True, autoincrement=False, default=generate_id)
+    user_id = Column(Integer, nullable=False, index=True)
     title = Column(String(255), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), default=datetime.now, server_default=func.now()
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 관계 설정
-    user = relationship("User", back_populates="chat_sessions")
+    user = relationship(
+        "User",
+        back_populates="chat_sessions",
+        primaryjoin="User.id == foreign(ChatSession.user_id)",
+    )
     messages = relationship("ChatMessage", back_populates="session")
 
     def __repr__(self):
@@ -25,30 +49,88 @@ class ChatSession(Base):
 
     @classmethod
     def create(cls, user_id: int, title: str) -> "ChatSession":
-        return cls(user_id=user_id, title=title)
+        return cls(
+            id=generate_id(), user_id=user_id, title=title, created_at=datetime.now()
+        )
 
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False)
+    id = Column(BigInteger, primary_key=True, autoincrement=False, default=generate_id)
+    user_id = Column(Integer, nullable=False)
+    session_id = Column(BigInteger, ForeignKey("chat_sessions.id"), nullable=False)
     message_type = Column(String(20), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), default=datetime.now, server_default=func.now()
+    )
 
     # 관계 설정
     session = relationship("ChatSession", back_populates="messages")
-    user = relationship("User")
+    user = relationship("User", primaryjoin="User.id == foreign(ChatMessage.user_id)")
 
     @classmethod
     def create(
         cls, user_id: int, session_id: int, message_type: str, content: str
     ) -> "ChatMessage":
         return cls(
+            id=generate_id(),
             session_id=session_id,
             user_id=user_id,
             message_type=message_type,
             content=content,
+            created_at=datetime.now(),
+        )
+
+
+class ChatMessageArchive(Base):
+    """오래된 상담 메시지를 세션별로 압축해 보관하는 cold 저장소"""
+
+    __tablename__ = "chat_message_archives"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False, default=generate_id)
+    user_id = Column(Integer, nullable=False)
+    session_id = Column(
+        BigInteger, ForeignKey("chat_sessions.id"), nullable=False, index=True
+    )
+    first_message_id = Column(BigInteger, nullable=False)
+    last_message_id = Column(BigInteger, nullable=False, index=True)
+    message_count = Column(Integer, nullable=False)
+    codec = Column(String(10), nullable=False)
+    # MariaDB에서는 길이에 맞춰 MEDIUMBLOB으로 생성됨
+    payload = Column(LargeBinary(length=16 * 1024 * 1024), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return (
+            f"ChatMessageArchive(id={self.id}, session_id={self.session_id}, "
+            f"messages={self.first_message_id}..{self.last_message_id})"
+        )
+
+
+class ChatPendingReply(Base):
+    """
+    워커 종료로 끝내지 못한 AI 상담사 응답 재시도 큐 (primary DB)
+    - 다른 워커가 claimed_at으로 선점한 뒤 응답을 저장하고 삭제
+    """
+
+    __tablename__ = "chat_pending_replies"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False, default=generate_id)
+    user_id = Column(Integer, nullable=False)
+    session_id = Column(BigInteger, nullable=False)
+    user_message_id = Column(BigInteger, nullable=False)
+    # 응답 메시지 ID를 미리 정해 두어 같은 응답이 두 번 저장되지 않도록 함
+    reply_message_id = Column(BigInteger, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), default=datetime.now, server_default=func.now()
+    )
+    claimed_by = Column(String(64), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    def __repr__(self):
+        return (
+            f"ChatPendingReply(id={self.id}, session_id={self.session_id}, "
+            f"user_message_id={self.user_message_id})"
         )
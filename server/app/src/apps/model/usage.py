@@ -0,0 +1,60 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from ...core.model import Base
+
+# 상담 메시지 사용량 집계 테이블 (primary DB, 읽기는 복제본)
+# chat_messages를 GROUP BY로 다시 읽지 않도록 집계 작업이 증분으로 갱신
+# (apps/service/usage.py, scripts/rollup-chat-usage.py)
+
+
+class ChatUsageUserDaily(Base):
+    """사용자 / 날짜 / 메시지 종류별 메시지 수"""
+
+    __tablename__ = "chat_usage_user_daily"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    day = Column(Date, primary_key=True)
+    message_type = Column(String(20), primary_key=True)
+    message_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"ChatUsageUserDaily(user_id={self.user_id}, day={self.day}, "
+            f"message_type={self.message_type}, count={self.message_count})"
+        )
+
+
+class ChatUsageDaily(Base):
+    """날짜 / 메시지 종류별 전체 메시지 수와 그 종류의 메시지를 보낸 사용자 수"""
+
+    __tablename__ = "chat_usage_daily"
+
+    day = Column(Date, primary_key=True)
+    message_type = Column(String(20), primary_key=True)
+    message_count = Column(Integer, nullable=False, default=0)
+    user_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"ChatUsageDaily(day={self.day}, message_type={self.message_type}, "
+            f"count={self.message_count}, users={self.user_count})"
+        )
+
+
+class ChatUsageWatermark(Base):
+    """채팅 DB(primary 또는 샤드)별로 집계를 마친 마지막 메시지 ID"""
+
+    __tablename__ = "chat_usage_watermarks"
+
+    source = Column(String(32), primary_key=True)
+    last_message_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return (
+            f"ChatUsageWatermark(source={self.source}, "
+            f"last_message_id={self.last_message_id})"
+        )
@@ -19,7 +19,11 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 관계 설정
-    chat_sessions = relationship("ChatSession", back_populates="user")
+    chat_sessions = relationship(
+        "ChatSession",
+        back_populates="user",
+        primaryjoin="User.id == foreign(ChatSession.user_id)",
+    )
 
     @classmethod
     def create(cls, username: str, email: str, hashed_password: str) -> "User":
@@ -0,0 +1,191 @@
+"""
+AI 상담 메시지 아카이브 Repository
+==============================
+
+오래된 상담 메시지를 hot 테이블(chat_messages)에서 cold 저장소(chat_message_archives)로
+옮기고, 필요할 때만 다시 읽어오는 Repository 레이어
+- 세션별로 메시지를 묶어 gzip 압축된 JSON Lines 블록으로 저장
+- 블록 하나에는 최대 CHAT_ARCHIVE_SEGMENT_SIZE 개의 메시지가 들어감
+- 읽을 때는 요청한 구간에 해당하는 블록만 해제 (lazy)
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Set
+
+from fastapi import Depends
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+
+from ...core.database.unit_of_work import get_db
+from ..model.chat import ChatMessage, ChatMessageArchive
+
+# 아카이브 설정
+ARCHIVE_AFTER_DAYS = int(os.getenv("CHAT_ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_SEGMENT_SIZE = int(os.getenv("CHAT_ARCHIVE_SEGMENT_SIZE", "500"))
+ARCHIVE_CODEC = "gzip"
+
+# 메시지 목록 요청마다 실행되는 버전 조회 (모듈에서 한 번만 생성)
+ARCHIVE_VERSION = select(
+    func.max(ChatMessageArchive.last_message_id),
+    func.coalesce(func.sum(ChatMessageArchive.message_count), 0),
+).where(ChatMessageArchive.session_id == bindparam("session_id"))
+
+
+def encode_messages(messages: Iterable[ChatMessage]) -> bytes:
+    """메시지 목록을 gzip 압축된 JSON Lines로 직렬화"""
+    lines = [
+        json.dumps(
+            {
+                "id": message.id,
+                "user_id": message.user_id,
+                "session_id": message.session_id,
+                "message_type": message.message_type,
+                "content": message.content,
+                "created_at": (
+                    message.created_at.isoformat() if message.created_at else None
+                ),
+            },
+            ensure_ascii=False,
+        )
+        for message in messages
+    ]
+    return gzip.compress("\n".join(lines).encode("utf-8"))
+
+
+def decode_messages(payload: bytes, codec: str = ARCHIVE_CODEC) -> List[ChatMessage]:
+    """압축 블록을 ChatMessage 객체 목록으로 복원 (DB 세션에 추가되지 않은 객체)"""
+    if codec != ARCHIVE_CODEC:
+        raise ValueError(f"지원하지 않는 아카이브 코덱입니다: {codec}")
+
+    messages = []
+    for line in gzip.decompress(payload).decode("utf-8").splitlines():
+        row = json.loads(line)
+        if row["created_at"]:
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+        messages.append(ChatMessage(**row))
+    return messages
+
+
+class ChatArchiveRepository:
+    """AI 상담 메시지 아카이브 Repository"""
+
+    def __init__(self, session: Session = Depends(get_db)):
+        self.session = session
+
+    def get_archived_messages(
+        self,
+        session_id: int,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[ChatMessage]:
+        """
+        아카이브된 메시지 조회 (시간 순)
+        - before_id보다 오래된 메시지만 반환
+        - limit이 있으면 필요한 블록까지만 최신 블록부터 해제
+        """
+        query = self.session.query(ChatMessageArchive).filter(
+            ChatMessageArchive.session_id == session_id
+        )
+        if before_id is not None:
+            query = query.filter(ChatMessageArchive.first_message_id < before_id)
+
+        messages: List[ChatMessage] = []
+        for archive in query.order_by(ChatMessageArchive.last_message_id.desc()):
+            segment = decode_messages(archive.payload, archive.codec)
+            if before_id is not None:
+                segment = [message for message in segment if message.id < before_id]
+            messages = segment + messages
+            if limit is not None and len(messages) >= limit:
+                return messages[-limit:]
+        return messages
+
+    def get_archive_version(self, session_id: int) -> tuple:
+        """아카이브 블록의 (최신 메시지 ID, 메시지 수) - payload는 읽지 않음"""
+        return tuple(
+            self.session.execute(ARCHIVE_VERSION, {"session_id": session_id}).one()
+        )
+
+    def get_archived_session_ids(
+        self, user_id: int, session_ids: Iterable[int]
+    ) -> Set[int]:
+        """session_ids 중 사용자의 아카이브 블록이 있는 세션 - payload는 읽지 않음"""
+        return set(
+            self.session.scalars(
+                select(ChatMessageArchive.session_id)
+                .where(
+                    ChatMessageArchive.user_id == user_id,
+                    ChatMessageArchive.session_id.in_(list(session_ids)),
+                )
+                .distinct()
+            )
+        )
+
+    def iter_archived_messages(self, session_id: int) -> Iterator[ChatMessage]:
+        """아카이브된 메시지를 블록 단위로 해제하며 순회 (시간 순)"""
+        archives = self.session.scalars(
+            select(ChatMessageArchive)
+            .where(ChatMessageArchive.session_id == session_id)
+            .order_by(ChatMessageArchive.last_message_id.asc())
+            .execution_options(yield_per=1)
+        )
+        for archive in archives:
+            yield from decode_messages(archive.payload, archive.codec)
+
+    def get_sessions_to_archive(self, cutoff: datetime, limit: int) -> List[int]:
+        """cutoff 이전 메시지를 가진 상담 세션 ID 목록"""
+        return list(
+            self.session.scalars(
+                select(ChatMessage.session_id)
+                .where(ChatMessage.created_at < cutoff)
+                .distinct()
+                .limit(limit)
+            )
+        )
+
+    def archive_session(self, session_id: int, cutoff: datetime) -> int:
+        """
+        상담 세션의 오래된 메시지를 압축 블록으로 옮김
+        - 블록 단위로 아카이브 저장과 hot 테이블 삭제를 같은 트랜잭션에서 처리
+        - 옮긴 메시지 수 반환
+        """
+        archived = 0
+        while True:
+            messages = (
+                self.session.query(ChatMessage)
+                .filter(
+                    ChatMessage.session_id == session_id,
+                    ChatMessage.created_at < cutoff,
+                )
+                .order_by(ChatMessage.id.asc())
+                .limit(ARCHIVE_SEGMENT_SIZE)
+                .all()
+            )
+            if not messages:
+                return archived
+
+            self.session.add(
+                ChatMessageArchive(
+                    user_id=messages[0].user_id,
+                    session_id=session_id,
+                    first_message_id=messages[0].id,
+                    last_message_id=messages[-1].id,
+                    message_count=len(messages),
+                    codec=ARCHIVE_CODEC,
+                    payload=encode_messages(messages),
+                )
+            )
+            self.session.query(ChatMessage).filter(
+                ChatMessage.id.in_([message.id for message in messages])
+            ).delete(synchronize_session=False)
+            self.session.commit()
+            self.session.expunge_all()
+            archived += len(messages)
+
+    def delete_session_archives(self, session_id: int) -> None:
+        """상담 세션의 아카이브 블록 삭제 (커밋은 호출자가 처리)"""
+        self.session.query(ChatMessageArchive).filter(
+            ChatMessageArchive.session_id == session_id
+        ).delete(synchronize_session=False)
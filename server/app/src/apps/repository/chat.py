@@ -5,64 +5,364 @@ AI 상담 채팅 Repository
 데이터베이스 쿼리 로직을 담당하는 Repository 레이어
 - ChatSession 관련 CRUD 작업
 - ChatMessage 관련 CRUD 작업
+- 아카이브된 메시지 투명 조회 (hot 윈도우를 넘어 limit/before_id로 페이징할 때만)
+- 여러 세션의 최근 메시지를 윈도우 함수로 한 번에 조회 (세션 목록 미리보기)
+- 대화 내보내기용 스트리밍 조회 (서버 사이드 커서)
+- 새 메시지 저장 시 세션 채널로 알림 발행 (long-poll)
 - 사용자별 데이터 격리 보장
+- 요청마다 실행되는 조회 쿼리는 모듈에서 한 번만 만들어 재사용 (값은 bindparam으로 전달)
+- 채팅 테이블은 user_id 기준 샤드 DB에서 조회 (core.database.sharding)
+- CHAT_WRITE_BEHIND=true면 메시지를 그룹 커밋 버퍼로 저장 (core.database.write_buffer)
 """
 
-from typing import List, Optional
+import logging
+import os
+from typing import Dict, Iterator, List, Optional
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session, aliased
 
-from ...core.database.connection import get_db
+from ...core.database.routing import USE_PRIMARY, mark_written
+from ...core.database.sharding import session_factory_for_user
+from ...core.database.unit_of_work import UnitOfWork, get_unit_of_work
+from ...core.database.write_buffer import GroupCommitBuffer
+from ...core.pubsub import broker, session_channel
 from ..model.chat import ChatSession, ChatMessage
 from ..model.user import User
+from .archive import ChatArchiveRepository
+
+logger = logging.getLogger(__name__)
+
+# 메시지 저장을 그룹 커밋 버퍼로 처리할지 여부
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "false").lower() == "true"
+
+# 워커 프로세스의 메시지 그룹 커밋 버퍼 (종료 시 main의 lifespan에서 drain)
+message_write_buffer = GroupCommitBuffer(ChatMessage.__table__)
+
+# 내보내기 스트리밍 시 한 번에 가져오는 행 수
+EXPORT_BATCH_SIZE = 1000
+
+# 내보내기 행에 포함되는 컬럼 (ChatMessageSchema와 같은 구성)
+EXPORT_COLUMNS = (
+    ChatMessage.id,
+    ChatMessage.user_id,
+    ChatMessage.session_id,
+    ChatMessage.message_type,
+    ChatMessage.content,
+    ChatMessage.created_at,
+)
+
+# 요청마다 실행되는 조회 쿼리 (쿼리 생성과 compiled cache 키 계산을 요청마다 반복하지 않음)
+USER_SESSIONS = (
+    select(ChatSession)
+    .where(ChatSession.user_id == bindparam("user_id"))
+    .order_by(ChatSession.id.desc())
+)
+USER_SESSIONS_VERSION = select(
+    func.count(ChatSession.id),
+    func.max(ChatSession.id),
+    func.max(ChatSession.updated_at),
+).where(ChatSession.user_id == bindparam("user_id"))
+MESSAGE_EXISTS = (
+    select(ChatMessage.id)
+    .where(ChatMessage.id == bindparam("message_id"))
+    .execution_options(**USE_PRIMARY)
+)
+SESSION_BY_ID = select(ChatSession).where(
+    ChatSession.id == bindparam("session_id"),
+    ChatSession.user_id == bindparam("user_id"),
+)
+SESSION_VERSION = select(func.max(ChatMessage.id), func.count(ChatMessage.id)).where(
+    ChatMessage.session_id == bindparam("session_id")
+)
+MESSAGES_SINCE = (
+    select(ChatMessage)
+    .where(
+        ChatMessage.session_id == bindparam("session_id"),
+        ChatMessage.id > bindparam("since_id"),
+    )
+    .order_by(ChatMessage.id.asc())
+    .limit(bindparam("limit"))
+)
+
+# 세션 메시지 조회: (before_id 조건 여부, limit 여부) → 쿼리
+_session_messages = select(ChatMessage).where(
+    ChatMessage.session_id == bindparam("session_id")
+)
+_session_messages_before = _session_messages.where(
+    ChatMessage.id < bindparam("before_id")
+)
+SESSION_MESSAGES = {
+    (False, False): _session_messages.order_by(ChatMessage.id.asc()),
+    (True, False): _session_messages_before.order_by(ChatMessage.id.asc()),
+    (False, True): _session_messages.order_by(ChatMessage.id.desc()).limit(
+        bindparam("limit")
+    ),
+    (True, True): _session_messages_before.order_by(ChatMessage.id.desc()).limit(
+        bindparam("limit")
+    ),
+}
+
+# 여러 세션의 최근 메시지: 세션별 ROW_NUMBER() 순위 (세션 ID 목록은 expanding 파라미터)
+_ranked_messages = (
+    select(
+        ChatMessage,
+        func.row_number()
+        .over(partition_by=ChatMessage.session_id, order_by=ChatMessage.id.desc())
+        .label("row_number"),
+    )
+    .join(ChatSession, ChatSession.id == ChatMessage.session_id)
+    .where(
+        ChatSession.user_id == bindparam("user_id"),
+        ChatMessage.session_id.in_(bindparam("session_ids", expanding=True)),
+    )
+    .subquery()
+)
+RECENT_MESSAGES = (
+    select(aliased(ChatMessage, _ranked_messages))
+    .where(_ranked_messages.c.row_number <= bindparam("limit"))
+    .order_by(_ranked_messages.c.session_id, _ranked_messages.c.id.asc())
+)
 
 
 class ChatRepository:
     """AI 상담 채팅 데이터 Repository"""
 
-    def __init__(self, session: Session = Depends(get_db)):
-        self.session = session
+    def __init__(self, uow: UnitOfWork = Depends(get_unit_of_work)):
+        self.uow = uow
+
+    def _session(self, user_id: int) -> Session:
+        """사용자의 채팅 데이터가 있는 샤드 DB 세션"""
+        return self.uow.for_user(user_id)
+
+    def _archive_repo(self, user_id: int) -> ChatArchiveRepository:
+        return ChatArchiveRepository(session=self._session(user_id))
+
+    def release(self) -> None:
+        """요청의 DB 연결을 풀에 반환 (다음 쿼리에서 다시 연결)"""
+        self.uow.release()
 
     def get_user_sessions(self, user_id: int) -> List[ChatSession]:
         """사용자의 모든 AI 상담 세션 조회 (최신 순)"""
-        return (
-            self.session.query(ChatSession)
-            .filter(ChatSession.user_id == user_id)
-            .order_by(ChatSession.created_at.desc())
-            .all()
+        return self._session(user_id).scalars(USER_SESSIONS, {"user_id": user_id}).all()
+
+    def get_user_sessions_version(self, user_id: int) -> tuple:
+        """상담 세션 목록 ETag용 버전 (세션 수, 최신 세션 ID, 최신 수정 시각)"""
+        return tuple(
+            self._session(user_id)
+            .execute(USER_SESSIONS_VERSION, {"user_id": user_id})
+            .one()
         )
 
     def get_session_by_id(self, session_id: int, user_id: int) -> Optional[ChatSession]:
         """특정 상담 세션 조회 (소유권 확인)"""
+        return self._session(user_id).scalar(
+            SESSION_BY_ID, {"session_id": session_id, "user_id": user_id}
+        )
+
+    def get_session_version(self, session_id: int, user_id: int) -> tuple:
+        """
+        메시지 목록 ETag용 버전 (최신 메시지 ID, 메시지 수)
+        - 메시지 본문은 읽지 않는 집계 쿼리만 사용
+        - 아카이브로 옮겨진 메시지도 같은 버전이 되도록 합산
+        """
+        latest_id, count = (
+            self._session(user_id)
+            .execute(SESSION_VERSION, {"session_id": session_id})
+            .one()
+        )
+        archived_latest_id, archived_count = self._archive_repo(
+            user_id
+        ).get_archive_version(session_id)
+        return (latest_id or archived_latest_id, count + archived_count)
+
+    def get_session_messages(
+        self,
+        session_id: int,
+        user_id: int,
+        limit: Optional[int] = None,
+        before_id: Optional[int] = None,
+    ) -> List[ChatMessage]:
+        """
+        특정 상담 세션의 메시지 조회 (시간 순)
+        - limit이 없으면 hot 테이블의 메시지만 반환 (아카이브는 get_archive_cursor로 이어서 페이징)
+        - limit이 있으면 before_id 이전의 최근 limit개 반환
+        - hot 테이블로 페이지를 채우지 못할 때만 아카이브 블록을 해제
+        """
+        query = SESSION_MESSAGES[(before_id is not None, limit is not None)]
+        messages = (
+            self._session(user_id)
+            .scalars(
+                query,
+                {"session_id": session_id, "before_id": before_id, "limit": limit},
+            )
+            .all()
+        )
+        if limit is None:
+            return messages
+        messages.reverse()
+        if len(messages) == limit:
+            return messages
+
+        archived = self._archive_repo(user_id).get_archived_messages(
+            session_id,
+            before_id=messages[0].id if messages else before_id,
+            limit=limit - len(messages),
+        )
+        return archived + messages
+
+    def get_archive_cursor(
+        self, session_id: int, user_id: int, oldest_id: Optional[int]
+    ) -> Optional[int]:
+        """
+        limit 없는 조회 뒤에 아카이브된 메시지를 이어서 조회할 before_id (없으면 None)
+        - oldest_id: 응답한 가장 오래된 메시지 ID (없으면 아카이브 전체부터)
+        - 아카이브 블록의 집계만 조회 (payload는 읽지 않음)
+        """
+        archived_latest_id, _ = self._archive_repo(user_id).get_archive_version(
+            session_id
+        )
+        if archived_latest_id is None:
+            return None
+        return oldest_id if oldest_id is not None else archived_latest_id + 1
+
+    def get_recent_messages(
+        self, user_id: int, session_ids: List[int], limit: int
+    ) -> Dict[int, List[ChatMessage]]:
+        """
+        여러 상담 세션의 최근 메시지 limit개씩 (세션 ID → 시간 순 메시지)
+        - ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY id DESC)로 한 번에 조회
+        - 사용자 소유가 아닌 세션의 메시지는 조회하지 않음 (빈 목록)
+        - hot 테이블로 limit개를 채우지 못한 세션만 아카이브에서 보충
+        """
+        messages: Dict[int, List[ChatMessage]] = {
+            session_id: [] for session_id in session_ids
+        }
+        for message in self._session(user_id).scalars(
+            RECENT_MESSAGES,
+            {"user_id": user_id, "session_ids": session_ids, "limit": limit},
+        ):
+            messages[message.session_id].append(message)
+
+        short = [
+            session_id
+            for session_id, session_messages in messages.items()
+            if len(session_messages) < limit
+        ]
+        if short:
+            archive_repo = self._archive_repo(user_id)
+            for session_id in archive_repo.get_archived_session_ids(user_id, short):
+                session_messages = messages[session_id]
+                messages[session_id] = (
+                    archive_repo.get_archived_messages(
+                        session_id,
+                        before_id=session_messages[0].id if session_messages else None,
+                        limit=limit - len(session_messages),
+                    )
+                    + session_messages
+                )
+        return messages
+
+    def has_message(self, user_id: int, message_id: int) -> bool:
+        """메시지가 저장되어 있는지 (재시도 응답 중복 확인용, 복제 지연 없이 primary에서 조회)"""
         return (
-            self.session.query(ChatSession)
-            .filter(ChatSession.id == session_id, ChatSession.user_id == user_id)
-            .first()
+            self._session(user_id).scalar(MESSAGE_EXISTS, {"message_id": message_id})
+            is not None
         )
 
-    def get_session_messages(self, session_id: int) -> List[ChatMessage]:
-        """특정 상담 세션의 모든 메시지 조회 (시간 순)"""
+    def get_messages_since(
+        self, session_id: int, user_id: int, since_id: int, limit: int = 100
+    ) -> List[ChatMessage]:
+        """since_id 이후에 저장된 새 메시지 조회 (시간 순, hot 테이블만)"""
         return (
-            self.session.query(ChatMessage)
-            .filter(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at.asc())
+            self._session(user_id)
+            .scalars(
+                MESSAGES_SINCE,
+                {"session_id": session_id, "since_id": since_id, "limit": limit},
+            )
             .all()
         )
 
+    def iter_message_rows(
+        self,
+        user_id: int,
+        session_id: Optional[int] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[dict]:
+        """
+        대화 내보내기용 메시지 행 스트리밍 (세션 순, 시간 순)
+        - ORM 객체 대신 컬럼 행만 조회
+        - stream_results 서버 사이드 커서로 batch_size씩 가져와 메모리 사용량 일정 유지
+        - 세션마다 아카이브 블록을 먼저, hot 테이블 행을 나중에 반환
+        """
+        sessions_query = (
+            select(ChatSession.id)
+            .where(ChatSession.user_id == user_id)
+            .order_by(ChatSession.id.asc())
+        )
+        if session_id is not None:
+            sessions_query = sessions_query.where(ChatSession.id == session_id)
+
+        db_session = self._session(user_id)
+        archive_repo = ChatArchiveRepository(session=db_session)
+        for chat_session_id in list(db_session.scalars(sessions_query)):
+            for message in archive_repo.iter_archived_messages(chat_session_id):
+                yield {
+                    column.key: getattr(message, column.key)
+                    for column in EXPORT_COLUMNS
+                }
+
+            rows = db_session.execute(
+                select(*EXPORT_COLUMNS)
+                .where(ChatMessage.session_id == chat_session_id)
+                .order_by(ChatMessage.id.asc())
+                .execution_options(stream_results=True, yield_per=batch_size)
+            )
+            for row in rows.mappings():
+                yield dict(row)
+
     def create_session(self, session: ChatSession) -> ChatSession:
-        """새로운 상담 세션 생성"""
-        self.session.add(instance=session)
-        self.session.commit()
-        self.session.refresh(instance=session)
+        """새로운 상담 세션 생성 (id / created_at은 생성 시 정해지므로 다시 읽지 않음)"""
+        db_session = self._session(session.user_id)
+        db_session.add(instance=session)
+        db_session.commit()
         return session
 
     def create_message(self, message: ChatMessage) -> ChatMessage:
-        """새로운 메시지 생성"""
-        self.session.add(instance=message)
-        self.session.commit()
-        self.session.refresh(instance=message)
+        """새로운 메시지 생성 (커밋 후 세션 채널로 알림 발행)"""
+        db_session = self._session(message.user_id)
+        db_session.add(instance=message)
+        db_session.commit()
+        self._publish_message(message)
         return message
 
+    async def save_message(self, message: ChatMessage) -> ChatMessage:
+        """
+        새로운 메시지 저장 (비동기 엔드포인트용)
+        - CHAT_WRITE_BEHIND=true면 그룹 커밋 버퍼에 넣고 커밋될 때까지 대기
+        - 아니면 (또는 워커 종료 중이면) create_message와 같이 바로 커밋
+        """
+        if not CHAT_WRITE_BEHIND or not message_write_buffer.accepting:
+            return self.create_message(message)
+
+        row = {
+            column.key: getattr(message, column.key)
+            for column in ChatMessage.__table__.columns
+        }
+        await message_write_buffer.submit(
+            session_factory_for_user(message.user_id), row
+        )
+        mark_written(self._session(message.user_id))
+        self._publish_message(message)
+        return message
+
+    def _publish_message(self, message: ChatMessage) -> None:
+        try:
+            broker.publish(session_channel(message.session_id), str(message.id))
+        except Exception as e:
+            # 알림 실패는 long-poll 대기 시간 초과로 보완되므로 저장을 실패시키지 않음
+            logger.warning(f"새 메시지 알림 발행 실패: {e}")
+
     def delete_session(self, session: ChatSession) -> bool:
         """상담 세션 삭제 (관련 메시지도 함께 삭제)"""
         # 세션 소유권 확인
@@ -71,10 +371,14 @@ class ChatRepository:
             return False
 
         # 관련 메시지들 삭제
-        self.session.query(ChatMessage).filter(
+        db_session = self._session(session.user_id)
+        db_session.query(ChatMessage).filter(
             ChatMessage.session_id == session.id
         ).delete()
+        self._archive_repo(session.user_id).delete_session_archives(
+            session_id=session.id
+        )
         # 세션 삭제
-        self.session.delete(instance=session)
-        self.session.commit()
+        db_session.delete(instance=session)
+        db_session.commit()
         return True
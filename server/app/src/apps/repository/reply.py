@@ -0,0 +1,95 @@
+"""
+AI 상담사 응답 재시도 큐 Repository
+==============================
+
+워커 종료로 끝내지 못한 응답을 chat_pending_replies에 저장하고,
+다른 워커가 선점(claim)해서 처리하는 Repository 레이어
+- 선점은 조건부 UPDATE로 처리해 같은 응답을 두 워커가 처리하지 않음
+- 선점한 워커가 처리 중에 죽으면 REPLY_CLAIM_TIMEOUT_SECONDS 후 다시 선점 가능
+- 저장 직전에 응답 메시지 ID를 새로 배정해 큐에 먼저 기록 (rekey)
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import Depends
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ...core.database.unit_of_work import get_db
+from ...core.database.routing import USE_PRIMARY
+from ..model.chat import ChatPendingReply
+
+REPLY_CLAIM_TIMEOUT_SECONDS = float(os.getenv("REPLY_CLAIM_TIMEOUT_SECONDS", "60"))
+
+
+class PendingReplyRepository:
+    """AI 상담사 응답 재시도 큐 Repository"""
+
+    def __init__(self, session: Session = Depends(get_db)):
+        self.session = session
+
+    def add_all(self, replies: List[ChatPendingReply]) -> None:
+        self.session.add_all(replies)
+        self.session.commit()
+
+    def claim(self, owner: str, limit: int) -> List[ChatPendingReply]:
+        """처리할 응답을 최대 limit개 선점"""
+        now = datetime.now()
+        claimable = or_(
+            ChatPendingReply.claimed_at.is_(None),
+            ChatPendingReply.claimed_at
+            < now - timedelta(seconds=REPLY_CLAIM_TIMEOUT_SECONDS),
+        )
+        candidates = self.session.scalars(
+            select(ChatPendingReply)
+            .where(claimable)
+            .order_by(ChatPendingReply.id.asc())
+            .limit(limit)
+            .execution_options(**USE_PRIMARY)
+        ).all()
+
+        claimed = []
+        for reply in candidates:
+            # 조회한 뒤 다른 워커가 먼저 선점했으면 rowcount가 0
+            result = self.session.execute(
+                update(ChatPendingReply)
+                .where(ChatPendingReply.id == reply.id, claimable)
+                .values(claimed_by=owner, claimed_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+            if result.rowcount == 1:
+                claimed.append(reply)
+        return claimed
+
+    def rekey(self, reply: ChatPendingReply, owner: str, reply_message_id: int) -> bool:
+        """
+        선점한 응답에 새 응답 메시지 ID 배정 (선점이 아직 유효할 때만, 배정했으면 True)
+        - 선점 시간이 지나 다른 워커가 가져갔으면 rowcount가 0
+        """
+        result = self.session.execute(
+            update(ChatPendingReply)
+            .where(
+                ChatPendingReply.id == reply.id,
+                ChatPendingReply.claimed_by == owner,
+                ChatPendingReply.claimed_at
+                >= datetime.now() - timedelta(seconds=REPLY_CLAIM_TIMEOUT_SECONDS),
+                ChatPendingReply.reply_message_id == reply.reply_message_id,
+            )
+            .values(reply_message_id=reply_message_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        if result.rowcount != 1:
+            return False
+        set_committed_value(reply, "reply_message_id", reply_message_id)
+        return True
+
+    def delete(self, reply_id: int) -> None:
+        self.session.execute(
+            delete(ChatPendingReply).where(ChatPendingReply.id == reply_id)
+        )
+        self.session.commit()
@@ -0,0 +1,197 @@
+"""
+상담 메시지 사용량 집계 Repository
+=============================
+
+사용자 / 날짜 / 메시지 종류별 메시지 수 집계 테이블 (primary DB)
+- 조회는 집계 테이블의 기본 키 범위만 읽음 (chat_messages 크기와 관계없음)
+- 조회 쿼리는 읽기 복제본에서 실행되어 채팅 요청과 primary를 나눠 쓰지 않음
+- 집계 반영은 채팅 DB(primary 또는 샤드)별 high-water mark를 조건부로 올리는 트랜잭션에서 실행
+  → 같은 구간을 두 작업이 동시에 반영하면 한쪽만 커밋됨 (중복 집계 방지)
+"""
+
+from datetime import date
+from typing import Dict, List, Tuple
+
+from fastapi import Depends
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ...core.database.routing import USE_PRIMARY
+from ...core.database.unit_of_work import get_db
+from ..model.usage import ChatUsageDaily, ChatUsageUserDaily, ChatUsageWatermark
+
+# (user_id, day, message_type) → 메시지 수
+UsageCounts = Dict[Tuple[int, date, str], int]
+
+
+class UsageRollupRepository:
+    """상담 메시지 사용량 집계 Repository"""
+
+    def __init__(self, session: Session = Depends(get_db)):
+        self.session = session
+
+    def get_user_usage(
+        self, user_id: int, start: date, end: date
+    ) -> List[ChatUsageUserDaily]:
+        """사용자의 날짜 / 메시지 종류별 메시지 수 (start ~ end, 날짜 순)"""
+        return list(
+            self.session.scalars(
+                select(ChatUsageUserDaily)
+                .where(
+                    ChatUsageUserDaily.user_id == user_id,
+                    ChatUsageUserDaily.day.between(start, end),
+                )
+                .order_by(ChatUsageUserDaily.day, ChatUsageUserDaily.message_type)
+            )
+        )
+
+    def get_daily_usage(self, start: date, end: date) -> List[ChatUsageDaily]:
+        """전체 날짜 / 메시지 종류별 메시지 수 (start ~ end, 날짜 순)"""
+        return list(
+            self.session.scalars(
+                select(ChatUsageDaily)
+                .where(ChatUsageDaily.day.between(start, end))
+                .order_by(ChatUsageDaily.day, ChatUsageDaily.message_type)
+            )
+        )
+
+    def get_watermarks(self, primary: bool = False) -> Dict[str, int]:
+        """채팅 DB별 집계를 마친 마지막 메시지 ID"""
+        query = select(ChatUsageWatermark.source, ChatUsageWatermark.last_message_id)
+        if primary:
+            query = query.execution_options(**USE_PRIMARY)
+        return dict(self.session.execute(query).all())
+
+    def get_watermark(self, source: str) -> int:
+        """집계 작업 시작 위치 (없으면 0으로 생성, 항상 primary에서 조회)"""
+        watermark = self.get_watermarks(primary=True).get(source)
+        if watermark is not None:
+            return watermark
+        try:
+            self.session.execute(
+                insert(ChatUsageWatermark).values(source=source, last_message_id=0)
+            )
+            self.session.commit()
+        except IntegrityError:
+            # 다른 작업이 먼저 생성한 경우
+            self.session.rollback()
+            return self.get_watermarks(primary=True)[source]
+        return 0
+
+    def apply(
+        self, source: str, after_id: int, last_id: int, counts: UsageCounts
+    ) -> bool:
+        """
+        after_id < id <= last_id 구간의 집계를 반영하고 high-water mark를 last_id로 변경
+        - high-water mark가 after_id가 아니면 (다른 작업이 먼저 반영) 반영하지 않고 False
+        - 집계 행은 UPDATE ... SET count = count + n 으로 갱신 (다른 샤드 작업과 동시 실행 가능)
+        """
+        try:
+            # high-water mark를 먼저 변경해 같은 채팅 DB의 반영 작업을 직렬화
+            moved = self.session.execute(
+                update(ChatUsageWatermark)
+                .where(
+                    ChatUsageWatermark.source == source,
+                    ChatUsageWatermark.last_message_id == after_id,
+                )
+                .values(last_message_id=last_id)
+            ).rowcount
+            if not moved:
+                self.session.rollback()
+                return False
+            if counts:
+                self._add_counts(counts)
+            self.session.commit()
+            return True
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def _add_counts(self, counts: UsageCounts) -> None:
+        user_days = list({(user_id, day) for user_id, day, _ in counts})
+        existing = set(
+            self.session.execute(
+                select(
+                    ChatUsageUserDaily.user_id,
+                    ChatUsageUserDaily.day,
+                    ChatUsageUserDaily.message_type,
+                )
+                .where(
+                    tuple_(ChatUsageUserDaily.user_id, ChatUsageUserDaily.day).in_(
+                        user_days
+                    )
+                )
+                .execution_options(**USE_PRIMARY)
+            ).all()
+        )
+
+        # 날짜 / 메시지 종류별 [메시지 수, 처음 집계되는 사용자 수]
+        daily: Dict[Tuple[date, str], List[int]] = {}
+        for (user_id, day, message_type), count in counts.items():
+            totals = daily.setdefault((day, message_type), [0, 0])
+            totals[0] += count
+            if (user_id, day, message_type) not in existing:
+                totals[1] += 1
+        existing_daily = set(
+            self.session.execute(
+                select(ChatUsageDaily.day, ChatUsageDaily.message_type)
+                .where(
+                    tuple_(ChatUsageDaily.day, ChatUsageDaily.message_type).in_(
+                        list(daily)
+                    )
+                )
+                .execution_options(**USE_PRIMARY)
+            ).all()
+        )
+
+        self._upsert(
+            ChatUsageUserDaily,
+            {key: {"message_count": count} for key, count in counts.items()},
+            existing,
+        )
+        self._upsert(
+            ChatUsageDaily,
+            {
+                key: {"message_count": message_count, "user_count": user_count}
+                for key, (message_count, user_count) in daily.items()
+            },
+            existing_daily,
+        )
+
+    def _upsert(self, model, increments: Dict[tuple, dict], existing: set) -> None:
+        """기존 행은 값을 더하고, 없는 행은 INSERT (동시에 INSERT하면 IntegrityError)"""
+        key_columns = [column for column in model.__table__.primary_key.columns]
+        new_rows = []
+        for key, values in increments.items():
+            if key in existing:
+                self.session.execute(
+                    update(model)
+                    .where(
+                        *(column == value for column, value in zip(key_columns, key))
+                    )
+                    .values(
+                        {
+                            name: getattr(model, name) + value
+                            for name, value in values.items()
+                        }
+                    )
+                )
+            else:
+                new_rows.append(
+                    {
+                        **{
+                            column.key: value for column, value in zip(key_columns, key)
+                        },
+                        **values,
+                    }
+                )
+        if new_rows:
+            self.session.execute(insert(model), new_rows)
+
+    def reset(self) -> None:
+        """모든 집계와 high-water mark 삭제 (backfill 전)"""
+        self.session.execute(delete(ChatUsageUserDaily))
+        self.session.execute(delete(ChatUsageDaily))
+        self.session.execute(delete(ChatUsageWatermark))
+        self.session.commit()
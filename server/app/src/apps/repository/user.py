@@ -1,14 +1,26 @@
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
-from ...core.database.connection import get_db
+from ...core.database.unit_of_work import UnitOfWork, get_unit_of_work
+from ...core.database.routing import USE_PRIMARY
 from ..model.user import User
 
+# 요청마다 실행되는 조회 쿼리는 모듈에서 한 번만 만들어 재사용
+# (쿼리 생성과 compiled cache 키 계산을 요청마다 반복하지 않음, 값은 bindparam으로 전달)
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+USER_BY_USERNAME_PRIMARY = USER_BY_USERNAME.execution_options(**USE_PRIMARY)
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
 
 class UserRepository:
-    def __init__(self, session: Session = Depends(get_db)):
-        self.session = session
+    def __init__(self, uow: UnitOfWork = Depends(get_unit_of_work)):
+        self.uow = uow
+
+    @property
+    def session(self) -> Session:
+        # 처음 쿼리할 때 요청의 DB 세션 생성
+        return self.uow.session
 
     def save_user(self, user: User) -> User:
         self.session.add(instance=user)
@@ -16,8 +28,10 @@ class UserRepository:
         self.session.refresh(instance=user)
         return user
 
-    def get_user_by_username(self, username: str) -> User:
-        return self.session.scalar(select(User).where(User.username == username))
+    def get_user_by_username(self, username: str, primary: bool = False) -> User:
+        """primary=True면 복제 지연 없이 primary에서 조회 (회원가입 / 로그인)"""
+        query = USER_BY_USERNAME_PRIMARY if primary else USER_BY_USERNAME
+        return self.session.scalar(query, {"username": username})
 
     def get_user_by_id(self, user_id: str) -> User:
-        return self.session.scalar(select(User).where(User.id == user_id))
+        return self.session.scalar(USER_BY_ID, {"user_id": user_id})
@@ -1,9 +1,11 @@
 from fastapi import APIRouter
 
-from .api import chat, user
+from .api import admin, analytics, chat, user
 
 api_router = APIRouter()
 
 # 라우터 등록
 api_router.include_router(user.router, prefix="/api/users", tags=["사용자"])
 api_router.include_router(chat.router, prefix="/api/chat", tags=["채팅"])
+api_router.include_router(admin.router, prefix="/api/admin", tags=["관리자"])
+api_router.include_router(analytics.router, prefix="/api/analytics", tags=["통계"])
@@ -7,7 +7,10 @@ from .response.chat import (
     ChatSessionListSchema,
     ChatMessageSchema,
     ChatMessageListSchema,
+    ChatSessionMessagesSchema,
+    ChatRecentMessagesSchema,
 )
+from .response.usage import UsageDaySchema, UsageSchema
 
 __all__ = [
     # Request schemas
@@ -22,4 +25,8 @@ __all__ = [
     "ChatSessionListSchema",
     "ChatMessageSchema",
     "ChatMessageListSchema",
+    "ChatSessionMessagesSchema",
+    "ChatRecentMessagesSchema",
+    "UsageDaySchema",
+    "UsageSchema",
 ]
@@ -1,6 +1,8 @@
 from .user import UserSchema, JWTResponse
 from .chat import ChatSessionSchema, ChatMessageSchema
 from .chat import ChatSessionListSchema, ChatMessageListSchema
+from .chat import ChatSessionMessagesSchema, ChatRecentMessagesSchema
+from .usage import UsageDaySchema, UsageSchema
 
 __all__ = [
     "UserSchema",
@@ -9,4 +11,8 @@ __all__ = [
     "ChatSessionListSchema",
     "ChatMessageSchema",
     "ChatMessageListSchema",
+    "ChatSessionMessagesSchema",
+    "ChatRecentMessagesSchema",
+    "UsageDaySchema",
+    "UsageSchema",
 ]
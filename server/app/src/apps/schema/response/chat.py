@@ -1,12 +1,16 @@
-from typing import Optional
+from typing import Annotated, Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PlainSerializer
+
+# 채팅 ID (snowflake, core/ids.py)는 2^53보다 커서 JavaScript number로는 값이 바뀌므로
+# JSON 응답에서는 문자열로 반환 (요청에서는 숫자 / 문자열 모두 받음)
+SnowflakeId = Annotated[int, PlainSerializer(str, return_type=str, when_used="json")]
 
 
 class ChatSessionSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: int
+    id: SnowflakeId
     user_id: int
     title: Optional[str] = None
     created_at: datetime
@@ -23,9 +27,9 @@ class ChatSessionListSchema(BaseModel):
 class ChatMessageSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: int
+    id: SnowflakeId
     user_id: int
-    session_id: int
+    session_id: SnowflakeId
     message_type: str
     content: str
     created_at: datetime
@@ -35,3 +39,14 @@ class ChatMessageListSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     chat_messages: list[ChatMessageSchema]
+    # limit 없는 조회에서 아카이브된 더 오래된 메시지가 있으면 다음 페이지의 before_id
+    next_before_id: Optional[SnowflakeId] = None
+
+
+class ChatSessionMessagesSchema(BaseModel):
+    session_id: SnowflakeId
+    chat_messages: list[ChatMessageSchema]
+
+
+class ChatRecentMessagesSchema(BaseModel):
+    sessions: list[ChatSessionMessagesSchema]
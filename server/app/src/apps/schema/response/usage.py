@@ -0,0 +1,22 @@
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+# 상담 메시지 사용량 통계 스키마 (메시지 종류 → 값)
+class UsageDaySchema(BaseModel):
+    day: date
+    message_counts: Dict[str, int]
+    # 전체 통계만: 그 종류의 메시지를 보낸 사용자 수
+    user_counts: Optional[Dict[str, int]] = None
+
+
+class UsageSchema(BaseModel):
+    user_id: Optional[int] = None
+    start: date
+    end: date
+    # 이 시각 이전에 생성된 메시지까지 집계됨 (집계 작업 전이면 None)
+    updated_through: Optional[datetime] = None
+    totals: Dict[str, int]
+    days: list[UsageDaySchema]
@@ -1,3 +1,16 @@
-from .user import UserService
+from .user import UserService, get_user_service
+from .export import ChatExportService
+from .reply import CounselorReplyService, reply_service
+from .message_window import MessageWindowCache, message_windows
+from .usage import UsageRollupService
 
-__all__ = ["UserService"]
+__all__ = [
+    "UserService",
+    "get_user_service",
+    "ChatExportService",
+    "CounselorReplyService",
+    "reply_service",
+    "MessageWindowCache",
+    "message_windows",
+    "UsageRollupService",
+]
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator
+
+# 내보내기 형식별 Content-Type
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_COLUMNS = [
+    "id",
+    "user_id",
+    "session_id",
+    "message_type",
+    "content",
+    "created_at",
+]
+
+# 응답 청크 크기 (행마다 write 하지 않고 모아서 전송)
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+class ChatExportService:
+    """상담 대화 내보내기 직렬화 (행 단위 스트리밍)"""
+
+    def _serialize_value(self, value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def _ndjson_lines(self, rows: Iterable[dict]) -> Iterator[str]:
+        for row in rows:
+            yield json.dumps(
+                {key: self._serialize_value(row[key]) for key in EXPORT_COLUMNS},
+                ensure_ascii=False,
+            ) + "\n"
+
+    def _csv_lines(self, rows: Iterable[dict]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow([self._serialize_value(row[key]) for key in EXPORT_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def _chunks(self, lines: Iterable[str]) -> Iterator[bytes]:
+        """작은 행들을 EXPORT_CHUNK_SIZE 단위로 묶어서 전송"""
+        chunk = []
+        size = 0
+        for line in lines:
+            data = line.encode("utf-8")
+            chunk.append(data)
+            size += len(data)
+            if size >= EXPORT_CHUNK_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield b"".join(chunk)
+
+    def _gzip(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """스트리밍 gzip 압축 (전체를 메모리에 올리지 않음)"""
+        compressor = zlib.compressobj(level=6, wbits=zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def media_type(self, export_format: str) -> str:
+        """응답 Content-Type"""
+        return EXPORT_MEDIA_TYPES[export_format]
+
+    def headers(self, name: str, export_format: str, compress: bool) -> dict:
+        """
+        다운로드 응답 헤더
+        - 압축한 경우 Content-Encoding: gzip으로 전송 (응답 압축 미들웨어가 다시 압축하지 않음)
+        """
+        headers = {
+            "Content-Disposition": f'attachment; filename="{name}.{export_format}"'
+        }
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+        return headers
+
+    def stream(
+        self, rows: Iterable[dict], export_format: str, compress: bool
+    ) -> Iterator[bytes]:
+        """메시지 행을 NDJSON/CSV 바이트 스트림으로 변환 (선택적으로 gzip)"""
+        if export_format == "csv":
+            lines = self._csv_lines(rows)
+        else:
+            lines = self._ndjson_lines(rows)
+
+        chunks = self._chunks(lines)
+        if compress:
+            chunks = self._gzip(chunks)
+        return chunks
@@ -0,0 +1,198 @@
+"""
+상담 세션 최근 메시지 윈도우 캐시
+=============================
+
+자주 조회되는 상담 세션의 최근 메시지를 워커 메모리에 캐시합니다.
+ORM 객체(identity map, 상태 추적)나 Pydantic 모델로 들고 있으면 메시지마다
+수백 바이트의 객체가 여러 개 생기므로, 세션마다 열(column) 단위 배열 하나로 보관합니다.
+- id: array('q'), 메시지 종류: array('B') 코드
+- 내용 / 생성 시각: JSON 조각으로 미리 인코딩해서 bytes 하나에 이어 붙이고 offset만 저장
+  → 응답할 때 Pydantic 검증 / json.dumps 없이 ChatMessageListSchema JSON을 바로 생성
+- 메시지 목록 버전(최신 메시지 ID, 메시지 수)이 같을 때만 사용 (다른 워커의 저장도 반영)
+- 워커 전체에서 MESSAGE_WINDOW_MAX_MESSAGES개를 넘으면 오래 안 쓴 세션부터 제거 (LRU)
+
+비교는 scripts/bench-message-window.py 참고
+"""
+
+import json
+import os
+from array import array
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+# 세션마다 캐시하는 최근 메시지 수 (0이면 캐시 사용 안 함)
+MESSAGE_WINDOW_SIZE = int(os.getenv("MESSAGE_WINDOW_SIZE", "100"))
+# 워커마다 캐시하는 전체 메시지 수
+MESSAGE_WINDOW_MAX_MESSAGES = int(os.getenv("MESSAGE_WINDOW_MAX_MESSAGES", "100000"))
+
+
+class MessageWindow:
+    """한 상담 세션의 최근 메시지 (시간 순, 열 단위 배열)"""
+
+    __slots__ = (
+        "session_id",
+        "user_id",
+        "version",
+        "complete",
+        "ids",
+        "type_codes",
+        "types",
+        "offsets",
+        "fragments",
+    )
+
+    def __init__(
+        self,
+        session_id: int,
+        user_id: int,
+        version: tuple,
+        messages: Sequence,
+        complete: bool,
+    ):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.version = version
+        # 세션의 모든 메시지를 담고 있는지 (limit 없는 조회에도 사용 가능)
+        self.complete = complete
+
+        types: list[str] = []
+        self.ids = array("q")
+        self.type_codes = array("B")
+        self.offsets = array("I", [0])
+        fragments = []
+        size = 0
+        for message in messages:
+            if message.message_type not in types:
+                types.append(message.message_type)
+            # "내용","created_at":"생성 시각" (Pydantic JSON과 같은 형식)
+            fragment = (
+                json.dumps(message.content, ensure_ascii=False)
+                + ',"created_at":"'
+                + message.created_at.isoformat()
+                + '"'
+            ).encode("utf-8")
+            size += len(fragment)
+            self.ids.append(message.id)
+            self.type_codes.append(types.index(message.message_type))
+            self.offsets.append(size)
+            fragments.append(fragment)
+        self.types = tuple(
+            json.dumps(message_type, ensure_ascii=False).encode("utf-8")
+            for message_type in types
+        )
+        self.fragments = b"".join(fragments)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def covers(self, limit: Optional[int]) -> bool:
+        """최근 limit개(None이면 전체) 조회에 이 윈도우만으로 응답할 수 있는지"""
+        if limit is None:
+            return self.complete
+        return self.complete or len(self) >= limit
+
+    def to_json(self, limit: Optional[int] = None) -> bytes:
+        """최근 limit개 메시지를 ChatMessageListSchema JSON으로 직렬화"""
+        start = 0 if limit is None else max(len(self) - limit, 0)
+        template = (
+            b'{"id":"%%d","user_id":%d,"session_id":"%d","message_type":%%s,"content":%%s}'
+            % (self.user_id, self.session_id)
+        )
+        ids, type_codes, types = self.ids, self.type_codes, self.types
+        offsets, fragments = self.offsets, self.fragments
+        items = b",".join(
+            [
+                template
+                % (
+                    ids[index],
+                    types[type_codes[index]],
+                    fragments[offsets[index] : offsets[index + 1]],
+                )
+                for index in range(start, len(self))
+            ]
+        )
+        # 윈도우로 응답하는 조회(limit 있음 또는 아카이브 없는 전체 조회)는 cursor가 없음
+        return b'{"chat_messages":[' + items + b'],"next_before_id":null}'
+
+
+class MessageWindowCache:
+    """세션별 MessageWindow LRU 캐시 (워커 프로세스마다 하나)"""
+
+    def __init__(
+        self,
+        window_size: int = MESSAGE_WINDOW_SIZE,
+        max_messages: int = MESSAGE_WINDOW_MAX_MESSAGES,
+    ):
+        self.window_size = window_size
+        self.max_messages = max_messages
+        self.hits = 0
+        self.misses = 0
+        self._windows: "OrderedDict[int, MessageWindow]" = OrderedDict()
+        self._messages = 0
+
+    @property
+    def cached_messages(self) -> int:
+        return self._messages
+
+    def accepts(self, limit: Optional[int], version: tuple) -> bool:
+        """
+        이 조회를 캐시로 처리할지
+        - limit이 윈도우보다 크면 DB에서 바로 조회
+        - limit이 없으면 세션 메시지 수가 윈도우 이하일 때만 (전체가 윈도우에 들어가는 경우)
+        """
+        if self.window_size <= 0 or self.max_messages <= 0:
+            return False
+        if limit is None:
+            _, count = version
+            return count <= self.window_size
+        return limit <= self.window_size
+
+    def fetch_limit(self, limit: Optional[int]) -> Optional[int]:
+        """윈도우를 채우기 위해 DB에서 조회할 개수 (limit이 없으면 hot 메시지 전체)"""
+        return None if limit is None else self.window_size
+
+    def get(self, session_id: int, version: tuple) -> Optional[MessageWindow]:
+        """버전이 같은 윈도우 (없거나 오래되었으면 None)"""
+        window = self._windows.get(session_id)
+        if window is None or window.version != version:
+            self.misses += 1
+            return None
+        self._windows.move_to_end(session_id)
+        self.hits += 1
+        return window
+
+    def put(
+        self, session_id: int, user_id: int, version: tuple, messages: Sequence
+    ) -> MessageWindow:
+        """
+        조회한 메시지(시간 순)의 최근 window_size개를 캐시
+        - 전체 메시지도, window_size개도 아닌 윈도우(아카이브가 있는 세션의 전체 조회)는
+          어떤 조회에도 다시 쓰이기 어려우므로 저장하지 않고 반환만 함 (다른 세션을 밀어내지 않음)
+        """
+        _, count = version
+        window = MessageWindow(
+            session_id,
+            user_id,
+            version,
+            messages[-self.window_size :],
+            complete=len(messages) <= self.window_size and len(messages) >= count,
+        )
+        self.invalidate(session_id)
+        if not window.complete and len(window) < self.window_size:
+            return window
+        self._windows[session_id] = window
+        self._messages += len(window)
+        while self._messages > self.max_messages and len(self._windows) > 1:
+            _, evicted = self._windows.popitem(last=False)
+            self._messages -= len(evicted)
+        return window
+
+    def invalidate(self, session_id: int) -> None:
+        """세션 윈도우 제거 (세션 삭제 등)"""
+        window = self._windows.pop(session_id, None)
+        if window is not None:
+            self._messages -= len(window)
+
+
+# 전역 인스턴스
+message_windows = MessageWindowCache()
@@ -0,0 +1,195 @@
+"""
+AI 상담사 응답 서비스
+=================
+
+- 응답 생성(1-3초 지연 + 저장)은 요청과 분리된 task로 실행하고 워커 안에서 추적
+  → 클라이언트 연결이 끊겨도 응답은 저장됨
+- 워커 종료 시:
+  1. 종료 시작(core/shutdown.py) 즉시 새 /send 요청은 503으로 거절
+     (로드밸런서가 다른 워커로 재시도), 재시도 큐 처리 중지
+  2. lifespan shutdown에서 종료 시작부터 REPLY_DRAIN_SECONDS까지 진행 중인 응답을 기다림
+  3. 끝내지 못한 응답은 재시도 큐(chat_pending_replies)에 저장
+- 모든 워커는 REPLY_RETRY_POLL_SECONDS마다 재시도 큐를 확인해 남은 응답을 저장
+  → max_requests로 워커를 자주 재시작해도 응답이 사라지지 않음
+- 재시도 응답은 저장 직전에 메시지 ID를 새로 배정 (ID 시각 = 저장 시각)
+  → 늦게 저장된 응답도 사용량 집계의 high-water mark 뒤에 들어가 누락되지 않음
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+from typing import Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from ...core.database.connection import SessionFactory
+from ...core.database.unit_of_work import open_unit_of_work
+from ...core.database.write_buffer import WRITE_BUFFER_DRAIN_SECONDS
+from ...core.ids import generate_id
+from ..model.chat import ChatMessage, ChatPendingReply
+from ..repository.chat import ChatRepository
+from ..repository.reply import PendingReplyRepository
+
+logger = logging.getLogger(__name__)
+
+# AI 상담사 더미 응답 데이터 (1-3초 랜덤 지연으로 실제 상담사처럼 동작)
+AI_COUNSELOR_RESPONSES = [
+    "안녕하세요! 무엇을 도와드릴까요?",
+    "좋은 질문이네요. 좀 더 자세히 설명해주시겠어요?",
+    "이해했습니다. 그런 상황이시군요.",
+    "제가 도울 수 있는 방법이 있을 것 같습니다.",
+    "흥미로운 관점이네요. 다른 각도에서 생각해보면 어떨까요?",
+    "그런 고민이 있으시는군요. 함께 해결책을 찾아보겠습니다.",
+    "좋은 아이디어입니다! 더 구체적으로 계획을 세워보시는 것은 어떨까요?",
+    "이해하기 어려운 부분이 있으시다면 언제든 말씀해주세요.",
+    "그런 상황에서는 이런 방법도 고려해볼 수 있습니다.",
+    "정말 좋은 질문입니다. 이에 대해 자세히 설명드리겠습니다.",
+]
+
+# 종료 시작부터 진행 중인 응답을 기다리는 시간 (남은 시간은 write-behind 버퍼 drain에 사용)
+REPLY_DRAIN_SECONDS = float(
+    os.getenv("REPLY_DRAIN_SECONDS", max(WRITE_BUFFER_DRAIN_SECONDS - 5, 1))
+)
+REPLY_RETRY_POLL_SECONDS = float(os.getenv("REPLY_RETRY_POLL_SECONDS", "5"))
+REPLY_RETRY_BATCH_SIZE = int(os.getenv("REPLY_RETRY_BATCH_SIZE", "50"))
+
+
+class ReplyDeferred(Exception):
+    """워커 종료로 응답이 재시도 큐로 넘어간 경우"""
+
+
+class CounselorReplyService:
+    """AI 상담사 응답 생성 및 워커 종료 시 처리 (워커 프로세스마다 하나)"""
+
+    def __init__(self):
+        self.accepting = True
+        # 진행 중인 응답 task → 재시도 큐에 저장할 정보 (저장을 시작했으면 None)
+        self._tasks: Dict[asyncio.Task, Optional[ChatPendingReply]] = {}
+        self._recovery: Optional[asyncio.Task] = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def start(self) -> None:
+        """재시도 큐 처리 task 시작 (lifespan startup)"""
+        self.accepting = True
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.create_task(self._recover_loop())
+
+    async def reply(self, user_message: ChatMessage) -> ChatMessage:
+        """
+        AI 상담사 응답 생성 후 저장
+        - 요청이 취소되어도 응답 task는 계속 실행
+        - 워커 종료로 응답을 재시도 큐에 넘기면 ReplyDeferred 발생
+        """
+        pending = ChatPendingReply(
+            user_id=user_message.user_id,
+            session_id=user_message.session_id,
+            user_message_id=user_message.id,
+            reply_message_id=generate_id(),
+        )
+        task = asyncio.create_task(self._reply(pending, delay=True))
+        self._tasks[task] = pending
+        task.add_done_callback(lambda done: self._tasks.pop(done, None))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                raise ReplyDeferred()
+            raise
+
+    async def _reply(self, pending: ChatPendingReply, delay: bool) -> ChatMessage:
+        if delay:
+            # 1-3초 랜덤 지연으로 실제 상담사처럼 동작
+            await asyncio.sleep(random.uniform(1.0, 3.0))
+
+        # AI의 응답 가능은 실제 AI를 사용하지 말고 임의의 더미 데이터를 답변.
+        ai_message = ChatMessage.create(
+            user_id=pending.user_id,
+            session_id=pending.session_id,
+            message_type="assistant",
+            content=random.choice(AI_COUNSELOR_RESPONSES),
+        )
+        ai_message.id = pending.reply_message_id
+        task = asyncio.current_task()
+        if task in self._tasks:
+            # 저장을 시작한 응답은 재시도 큐에 넣지 않음 (중복 응답 방지)
+            self._tasks[task] = None
+        with open_unit_of_work() as uow:
+            return await ChatRepository(uow=uow).save_message(ai_message)
+
+    def stop(self) -> None:
+        """종료 시작: 새 /send 요청 거절, 재시도 큐 처리 중지"""
+        self.accepting = False
+        if self._recovery is not None:
+            self._recovery.cancel()
+
+    async def drain(self, timeout: float = REPLY_DRAIN_SECONDS) -> None:
+        """새 요청을 막고 진행 중인 응답을 기다린 뒤, 남은 응답은 재시도 큐에 저장"""
+        self.stop()
+
+        tasks = list(self._tasks)
+        if not tasks:
+            return
+        logger.info(f"진행 중인 AI 상담사 응답 {len(tasks)}개 대기 (최대 {timeout}초)")
+        _, not_done = await asyncio.wait(tasks, timeout=timeout)
+        leftovers = [self._tasks.get(task) for task in not_done]
+        for task in not_done:
+            task.cancel()
+        await asyncio.gather(*not_done, return_exceptions=True)
+
+        leftovers = [pending for pending in leftovers if pending is not None]
+        if leftovers:
+            with SessionFactory() as session:
+                PendingReplyRepository(session=session).add_all(leftovers)
+            logger.warning(
+                f"끝내지 못한 AI 상담사 응답 {len(leftovers)}개를 재시도 큐에 저장"
+            )
+
+    async def _recover_loop(self) -> None:
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+        while True:
+            try:
+                await self.recover_pending(owner)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"AI 상담사 응답 재시도 실패: {e}")
+            await asyncio.sleep(REPLY_RETRY_POLL_SECONDS)
+
+    async def recover_pending(self, owner: str) -> int:
+        """
+        재시도 큐의 응답을 선점해서 저장 (처리한 개수 반환)
+        - 큐에 기록된 응답 메시지 ID가 이미 저장되어 있으면 (저장 후 큐에서 지우기 전에
+          워커가 죽은 경우) 다시 저장하지 않음
+        - 아니면 새 ID를 큐에 먼저 기록하고 그 ID로 저장
+          → 이번 시도가 저장 후 죽어도 다음 시도는 새 ID로 저장 여부를 확인
+        """
+        with SessionFactory() as session:
+            reply_repo = PendingReplyRepository(session=session)
+            claimed = reply_repo.claim(owner, limit=REPLY_RETRY_BATCH_SIZE)
+            for pending in claimed:
+                with open_unit_of_work() as uow:
+                    saved = ChatRepository(uow=uow).has_message(
+                        pending.user_id, pending.reply_message_id
+                    )
+                if not saved:
+                    if not reply_repo.rekey(pending, owner, generate_id()):
+                        # 선점 시간이 지나 다른 워커가 가져간 응답
+                        continue
+                    try:
+                        await self._reply(pending, delay=False)
+                    except IntegrityError as e:
+                        # 그 사이 삭제된 상담 세션
+                        logger.info(
+                            f"재시도 응답 {pending.reply_message_id} 건너뜀: {e.orig}"
+                        )
+                reply_repo.delete(pending.id)
+        return len(claimed)
+
+
+# 전역 인스턴스
+reply_service = CounselorReplyService()
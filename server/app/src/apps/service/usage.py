@@ -0,0 +1,196 @@
+"""
+상담 메시지 사용량 집계 작업
+========================
+
+chat_messages를 high-water mark 이후부터 읽어 사용량 집계 테이블(primary DB)에 더합니다.
+- 채팅 DB(primary 또는 샤드)마다 집계를 마친 마지막 메시지 ID를 기록 (chat_usage_watermarks)
+- 한 번에 USAGE_ROLLUP_BATCH_SIZE개 메시지 구간을 GROUP BY로 집계 (기본 키 범위 조회)
+- 메시지 ID는 생성 시각 순이지만 커밋 순서는 조금씩 다를 수 있으므로 (응답 지연,
+  write-behind 버퍼, 복제 지연) 최근 USAGE_ROLLUP_SETTLE_SECONDS 동안의 메시지는 다음 실행에서 집계
+  재시도 큐의 응답은 저장 직전에 ID를 새로 배정하므로 큐에 머문 시간과 관계없이 이 범위 안에 저장됨
+- 날짜는 created_at 기준 (서버 로컬 시간)
+- 메시지 생성 기준 통계이므로 세션을 삭제해도 집계는 줄지 않음
+
+backfill:
+- 집계를 비우고 아카이브 블록(chat_message_archives)의 메시지를 먼저 집계한 뒤
+  hot 테이블은 high-water mark 0부터 증분 집계로 따라잡음
+- 아카이브 작업(scripts/archive-chat-messages.py)과 동시에 실행하지 않음
+  (hot → 아카이브로 옮겨지는 메시지가 누락되거나 두 번 집계될 수 있음)
+"""
+
+import logging
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from ...core.database.connection import SessionFactory
+from ...core.database.sharding import chat_session_factories, shard_router
+from ...core.ids import datetime_to_id, id_to_datetime
+from ..model.chat import ChatMessage, ChatMessageArchive
+from ..repository.archive import decode_messages
+from ..repository.usage import UsageCounts, UsageRollupRepository
+
+logger = logging.getLogger(__name__)
+
+USAGE_ROLLUP_BATCH_SIZE = int(os.getenv("USAGE_ROLLUP_BATCH_SIZE", "5000"))
+USAGE_ROLLUP_SETTLE_SECONDS = float(os.getenv("USAGE_ROLLUP_SETTLE_SECONDS", "300"))
+
+# 아카이브 backfill 시 한 번에 해제하는 블록 수
+ARCHIVE_BACKFILL_BATCH_SIZE = 50
+
+
+def chat_sources() -> List[Tuple[str, sessionmaker]]:
+    """(high-water mark 이름, 세션 팩토리): 채팅 테이블이 있는 모든 DB"""
+    if not shard_router.enabled:
+        return [("primary", SessionFactory)]
+    return [
+        (f"shard-{shard_no}", factory)
+        for shard_no, factory in enumerate(chat_session_factories())
+    ]
+
+
+def _as_date(value) -> date:
+    # SQLite의 DATE()는 문자열을 반환
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class UsageRollupService:
+    """사용량 집계 증분 작업 / backfill"""
+
+    def __init__(
+        self,
+        batch_size: int = USAGE_ROLLUP_BATCH_SIZE,
+        settle_seconds: float = USAGE_ROLLUP_SETTLE_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.settle_seconds = settle_seconds
+
+    def settled_id(self) -> int:
+        """이 ID까지는 커밋이 끝났다고 보고 집계 (최근 settle_seconds 제외)"""
+        return datetime_to_id(datetime.now() - timedelta(seconds=self.settle_seconds))
+
+    def run(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """모든 채팅 DB를 settled_id까지 집계 (채팅 DB별 집계한 메시지 수)"""
+        upper_id = self.settled_id()
+        with SessionFactory() as primary:
+            rollups = UsageRollupRepository(session=primary)
+            return {
+                source: self.rollup_source(
+                    source, factory, rollups, upper_id, max_batches
+                )
+                for source, factory in chat_sources()
+            }
+
+    def rollup_source(
+        self,
+        source: str,
+        factory: sessionmaker,
+        rollups: UsageRollupRepository,
+        upper_id: int,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """채팅 DB 하나를 upper_id까지 batch_size씩 집계"""
+        total = 0
+        batches = 0
+        with factory() as chat:
+            after_id = rollups.get_watermark(source)
+            while after_id < upper_id:
+                if max_batches is not None and batches >= max_batches:
+                    break
+                last_id, counts = self._count_batch(chat, after_id, upper_id)
+                # 읽기 트랜잭션을 끝내 다음 배치에서 새로 커밋된 행을 볼 수 있도록
+                chat.rollback()
+                if not rollups.apply(source, after_id, last_id, counts):
+                    logger.warning(
+                        f"{source}: 다른 집계 작업이 먼저 반영해 이번 실행을 중단합니다."
+                    )
+                    break
+                total += sum(counts.values())
+                batches += 1
+                after_id = last_id
+        return total
+
+    def _count_batch(
+        self, chat: Session, after_id: int, upper_id: int
+    ) -> Tuple[int, UsageCounts]:
+        """after_id 이후 최대 batch_size개 메시지 구간의 (구간 끝 ID, 집계)"""
+        # batch_size번째 메시지 ID까지만 집계 (남은 메시지가 적으면 upper_id까지)
+        last_id = chat.scalar(
+            select(ChatMessage.id)
+            .where(ChatMessage.id > after_id, ChatMessage.id <= upper_id)
+            .order_by(ChatMessage.id.asc())
+            .offset(self.batch_size - 1)
+            .limit(1)
+        )
+        if last_id is None:
+            last_id = upper_id
+
+        day = func.date(ChatMessage.created_at)
+        rows = chat.execute(
+            select(
+                ChatMessage.user_id,
+                day,
+                ChatMessage.message_type,
+                func.count(ChatMessage.id),
+            )
+            .where(ChatMessage.id > after_id, ChatMessage.id <= last_id)
+            .group_by(ChatMessage.user_id, day, ChatMessage.message_type)
+        ).all()
+        return last_id, {
+            (user_id, _as_date(message_day), message_type): count
+            for user_id, message_day, message_type, count in rows
+        }
+
+    def backfill(self) -> Dict[str, int]:
+        """집계를 다시 계산 (아카이브 메시지 집계 후 hot 테이블 증분 집계)"""
+        with SessionFactory() as primary:
+            rollups = UsageRollupRepository(session=primary)
+            rollups.reset()
+            archived = {}
+            for source, factory in chat_sources():
+                # 아카이브 집계는 high-water mark 0 → 0으로 반영 (hot 테이블 집계는 아래에서)
+                after_id = rollups.get_watermark(source)
+                with factory() as chat:
+                    counts = self._count_archives(chat)
+                if not rollups.apply(source, after_id, after_id, counts):
+                    raise RuntimeError(
+                        f"{source}: backfill 중에 다른 집계 작업이 실행되었습니다."
+                    )
+                archived[source] = sum(counts.values())
+                logger.info(f"{source}: 아카이브 메시지 {archived[source]:,}개 집계")
+
+        hot = self.run()
+        return {source: archived[source] + hot.get(source, 0) for source in archived}
+
+    def _count_archives(self, chat: Session) -> UsageCounts:
+        counts: UsageCounts = Counter()
+        rows = chat.execute(
+            select(ChatMessageArchive.payload, ChatMessageArchive.codec)
+            .order_by(ChatMessageArchive.id.asc())
+            .execution_options(
+                stream_results=True, yield_per=ARCHIVE_BACKFILL_BATCH_SIZE
+            )
+        )
+        for payload, codec in rows:
+            for message in decode_messages(payload, codec):
+                counts[
+                    (
+                        message.user_id,
+                        message.created_at.date(),
+                        message.message_type,
+                    )
+                ] += 1
+        return counts
+
+    def freshness(self, rollups: UsageRollupRepository) -> Optional[datetime]:
+        """모든 채팅 DB가 집계를 마친 시각 (집계가 없으면 None)"""
+        watermarks = rollups.get_watermarks()
+        sources = [source for source, _ in chat_sources()]
+        if not watermarks or any(source not in watermarks for source in sources):
+            return None
+        oldest = min(watermarks[source] for source in sources)
+        return id_to_datetime(oldest) if oldest else None
@@ -1,5 +1,6 @@
 import bcrypt
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import jwt
 
@@ -48,10 +49,16 @@ class UserService:
         self, username: str, password: str, user_repo
     ) -> Optional[User]:
         """사용자 인증"""
-        user = user_repo.get_user_by_username(username)
+        user = user_repo.get_user_by_username(username, primary=True)
         if not user:
             return None
 
         if self.verify_password(password, user.hashed_password):
             return user
         return None
+
+
+@lru_cache
+def get_user_service() -> UserService:
+    """UserService는 요청마다 상태가 없으므로 워커 프로세스에서 하나만 생성"""
+    return UserService()
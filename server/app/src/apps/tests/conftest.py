@@ -0,0 +1,12 @@
+import pytest
+
+from src.core import ids as ids_module
+from src.core.ids import SnowflakeGenerator
+
+
+@pytest.fixture(autouse=True)
+def id_generator(monkeypatch) -> SnowflakeGenerator:
+    """테스트 프로세스의 ID 노드 고정 (memory 공유 상태에서는 노드 ID를 임대하지 않음)"""
+    generator = SnowflakeGenerator(node_id=1)
+    monkeypatch.setattr(ids_module, "id_generator", generator)
+    return generator
@@ -0,0 +1,91 @@
+"""
+부하 차단 우선순위 테스트
+=====================
+
+main.py와 같이 api_router를 /api에 등록한 앱에서, 요청 경로에 맞는 라우트의
+load_priority()로 우선순위를 판단하는지 확인합니다.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.apps.router import api_router
+from src.core.load import (
+    LoadShedder,
+    LoadSheddingMiddleware,
+    Priority,
+    request_priority,
+)
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+    return app
+
+
+def priority_of(app: FastAPI, method: str, url: str) -> Priority:
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "query_string": query.encode(),
+    }
+    return request_priority(app.router, scope)
+
+
+@pytest.mark.parametrize(
+    "method, url, expected",
+    [
+        ("POST", "/api/api/chat/send", Priority.HIGH),
+        ("GET", "/api/api/chat/sessions", Priority.NORMAL),
+        ("GET", "/api/api/chat/sessions/recent-messages?session_id=1", Priority.LOW),
+        ("GET", "/api/api/chat/sessions/7/messages?limit=50", Priority.LOW),
+        ("GET", "/api/api/chat/sessions/7/messages?since=3&wait=25", Priority.NORMAL),
+        ("GET", "/api/api/chat/sessions/7/export", Priority.LOW),
+        ("GET", "/api/api/chat/export", Priority.LOW),
+        ("DELETE", "/api/api/chat/sessions/7", Priority.NORMAL),
+        ("GET", "/api/api/analytics/usage/me", Priority.LOW),
+        ("GET", "/api/api/admin/memory", Priority.CRITICAL),
+        ("POST", "/api/api/users/login", Priority.NORMAL),
+        # 없는 경로 / 허용하지 않는 메서드
+        ("GET", "/api/api/chat/send", Priority.NORMAL),
+        ("GET", "/missing", Priority.NORMAL),
+    ],
+)
+def test_priority_comes_from_matched_route(app, method, url, expected):
+    assert priority_of(app, method, url) == expected
+
+
+class FixedShedder(LoadShedder):
+    """pressure를 직접 지정하는 부하 차단기"""
+
+    def __init__(self, pressure: float):
+        super().__init__(lag_monitor=None, pool_wait=None)
+        self.fixed_pressure = pressure
+
+    @property
+    def pressure(self) -> float:
+        return self.fixed_pressure
+
+
+def test_middleware_sheds_low_priority_routes_first():
+    app = FastAPI()
+    shedder = FixedShedder(pressure=2.0)
+    app.add_middleware(LoadSheddingMiddleware, router=app.router, shedder=shedder)
+    # 미들웨어 추가 후 등록한 라우트도 판단에 사용
+    app.include_router(api_router, prefix="/api")
+
+    with TestClient(app) as client:
+        shed = client.get("/api/api/chat/export")
+        kept = client.post("/api/api/users/login", json={})
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert kept.status_code == 422
+    assert shedder.shed[Priority.LOW] == 1
+    assert shedder.shed[Priority.NORMAL] == 0
@@ -0,0 +1,162 @@
+"""
+읽기 복제본 라우팅 테스트
+====================
+
+primary와 복제본을 로컬 SQLite 파일로 만들고, 어느 DB에서 읽었는지 구분할 수 있도록
+두 파일에 서로 다른 사용자를 넣어 둡니다 (복제 지연으로 복제본에 없는 행도 흉내 냄).
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.apps.model import User
+from src.core import shared_state as shared_state_module
+from src.core.database import routing
+from src.core.database.routing import (
+    STICKY_KEY,
+    USE_PRIMARY,
+    ReplicaRouter,
+    RoutingSession,
+)
+
+USERNAME = select(User.username).order_by(User.id).limit(1)
+
+
+def create_database(path, username: str):
+    engine = create_engine(f"sqlite:///{path}")
+    User.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User.__table__).values(
+                email=f"{username}@example.com",
+                username=username,
+                hashed_password="-",
+            )
+        )
+    return engine
+
+
+class Clock:
+    """time.time() / time.monotonic() 대신 쓰는 수동 시계"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(shared_state_module.time, "time", clock)
+    monkeypatch.setattr(routing.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = create_database(tmp_path / "primary.db", "primary")
+    replica = create_database(tmp_path / "replica.db", "replica")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def router(databases) -> ReplicaRouter:
+    primary, replica = databases
+    return ReplicaRouter(primary=primary, replicas=[replica])
+
+
+@pytest.fixture
+def session_factory(router) -> sessionmaker:
+    return sessionmaker(
+        class_=RoutingSession,
+        router=router,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=router.primary,
+    )
+
+
+def open_session(session_factory, sticky_key=None):
+    session = session_factory()
+    if sticky_key is not None:
+        session.info[STICKY_KEY] = sticky_key
+    return session
+
+
+def test_reads_use_replica_unless_primary_requested(session_factory):
+    with session_factory() as session:
+        assert session.scalar(USERNAME) == "replica"
+        assert session.scalar(USERNAME.execution_options(**USE_PRIMARY)) == "primary"
+
+
+def test_writes_go_to_primary_and_session_reads_primary_after(
+    databases, session_factory
+):
+    primary, replica = databases
+    with session_factory() as session:
+        assert session.scalar(USERNAME) == "replica"
+        session.add(User.create("new", "new@example.com", "-"))
+        session.commit()
+        # 쓰기 후 같은 DB 세션의 읽기는 primary (read-your-writes)
+        assert session.scalar(USERNAME) == "primary"
+
+    for engine, expected in ((primary, ["primary", "new"]), (replica, ["replica"])):
+        with engine.connect() as connection:
+            usernames = connection.scalars(select(User.username).order_by(User.id))
+            assert usernames.all() == expected
+
+
+def test_sticky_primary_after_write_across_sessions(session_factory, clock):
+    with open_session(session_factory, sticky_key="client-a") as session:
+        session.add(User.create("new", "new@example.com", "-"))
+        session.commit()
+
+    # 같은 클라이언트의 다음 요청은 DATABASE_STICKY_SECONDS 동안 primary
+    with open_session(session_factory, sticky_key="client-a") as session:
+        assert session.scalar(USERNAME) == "primary"
+    with open_session(session_factory, sticky_key="client-b") as session:
+        assert session.scalar(USERNAME) == "replica"
+
+    clock.now += routing.DATABASE_STICKY_SECONDS + 1
+    with open_session(session_factory, sticky_key="client-a") as session:
+        assert session.scalar(USERNAME) == "replica"
+
+
+def test_failed_replica_fails_over_to_primary(tmp_path, databases, clock):
+    primary, _ = databases
+    # 디렉터리가 없어 연결할 수 없는 복제본
+    missing = tmp_path / "down" / "replica.db"
+    replica = create_engine(f"sqlite:///{missing}")
+    router = ReplicaRouter(primary=primary, replicas=[replica])
+    session_factory = sessionmaker(class_=RoutingSession, router=router, bind=primary)
+
+    # 연결 실패는 그 쿼리에서 그대로 발생하고, handle_error에서 복제본을 제외
+    with session_factory() as session, pytest.raises(OperationalError):
+        session.scalar(USERNAME)
+    assert router.healthy_replicas() == []
+    with session_factory() as session:
+        assert session.scalar(USERNAME) == "primary"
+
+    # 복제본이 복구되면 상태 확인에서 다시 사용
+    missing.parent.mkdir()
+    create_database(missing, "replica").dispose()
+    assert router.check_health() == {str(replica.url): True}
+    with session_factory() as session:
+        assert session.scalar(USERNAME) == "replica"
+    replica.dispose()
+
+
+def test_replica_is_retried_after_retry_window(tmp_path, databases, clock):
+    primary, replica = databases
+    router = ReplicaRouter(primary=primary, replicas=[replica])
+    router.mark_down(replica)
+    assert router.pick() is primary
+
+    clock.now += routing.DATABASE_REPLICA_RETRY_SECONDS + 1
+    assert router.pick() is replica
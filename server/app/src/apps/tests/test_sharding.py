@@ -0,0 +1,198 @@
+"""
+채팅 테이블 샤딩 테스트
+===================
+
+primary와 샤드 3개를 로컬 SQLite 파일로 만들어
+- 사용자 → 샤드 디렉터리 배정 / 고정
+- 세션 / 메시지 저장과 조회가 사용자의 샤드에서만 일어나는지
+- scripts/rebalance-shards.py의 사용자 이동 (캐시 만료 대기 중 바뀐 행 반영)
+을 확인합니다.
+"""
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, delete, func, select
+
+from src.apps.model import ChatMessage, ChatSession, User
+from src.apps.repository.chat import ChatRepository
+from src.core.database.sharding import ShardRouter, UserShard
+from src.core.database.unit_of_work import UnitOfWork
+
+SHARDS = 3
+REBALANCE_SCRIPT = (
+    Path(__file__).resolve().parents[5] / "scripts" / "rebalance-shards.py"
+)
+
+
+def create_router(tmp_path, shards: int = SHARDS) -> ShardRouter:
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    User.__table__.create(primary, checkfirst=True)
+    UserShard.__table__.create(primary, checkfirst=True)
+    router = ShardRouter(
+        primary=primary,
+        urls=[
+            f"sqlite:///{tmp_path / f'shard{shard_no}.db'}"
+            for shard_no in range(shards)
+        ],
+    )
+    router.create_tables()
+    return router
+
+
+@pytest.fixture
+def router(tmp_path) -> ShardRouter:
+    router = create_router(tmp_path)
+    yield router
+    for engine in [router.primary, *router.engines]:
+        engine.dispose()
+
+
+@pytest.fixture
+def chat_repo(router):
+    uow = UnitOfWork(router=router)
+    yield ChatRepository(uow=uow)
+    uow.close()
+
+
+def count_rows(router: ShardRouter, shard_no: int, model, user_id: int) -> int:
+    with router.engines[shard_no].connect() as connection:
+        return connection.scalar(
+            select(func.count()).select_from(model).where(model.user_id == user_id)
+        )
+
+
+def create_conversation(chat_repo, user_id: int, messages: int) -> ChatSession:
+    session = chat_repo.create_session(ChatSession.create(user_id=user_id, title="t"))
+    for index in range(messages):
+        chat_repo.create_message(
+            ChatMessage.create(
+                user_id=user_id,
+                session_id=session.id,
+                message_type="user",
+                content=f"메시지 {index}",
+            )
+        )
+    return session
+
+
+def test_new_users_are_pinned_in_directory(router, tmp_path):
+    assert [router.shard_for_user(user_id) for user_id in (3, 4, 5)] == [0, 1, 2]
+    with router.primary.connect() as connection:
+        directory = dict(
+            connection.execute(select(UserShard.user_id, UserShard.shard_no)).all()
+        )
+    assert directory == {3: 0, 4: 1, 5: 2}
+
+    # 샤드를 추가해도 이미 배정된 사용자는 옮겨지지 않음
+    grown = create_router(tmp_path, shards=SHARDS + 1)
+    assert grown.shard_for_user(5) == 2
+    assert grown.shard_for_user(7) == 3
+
+
+def test_assign_moves_user_and_clears_cache(router):
+    assert router.shard_for_user(4) == 1
+    router.assign(4, 2)
+    assert router.shard_for_user(4) == 2
+
+
+def test_writes_and_reads_use_the_users_shard(router, chat_repo):
+    first = create_conversation(chat_repo, user_id=4, messages=3)
+    second = create_conversation(chat_repo, user_id=5, messages=2)
+
+    assert [count_rows(router, n, ChatSession, 4) for n in range(SHARDS)] == [0, 1, 0]
+    assert [count_rows(router, n, ChatMessage, 4) for n in range(SHARDS)] == [0, 3, 0]
+    assert [count_rows(router, n, ChatMessage, 5) for n in range(SHARDS)] == [0, 0, 2]
+
+    messages = chat_repo.get_session_messages(first.id, user_id=4)
+    assert [message.content for message in messages] == [
+        "메시지 0",
+        "메시지 1",
+        "메시지 2",
+    ]
+    assert [session.id for session in chat_repo.get_user_sessions(5)] == [second.id]
+    # 다른 사용자의 세션은 그 사용자의 샤드에서 찾으므로 보이지 않음
+    assert chat_repo.get_session_by_id(first.id, user_id=5) is None
+
+    assert chat_repo.delete_session(first)
+    assert count_rows(router, 1, ChatMessage, 4) == 0
+    assert count_rows(router, 2, ChatMessage, 5) == 2
+
+
+def load_rebalance(monkeypatch, router, during_wait):
+    spec = importlib.util.spec_from_file_location("rebalance_shards", REBALANCE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "shard_router", router)
+    # 디렉터리 캐시 만료 대기 대신 그 사이에 일어나는 쓰기를 실행
+    monkeypatch.setattr(module, "time", SimpleNamespace(sleep=lambda _: during_wait()))
+    return module
+
+
+def test_move_user_reconciles_changes_during_cache_wait(monkeypatch, router, chat_repo):
+    kept = create_conversation(chat_repo, user_id=4, messages=2)
+    deleted = create_conversation(chat_repo, user_id=4, messages=2)
+    removed_on_target = create_conversation(chat_repo, user_id=4, messages=1)
+    other = create_conversation(chat_repo, user_id=7, messages=1)
+    source, target = router.session_factories[1], router.session_factories[2]
+
+    def during_wait():
+        # 캐시가 남은 워커: 원래 샤드에서 세션 삭제 / 새 메시지 저장
+        with source() as session:
+            session.execute(
+                delete(ChatMessage).where(ChatMessage.session_id == deleted.id)
+            )
+            session.execute(delete(ChatSession).where(ChatSession.id == deleted.id))
+            session.add(
+                ChatMessage.create(
+                    user_id=4,
+                    session_id=kept.id,
+                    message_type="user",
+                    content="늦은 메시지",
+                )
+            )
+            session.commit()
+        # 디렉터리를 새로 읽은 워커: 대상 샤드에서 세션 삭제
+        with target() as session:
+            session.execute(
+                delete(ChatMessage).where(
+                    ChatMessage.session_id == removed_on_target.id
+                )
+            )
+            session.execute(
+                delete(ChatSession).where(ChatSession.id == removed_on_target.id)
+            )
+            session.commit()
+
+    rebalance = load_rebalance(monkeypatch, router, during_wait)
+    rebalance.move_user(4, to_shard=2, batch_size=2, dry_run=False)
+
+    assert router.shard_for_user(4) == 2
+    assert count_rows(router, 1, ChatSession, 4) == 0
+    assert count_rows(router, 1, ChatMessage, 4) == 0
+    with target() as session:
+        sessions = session.scalars(
+            select(ChatSession.id).where(ChatSession.user_id == 4)
+        ).all()
+        contents = session.scalars(
+            select(ChatMessage.content)
+            .where(ChatMessage.user_id == 4)
+            .order_by(ChatMessage.id)
+        ).all()
+    assert sessions == [kept.id]
+    assert contents == ["메시지 0", "메시지 1", "늦은 메시지"]
+    # 같은 샤드의 다른 사용자는 그대로
+    assert count_rows(router, other.user_id % SHARDS, ChatMessage, 7) == 1
+
+
+def test_move_user_dry_run_changes_nothing(monkeypatch, router, chat_repo):
+    create_conversation(chat_repo, user_id=4, messages=2)
+    rebalance = load_rebalance(monkeypatch, router, lambda: None)
+
+    rebalance.move_user(4, to_shard=0, batch_size=100, dry_run=True)
+
+    assert router.shard_for_user(4) == 1
+    assert count_rows(router, 1, ChatMessage, 4) == 2
+    assert count_rows(router, 0, ChatMessage, 4) == 0
@@ -0,0 +1,152 @@
+"""
+mmap 공유 상태 해시 테이블 테스트
+============================
+
+짧게 쓰이는 키(삭제 / TTL 만료)가 슬롯 수보다 많이 바뀌어도
+슬롯이 회수되어 조회 비용이 살아 있는 키 수에만 비례하는지 확인합니다.
+"""
+
+import random
+
+import pytest
+
+from src.core import shared_state as shared_state_module
+from src.core.shared_state import MmapState
+
+SLOTS = 128
+
+
+class Clock:
+    """time.time() 대신 쓰는 수동 시계 (TTL 만료를 기다리지 않음)"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(shared_state_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def state(tmp_path, clock) -> MmapState:
+    return MmapState(str(tmp_path / "shared-state"), SLOTS)
+
+
+def used_slots(state: MmapState) -> int:
+    with state._locked() as memory:
+        return sum(
+            memory[state._slot_offset(index)] != state.EMPTY
+            for index in range(state.slots)
+        )
+
+
+def probe_length(state: MmapState, key: str) -> int:
+    """key의 home 슬롯부터 빈 슬롯까지 확인해야 하는 슬롯 수 (조회 비용)"""
+    counting = CountingSlotHeader(state.SLOT_HEADER)
+    state.SLOT_HEADER = counting
+    try:
+        assert state.get(key) is None
+    finally:
+        del state.SLOT_HEADER
+    return counting.reads
+
+
+class CountingSlotHeader:
+    def __init__(self, header):
+        self.header = header
+        self.size = header.size
+        self.reads = 0
+
+    def unpack_from(self, *args):
+        self.reads += 1
+        return self.header.unpack_from(*args)
+
+    def pack_into(self, *args):
+        return self.header.pack_into(*args)
+
+
+def test_deleted_keys_free_their_slots(state):
+    for index in range(SLOTS * 20):
+        key = f"idempotency:{index}"
+        assert state.add(key, b"1")
+        state.delete(key)
+
+    assert used_slots(state) == 0
+    assert probe_length(state, "missing") == 1
+
+
+def test_expired_keys_are_reclaimed_on_probe(state, clock):
+    # 슬롯 수보다 많은 TTL 키를 만들고 만료시킴 (같은 home 근처에 계속 쌓이도록)
+    for index in range(SLOTS * 20):
+        state.set(f"db:sticky:{index}", b"1", ttl=1)
+        clock.now += 0.5
+
+    assert used_slots(state) <= SLOTS // 8
+    assert probe_length(state, "missing") <= 8
+    assert state.add("lease", b"1", ttl=10)
+
+
+def test_full_table_of_expired_keys_accepts_new_keys(state, clock):
+    for index in range(SLOTS * 4):
+        try:
+            state.set(f"key:{index}", b"1", ttl=1)
+        except RuntimeError:
+            break
+    clock.now += 2
+
+    for index in range(SLOTS // 2):
+        assert state.add(f"new:{index}", b"1")
+    assert used_slots(state) == SLOTS // 2
+
+
+def test_lookup_cost_is_capped(state):
+    for index in range(SLOTS):
+        try:
+            state.set(f"key:{index}", b"1")
+        except RuntimeError:
+            break
+
+    assert probe_length(state, "missing") <= state.max_probes
+
+
+def test_matches_dict_under_random_churn(state, clock):
+    rng = random.Random(0)
+    expected = {}
+    for _ in range(SLOTS * 50):
+        clock.now += rng.random()
+        expected = {
+            key: (value, expires_at)
+            for key, (value, expires_at) in expected.items()
+            if not expires_at or expires_at > clock.now
+        }
+        key = f"key:{rng.randrange(SLOTS)}"
+        operation = rng.random()
+        if operation < 0.4:
+            ttl = rng.choice([None, 1, 5])
+            value = str(rng.randrange(1000)).encode()
+            state.set(key, value, ttl=ttl)
+            expected[key] = (value, clock.now + ttl if ttl else 0.0)
+        elif operation < 0.6:
+            ttl = rng.choice([None, 2])
+            value = b"added"
+            if state.add(key, value, ttl=ttl):
+                assert key not in expected
+                expected[key] = (value, clock.now + ttl if ttl else 0.0)
+            else:
+                assert key in expected
+        elif operation < 0.8:
+            state.delete(key)
+            expected.pop(key, None)
+        else:
+            item = expected.get(key)
+            assert state.get(key) == (item[0] if item else None)
+
+    for key, (value, _) in expected.items():
+        assert state.get(key) == value
+    assert used_slots(state) >= len(expected)
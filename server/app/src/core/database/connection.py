@@ -4,6 +4,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
+from .pool import MeteredQueuePool
+from .routing import ReplicaRouter, RoutingSession
+
 
 # 데이터베이스 설정
 DATABASE_HOST = os.getenv("DATABASE_HOST", "localhost")
@@ -12,21 +15,63 @@ DATABASE_NAME = os.getenv("DATABASE_NAME", "intellius_chat")
 DATABASE_USER = os.getenv("DATABASE_USER", "intellius")
 DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD", "intellius123")
 
-# MariaDB 연결 URL
-DATABASE_URL = f"mysql+pymysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
+# MariaDB 연결 URL (DATABASE_URL로 직접 지정 가능)
+DATABASE_URL = (
+    os.getenv("DATABASE_URL")
+    or f"mysql+pymysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
+)
 ASYNC_DATABASE_URL = f"mysql+aiomysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
 
+# 읽기 복제본 연결 URL (쉼표로 구분, 비어 있으면 모든 쿼리를 primary에서 실행)
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+
+# 엔진별 compiled SQL 캐시 크기 (SQLAlchemy 기본값 500)
+# 자주 쓰는 쿼리는 repository 모듈에서 한 번만 만들어 캐시 키 계산까지 재사용하므로
+# 여기서는 그 밖의 동적 쿼리 변형이 캐시에서 밀려나지 않을 만큼만 잡음
+DATABASE_QUERY_CACHE_SIZE = int(os.getenv("DATABASE_QUERY_CACHE_SIZE", "500"))
+
 # 동기 엔진
-engine = create_engine(DATABASE_URL, echo=True)
-SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQL 로그는 echo 대신 DATABASE_ECHO로 sqlalchemy.engine 로거 레벨을 조정 (core/log.py)
+# 풀 대기 시간은 부하 차단에 사용 (core/load.py)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=MeteredQueuePool,
+    query_cache_size=DATABASE_QUERY_CACHE_SIZE,
+)
+
+# 읽기 복제본 엔진 (끊긴 연결은 pre-ping으로 감지)
+replica_engines = [
+    create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_pre_ping=True,
+        query_cache_size=DATABASE_QUERY_CACHE_SIZE,
+    )
+    for url in DATABASE_REPLICA_URLS
+]
+replica_router = ReplicaRouter(primary=engine, replicas=replica_engines)
+
+# 커밋 후에도 객체 속성을 유지 (INSERT한 객체를 다시 읽지 않음)
+SessionFactory = sessionmaker(
+    class_=RoutingSession,
+    router=replica_router,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
 
 # 비동기 엔진
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
-    echo=True,
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=64,
+    query_cache_size=DATABASE_QUERY_CACHE_SIZE,
 )
 
 # 비동기 세션 팩토리
@@ -35,15 +80,6 @@ AsyncSessionFactory = async_sessionmaker(
 )
 
 
-def get_db():
-    """동기 데이터베이스 세션"""
-    session = SessionFactory()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
 async def get_async_db():
     """비동기 데이터베이스 세션"""
     async with AsyncSessionFactory() as session:
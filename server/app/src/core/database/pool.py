@@ -0,0 +1,108 @@
+"""
+커넥션 풀 대기 시간 측정
+====================
+
+풀 연결을 모두 쓰고 있으면 새 요청은 연결이 반환될 때까지 기다립니다.
+이 대기 시간을 지수 이동 평균으로 기록해 부하 차단(core/load.py)과 /metrics에 사용합니다.
+- 대기 시간은 새 측정이 없으면 POOL_WAIT_HALF_LIFE_SECONDS마다 절반으로 감소
+  (요청을 차단해서 풀을 쓰지 않는 동안에도 값이 내려가도록)
+
+워커 시작 시 풀 연결을 미리 생성 (warm_up):
+- 새로 fork / 재시작된 워커가 첫 사용자 요청에서 DB 연결을 여는 지연을 없앰
+- preload_app으로 마스터에서 만든 연결은 fork로 복사되므로 먼저 버림 (dispose(close=False))
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+POOL_WAIT_HALF_LIFE_SECONDS = float(os.getenv("POOL_WAIT_HALF_LIFE_SECONDS", "1"))
+# 새 측정값의 반영 비율
+POOL_WAIT_SMOOTHING = 0.3
+# 워커 시작 시 엔진마다 미리 열어 둘 연결 수 (0이면 사용하지 않음, 최대 pool_size)
+DATABASE_POOL_WARMUP = int(os.getenv("DATABASE_POOL_WARMUP", "5"))
+
+
+class PoolWaitStats:
+    """풀 연결 대기 시간 통계 (워커 프로세스 전체, 모든 엔진 합산)"""
+
+    def __init__(self, half_life: float = POOL_WAIT_HALF_LIFE_SECONDS):
+        self.half_life = half_life
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._average = 0.0
+        self._updated = time.monotonic()
+        # write-behind 버퍼처럼 스레드에서 연결하는 경우도 있으므로
+        self._lock = threading.Lock()
+
+    def _decayed(self, now: float) -> float:
+        elapsed = now - self._updated
+        return self._average * 0.5 ** (elapsed / self.half_life)
+
+    def record(self, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            average = self._decayed(now)
+            self._average = average + (seconds - average) * POOL_WAIT_SMOOTHING
+            self._updated = now
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    @property
+    def average(self) -> float:
+        """최근 대기 시간 (초, 시간이 지나면 감소)"""
+        with self._lock:
+            return self._decayed(time.monotonic())
+
+
+# 전역 인스턴스
+pool_wait_stats = PoolWaitStats()
+
+
+class MeteredQueuePool(QueuePool):
+    """연결을 가져오는 데 걸린 시간(대기 + pre-ping)을 기록하는 QueuePool"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_wait_stats.record(time.perf_counter() - started)
+
+
+def warm_up(engines: Iterable[Engine], size: int = DATABASE_POOL_WARMUP) -> int:
+    """
+    엔진마다 size개의 연결을 동시에 열었다가 풀에 반환 (lifespan startup, 요청을 받기 전)
+    - 연결에 실패한 엔진은 건너뜀 (readiness에서 상태 확인)
+    Returns: 새로 연 연결 수
+    """
+    opened = 0
+    for engine in engines:
+        # fork 전에 만든 연결은 부모 프로세스 것이므로 닫지 않고 풀에서만 제거
+        engine.dispose(close=False)
+        count = min(size, engine.pool.size()) if hasattr(engine.pool, "size") else 0
+        connections = []
+        try:
+            for _ in range(count):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(
+                f"DB 연결 미리 생성 실패: {engine.url.render_as_string(hide_password=True)} ({e})"
+            )
+        finally:
+            opened += len(connections)
+            for connection in connections:
+                connection.close()
+    return opened
@@ -0,0 +1,169 @@
+"""
+읽기 복제본(replica) 라우팅
+=======================
+
+- 읽기 쿼리는 정상 상태인 복제본으로 라운드 로빈 분배
+- 쓰기(INSERT/UPDATE/DELETE, flush)는 항상 primary
+- 한 번 쓰기가 일어난 DB 세션은 이후 읽기도 primary (read-your-writes)
+- 쓰기 후 DATABASE_STICKY_SECONDS 동안 같은 클라이언트의 읽기는 primary
+  (복제 지연 때문에 방금 쓴 데이터가 안 보이는 문제 방지, 워커 간 공유 상태 사용)
+- 연결 실패한 복제본은 DATABASE_REPLICA_RETRY_SECONDS 동안 제외 (primary로 failover)
+"""
+
+import itertools
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from ..shared_state import shared_state
+
+logger = logging.getLogger(__name__)
+
+DATABASE_STICKY_SECONDS = float(os.getenv("DATABASE_STICKY_SECONDS", "5"))
+DATABASE_REPLICA_RETRY_SECONDS = float(
+    os.getenv("DATABASE_REPLICA_RETRY_SECONDS", "10")
+)
+
+# select(...).execution_options(**USE_PRIMARY)로 특정 읽기를 primary에서 실행
+USE_PRIMARY = {"use_primary": True}
+
+# Session.info 키
+STICKY_KEY = "sticky_key"
+WROTE = "wrote"
+
+
+class ReplicaRouter:
+    """복제본 선택 및 상태 관리"""
+
+    def __init__(self, primary: Engine, replicas: List[Engine]):
+        self.primary = primary
+        self.replicas = replicas
+        self._down_until: Dict[Engine, float] = {}
+        self._counter = itertools.count()
+
+        for replica in replicas:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # 연결 자체가 실패했거나 끊긴 경우에만 복제본을 제외
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+    def mark_down(self, replica: Engine) -> None:
+        logger.warning(
+            f"DB 복제본 연결 실패, {DATABASE_REPLICA_RETRY_SECONDS}초 동안 제외: "
+            f"{replica.url.render_as_string(hide_password=True)}"
+        )
+        self._down_until[replica] = time.monotonic() + DATABASE_REPLICA_RETRY_SECONDS
+
+    def healthy_replicas(self) -> List[Engine]:
+        now = time.monotonic()
+        return [
+            replica
+            for replica in self.replicas
+            if self._down_until.get(replica, 0.0) <= now
+        ]
+
+    def pick(self) -> Engine:
+        """읽기용 엔진 선택 (정상 복제본이 없으면 primary)"""
+        replicas = self.healthy_replicas()
+        if not replicas:
+            return self.primary
+        return replicas[next(self._counter) % len(replicas)]
+
+    def check_health(self) -> Dict[str, bool]:
+        """모든 복제본에 SELECT 1 (제외된 복제본도 복구되면 다시 사용)"""
+        results = {}
+        for replica in self.replicas:
+            name = replica.url.render_as_string(hide_password=True)
+            try:
+                with replica.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                self._down_until.pop(replica, None)
+                results[name] = True
+            except Exception:
+                self.mark_down(replica)
+                results[name] = False
+        return results
+
+    def stick(self, key: str) -> None:
+        """쓰기 후 일정 시간 동안 key의 읽기를 primary로 고정"""
+        shared_state.set(f"db:sticky:{key}", b"1", ttl=DATABASE_STICKY_SECONDS)
+
+    def is_sticky(self, key: str) -> bool:
+        return shared_state.get(f"db:sticky:{key}") is not None
+
+
+class RoutingSession(Session):
+    """쿼리 종류에 따라 primary / 복제본 엔진을 고르는 Session"""
+
+    def __init__(self, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+
+    def _use_primary(self, clause) -> bool:
+        if self._flushing or self.info.get(WROTE):
+            return True
+        if isinstance(clause, UpdateBase):
+            return True
+        if clause is not None and clause.get_execution_options().get("use_primary"):
+            return True
+
+        # 다른 요청에서 방금 쓰기가 있었던 클라이언트인지 (DB 세션당 한 번만 확인)
+        sticky_key = self.info.get(STICKY_KEY)
+        if sticky_key is not None:
+            if "sticky" not in self.info:
+                self.info["sticky"] = self.router.is_sticky(sticky_key)
+            return self.info["sticky"]
+        return False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.router is None or not self.router.replicas:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._use_primary(clause):
+            return self.router.primary
+        return self.router.pick()
+
+
+def mark_written(session: Session) -> None:
+    """
+    세션 밖에서 쓰기를 한 경우 (write-behind 버퍼 등)
+    이 세션과 같은 클라이언트의 이후 읽기를 primary로 고정
+    """
+    session.info[WROTE] = True
+    router = getattr(session, "router", None)
+    sticky_key = session.info.get(STICKY_KEY)
+    if router and router.replicas and sticky_key is not None:
+        try:
+            router.stick(sticky_key)
+        except Exception as e:
+            logger.warning(f"primary 고정 기록 실패: {e}")
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote(session, flush_context):
+    session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    # session.query(...).delete() / session.execute(insert(...)) 같은 벌크 쓰기
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_after_write(session):
+    if session.info.get(WROTE) and session.router and session.router.replicas:
+        sticky_key = session.info.get(STICKY_KEY)
+        if sticky_key is not None:
+            try:
+                session.router.stick(sticky_key)
+            except Exception as e:
+                logger.warning(f"primary 고정 기록 실패: {e}")
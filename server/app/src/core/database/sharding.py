@@ -0,0 +1,144 @@
+"""
+채팅 테이블 샤딩 (user_id 기준)
+===========================
+
+- DATABASE_SHARD_URLS에 쉼표로 구분된 샤드 DB URL을 지정하면 채팅 테이블
+  (chat_sessions / chat_messages / chat_message_archives)을 user_id별 샤드에 저장
+- users 테이블과 샤드 디렉터리(user_shards)는 primary DB에 저장
+- 사용자의 샤드는 user_shards 디렉터리에 고정 (처음 조회할 때 user_id % 샤드 수로 배정)
+  → 샤드를 추가해도 기존 사용자의 위치가 바뀌지 않고, 재배치 도구로 옮길 수 있음
+- 비어 있으면 샤딩하지 않고 모든 채팅 테이블을 primary DB에서 사용
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Column, Integer, create_engine, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from ..model import Base
+from .connection import DATABASE_QUERY_CACHE_SIZE, SessionFactory, engine
+from .pool import MeteredQueuePool
+
+DATABASE_SHARD_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_SHARD_URLS", "").split(",")
+    if url.strip()
+]
+SHARD_DIRECTORY_CACHE_SECONDS = float(os.getenv("SHARD_DIRECTORY_CACHE_SECONDS", "5"))
+
+# 샤드에 저장되는 테이블 (FK 순서)
+SHARDED_TABLE_NAMES = ["chat_sessions", "chat_messages", "chat_message_archives"]
+
+
+class UserShard(Base):
+    """사용자 → 샤드 번호 디렉터리 (primary DB)"""
+
+    __tablename__ = "user_shards"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    shard_no = Column(Integer, nullable=False)
+
+
+class ShardRouter:
+    """user_id로 샤드 엔진을 찾는 라우터"""
+
+    def __init__(self, primary, urls: List[str]):
+        self.primary = primary
+        self.engines = [
+            create_engine(
+                url,
+                poolclass=MeteredQueuePool,
+                pool_pre_ping=True,
+                query_cache_size=DATABASE_QUERY_CACHE_SIZE,
+            )
+            for url in urls
+        ]
+        self.session_factories = [
+            sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                bind=shard_engine,
+            )
+            for shard_engine in self.engines
+        ]
+        self._cache: Dict[int, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def create_tables(self) -> None:
+        """모든 샤드에 채팅 테이블 생성"""
+        tables = [Base.metadata.tables[name] for name in SHARDED_TABLE_NAMES]
+        for shard_engine in self.engines:
+            Base.metadata.create_all(bind=shard_engine, tables=tables)
+
+    def shard_for_user(self, user_id: int) -> int:
+        """사용자의 샤드 번호 (프로세스 내부에 SHARD_DIRECTORY_CACHE_SECONDS 동안 캐시)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(user_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        shard_no = self._lookup(user_id)
+        with self._lock:
+            self._cache[user_id] = (shard_no, now + SHARD_DIRECTORY_CACHE_SECONDS)
+        return shard_no
+
+    def _lookup(self, user_id: int) -> int:
+        with self.primary.connect() as connection:
+            shard_no = connection.scalar(
+                select(UserShard.shard_no).where(UserShard.user_id == user_id)
+            )
+        if shard_no is not None:
+            return shard_no
+
+        # 처음 보는 사용자는 기본 배정 후 디렉터리에 고정
+        shard_no = user_id % len(self.engines)
+        try:
+            with self.primary.begin() as connection:
+                connection.execute(
+                    insert(UserShard).values(user_id=user_id, shard_no=shard_no)
+                )
+        except IntegrityError:
+            # 다른 워커가 먼저 고정한 경우
+            return self._lookup(user_id)
+        return shard_no
+
+    def assign(self, user_id: int, shard_no: int) -> None:
+        """사용자의 샤드 변경 (재배치 도구용)"""
+        with self.primary.begin() as connection:
+            updated = connection.execute(
+                update(UserShard)
+                .where(UserShard.user_id == user_id)
+                .values(shard_no=shard_no)
+            ).rowcount
+            if not updated:
+                connection.execute(
+                    insert(UserShard).values(user_id=user_id, shard_no=shard_no)
+                )
+        with self._lock:
+            self._cache.pop(user_id, None)
+
+
+# 전역 인스턴스
+shard_router = ShardRouter(primary=engine, urls=DATABASE_SHARD_URLS)
+
+
+def chat_session_factories() -> List[sessionmaker]:
+    """배치 작업용: 채팅 테이블이 있는 모든 DB의 세션 팩토리"""
+    return shard_router.session_factories or [SessionFactory]
+
+
+def session_factory_for_user(user_id: int) -> sessionmaker:
+    """사용자의 채팅 데이터가 있는 DB의 세션 팩토리 (요청 밖에서 쓰는 작업용)"""
+    if not shard_router.enabled:
+        return SessionFactory
+    return shard_router.session_factories[shard_router.shard_for_user(user_id)]
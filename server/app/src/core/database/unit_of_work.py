@@ -0,0 +1,106 @@
+"""
+요청 단위 DB 작업 단위 (Unit of Work)
+================================
+
+한 요청의 모든 Repository가 같은 UnitOfWork를 공유합니다.
+- DB 세션은 처음 쿼리할 때 생성 (인증 실패처럼 DB를 쓰지 않는 요청은 연결하지 않음)
+- 채팅 테이블은 user_id의 샤드 DB 세션을 처음 사용할 때 생성
+- release()로 연결을 풀에 반환하고, 다음 쿼리에서 다시 연결
+  → AI 응답 지연 / long-poll 대기처럼 오래 기다리는 동안 풀 연결을 잡고 있지 않음
+"""
+
+import hashlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+
+from .connection import SessionFactory
+from .routing import STICKY_KEY
+from .sharding import ShardRouter, shard_router
+
+
+class UnitOfWork:
+    """요청 단위 DB 세션 모음 (primary 세션 + 사용한 샤드 세션)"""
+
+    def __init__(
+        self, sticky_key: Optional[str] = None, router: ShardRouter = shard_router
+    ):
+        self.sticky_key = sticky_key
+        self.router = router
+        self._session: Optional[Session] = None
+        self._shard_sessions: Dict[int, Session] = {}
+
+    @property
+    def session(self) -> Session:
+        """기본 DB 세션 (users 등 primary 테이블, 복제본 라우팅 적용)"""
+        if self._session is None:
+            self._session = SessionFactory()
+            if self.sticky_key is not None:
+                self._session.info[STICKY_KEY] = self.sticky_key
+        return self._session
+
+    def for_user(self, user_id: int) -> Session:
+        """사용자의 채팅 데이터가 있는 DB 세션 (샤딩하지 않으면 기본 세션)"""
+        if not self.router.enabled:
+            return self.session
+        shard_no = self.router.shard_for_user(user_id)
+        session = self._shard_sessions.get(shard_no)
+        if session is None:
+            session = self.router.session_factories[shard_no]()
+            self._shard_sessions[shard_no] = session
+        return session
+
+    def _opened(self) -> List[Session]:
+        sessions = list(self._shard_sessions.values())
+        if self._session is not None:
+            sessions.insert(0, self._session)
+        return sessions
+
+    def release(self) -> None:
+        """
+        연결을 풀에 반환 (세션 객체는 그대로 두고 다음 쿼리에서 다시 연결)
+        - 커밋하지 않은 변경은 버려지므로 쓰기를 마친 뒤에 호출
+        """
+        for session in self._opened():
+            session.close()
+
+    def close(self) -> None:
+        self.release()
+        self._session = None
+        self._shard_sessions = {}
+
+
+def get_unit_of_work(request: Request):
+    """
+    요청 단위 UnitOfWork
+    - 같은 인증 토큰의 요청은 쓰기 직후 일정 시간 primary에서 읽도록 sticky key 지정
+    """
+    sticky_key = None
+    authorization = request.headers.get("authorization")
+    if authorization:
+        sticky_key = hashlib.blake2b(
+            authorization.encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    uow = UnitOfWork(sticky_key=sticky_key)
+    try:
+        yield uow
+    finally:
+        uow.close()
+
+
+def get_db(uow: UnitOfWork = Depends(get_unit_of_work)) -> Session:
+    """요청의 기본 DB 세션 (UnitOfWork와 같은 세션)"""
+    return uow.session
+
+
+@contextmanager
+def open_unit_of_work():
+    """요청 밖에서 쓰는 UnitOfWork (백그라운드 작업용)"""
+    uow = UnitOfWork()
+    try:
+        yield uow
+    finally:
+        uow.close()
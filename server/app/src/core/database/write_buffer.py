@@ -0,0 +1,191 @@
+"""
+Write-behind 버퍼 (그룹 커밋)
+==========================
+
+요청마다 커밋하면 트랜잭션마다 fsync가 일어나 피크 시간에 DB 쓰기가 병목이 됩니다.
+버퍼에 행을 모았다가 WRITE_BUFFER_MAX_DELAY_MS마다 또는 WRITE_BUFFER_MAX_ROWS개씩
+multi-row INSERT 한 번과 커밋 한 번으로 저장합니다.
+- 호출자는 자기 행이 커밋될 때까지 future로 대기 (커밋 후 응답하는 보장은 그대로)
+- 버퍼가 가득 차면(WRITE_BUFFER_CAPACITY) 새 요청이 자리가 날 때까지 대기 (backpressure)
+- 묶음 저장이 실패하면 한 행씩 다시 저장해 실패한 행의 호출자에게만 오류 전달
+- 워커 종료 시 drain()으로 남은 행을 모두 저장 (gunicorn graceful_timeout 안에서)
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_MAX_ROWS = int(os.getenv("WRITE_BUFFER_MAX_ROWS", "500"))
+WRITE_BUFFER_MAX_DELAY_MS = float(os.getenv("WRITE_BUFFER_MAX_DELAY_MS", "5"))
+WRITE_BUFFER_CAPACITY = int(os.getenv("WRITE_BUFFER_CAPACITY", "10000"))
+
+# 종료 시 남은 행을 저장하는 최대 시간 (gunicorn graceful_timeout보다 짧게)
+WRITE_BUFFER_DRAIN_SECONDS = float(
+    os.getenv(
+        "WRITE_BUFFER_DRAIN_SECONDS",
+        max(float(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30")) - 5, 1),
+    )
+)
+
+Entry = Tuple[sessionmaker, dict, asyncio.Future]
+
+
+class GroupCommitBuffer:
+    """한 테이블에 대한 그룹 커밋 버퍼 (워커 프로세스마다 하나)"""
+
+    def __init__(
+        self,
+        table: Table,
+        max_rows: int = WRITE_BUFFER_MAX_ROWS,
+        max_delay: float = WRITE_BUFFER_MAX_DELAY_MS / 1000,
+        capacity: int = WRITE_BUFFER_CAPACITY,
+    ):
+        self.table = table
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.capacity = capacity
+        self.flushed_rows = 0
+        self.flushed_batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    @property
+    def accepting(self) -> bool:
+        """새 행을 받을 수 있는지 (drain 시작 후에는 False)"""
+        return not self._closed
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        # fork된 워커마다 자기 이벤트 루프에서 flusher를 시작
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.capacity)
+            self._flusher = loop.create_task(self._run())
+        return loop
+
+    async def submit(self, session_factory: sessionmaker, row: dict) -> None:
+        """행을 버퍼에 넣고 커밋될 때까지 대기 (저장 실패 시 예외 발생)"""
+        if self._closed:
+            raise RuntimeError("write-behind 버퍼가 종료되었습니다.")
+        loop = self._ensure_started()
+        future = loop.create_future()
+        await self._queue.put((session_factory, row, future))
+        # 요청이 취소되어도 이미 넣은 행은 저장되도록 future를 보호
+        await asyncio.shield(future)
+
+    async def _collect(self) -> List[Entry]:
+        """첫 행이 들어온 뒤 max_delay 동안 또는 max_rows개까지 모음"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_delay
+        while len(batch) < self.max_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.exception(f"write-behind 저장 실패: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Entry]) -> None:
+        # 대상 DB(샤드)별로 묶어서 동시에 저장
+        groups: Dict[sessionmaker, List[Entry]] = {}
+        for entry in batch:
+            groups.setdefault(entry[0], []).append(entry)
+
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self._write, session_factory, [row for _, row, _ in entries]
+                )
+                for session_factory, entries in groups.items()
+            )
+        )
+        for entries, errors in zip(groups.values(), results):
+            for (_, _, future), error in zip(entries, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+        self.flushed_rows += len(batch)
+        self.flushed_batches += len(groups)
+
+    def _write(
+        self, session_factory: sessionmaker, rows: List[dict]
+    ) -> List[Optional[Exception]]:
+        """multi-row INSERT + 커밋 한 번 (행별 오류 반환)"""
+        with session_factory() as session:
+            try:
+                session.execute(insert(self.table), rows)
+                session.commit()
+                return [None] * len(rows)
+            except Exception as e:
+                session.rollback()
+                if len(rows) == 1:
+                    return [e]
+                logger.warning(f"묶음 저장 실패, 한 행씩 다시 저장: {e}")
+
+            errors: List[Optional[Exception]] = []
+            for row in rows:
+                try:
+                    session.execute(insert(self.table), [row])
+                    session.commit()
+                    errors.append(None)
+                except Exception as e:
+                    session.rollback()
+                    errors.append(e)
+            return errors
+
+    async def drain(self, timeout: float = WRITE_BUFFER_DRAIN_SECONDS) -> None:
+        """새 행을 받지 않고, 남은 행을 timeout 안에 모두 저장한 뒤 flusher 종료"""
+        self._closed = True
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"write-behind 버퍼를 {timeout}초 안에 비우지 못했습니다 "
+                f"(남은 행 {self._queue.qsize()}개)"
+            )
+        self._flusher.cancel()
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(
+                    RuntimeError("write-behind 버퍼가 종료되었습니다.")
+                )
@@ -0,0 +1,91 @@
+"""
+HTTP 응답 압축 / 캐시 검증 유틸리티
+==============================
+
+- 응답 압축 미들웨어 설정 (gzip / brotli, 최소 크기 이상만 압축)
+- ETag / If-None-Match 기반 조건부 요청 처리 (변경 없으면 304)
+"""
+
+import hashlib
+import logging
+import os
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.middleware.gzip import GZipMiddleware
+
+logger = logging.getLogger(__name__)
+
+# 응답 압축 설정
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "gzip")  # gzip/brotli/off
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "5"))
+
+# 클라이언트가 캐시는 하되 사용 전에 항상 재검증하도록
+CACHE_CONTROL = "private, no-cache"
+
+
+def setup_compression(app: FastAPI) -> None:
+    """
+    응답 압축 미들웨어 등록
+    - RESPONSE_COMPRESSION=brotli: brotli-asgi 패키지 사용 (gzip만 지원하는 클라이언트는 gzip)
+    - RESPONSE_COMPRESSION=gzip: Starlette GZipMiddleware 사용
+    - RESPONSE_COMPRESSION=off: 압축하지 않음 (nginx 등에서 압축하는 경우)
+    - 이미 Content-Encoding이 지정된 응답은 다시 압축하지 않음
+    """
+    if RESPONSE_COMPRESSION == "brotli":
+        try:
+            from brotli_asgi import BrotliMiddleware
+        except ImportError:
+            logger.warning("brotli-asgi 패키지가 없어 gzip 압축을 사용합니다.")
+        else:
+            app.add_middleware(
+                BrotliMiddleware,
+                quality=COMPRESSION_LEVEL,
+                minimum_size=COMPRESSION_MINIMUM_SIZE,
+                gzip_fallback=True,
+            )
+            return
+
+    if RESPONSE_COMPRESSION in ("gzip", "brotli"):
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=COMPRESSION_MINIMUM_SIZE,
+            compresslevel=COMPRESSION_LEVEL,
+        )
+
+
+def make_etag(*parts) -> str:
+    """버전 정보(최신 ID, 개수, 수정 시각 등)로 weak ETag 생성"""
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인 (weak 비교)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified 응답"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """조회 응답에 ETag / Cache-Control 헤더 설정"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
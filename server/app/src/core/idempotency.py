@@ -0,0 +1,162 @@
+"""
+Idempotency-Key 처리
+==================
+
+클라이언트가 시간 초과로 같은 요청을 다시 보내도 한 번만 실행되도록 합니다.
+- 처음 요청이 키를 선점(공유 상태 add)하고 실행, 결과(상태 코드 + 본문)를
+  IDEMPOTENCY_TTL_SECONDS 동안 저장
+- 같은 키의 재요청은 저장된 응답을 그대로 반환 (Idempotent-Replayed: true)
+- 같은 워커에서 실행 중인 요청은 같은 task의 결과를 기다림
+- 다른 워커에서 실행 중이면 IDEMPOTENCY_WAIT_SECONDS 동안 결과가 저장되기를 기다림
+- 같은 키로 다른 본문을 보내면 422, 대기 시간 안에 끝나지 않으면 409
+- 실행이 실패하면(예외) 키를 지워 다음 재시도가 다시 실행할 수 있게 함
+  (부수 효과가 생긴 뒤의 실패는 handler가 예외 대신 실패 결과를 반환해 저장)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .shared_state import SharedState, shared_state
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+# 실행 중 표시의 유효 시간 (워커가 죽어도 이 시간이 지나면 다시 실행 가능)
+IDEMPOTENCY_PENDING_SECONDS = float(os.getenv("IDEMPOTENCY_PENDING_SECONDS", "60"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+IDEMPOTENCY_POLL_SECONDS = 0.1
+
+# 실행 결과: (상태 코드, JSON 본문)
+Result = Tuple[int, dict]
+
+
+def request_fingerprint(*parts) -> str:
+    """같은 키로 다른 요청을 보냈는지 확인하기 위한 요청 내용 해시"""
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+class IdempotencyStore:
+    """Idempotency-Key별 실행 결과 저장소 (공유 상태 사용)"""
+
+    def __init__(self, state: SharedState, prefix: str = "idem"):
+        self.state = state
+        self.prefix = prefix
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """이 워커에서 실행 중인 요청 수"""
+        return len(self._inflight)
+
+    def _key(self, scope: str, key: str) -> str:
+        return f"{self.prefix}:{scope}:{key}"
+
+    async def run_once(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[Result]],
+    ) -> Tuple[Result, bool]:
+        """
+        같은 (scope, key)에 대해 handler를 한 번만 실행
+        - handler는 별도 task로 실행해서 처음 요청의 연결이 끊겨도 끝까지 실행
+          (요청이 끝나면 닫히는 의존성(DB 세션 등)을 쓰지 않아야 함)
+        - handler의 예외는 실행하지 않은 것으로 보고 키를 지움
+          (저장 등 부수 효과가 생긴 뒤의 실패는 예외 대신 실패 결과를 반환)
+        - (결과, 저장된 결과를 재사용했는지) 반환
+        """
+        state_key = self._key(scope, key)
+
+        # 같은 워커에서 실행 중인 요청에 합류
+        inflight = self._inflight.get(state_key)
+        if inflight is not None:
+            result, inflight_fingerprint = await asyncio.shield(inflight)
+            self._check_fingerprint(inflight_fingerprint, fingerprint)
+            return result, True
+
+        stored = await self._claim(state_key, fingerprint)
+        if stored is not None:
+            return stored, True
+
+        task = asyncio.create_task(self._execute(state_key, fingerprint, handler))
+        self._inflight[state_key] = task
+        task.add_done_callback(lambda done: self._finish(state_key, done))
+        result, _ = await asyncio.shield(task)
+        return result, False
+
+    async def _execute(
+        self,
+        state_key: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[Result]],
+    ) -> Tuple[Result, str]:
+        try:
+            result = await handler()
+        except BaseException:
+            # 다음 재시도가 다시 실행할 수 있도록 키를 지움
+            self.state.delete(state_key)
+            raise
+        self._store(state_key, fingerprint, result)
+        return result, fingerprint
+
+    def _finish(self, state_key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(state_key, None)
+        # 기다리는 요청이 없어도 처리되지 않은 예외 경고가 남지 않도록
+        if not task.cancelled():
+            task.exception()
+
+    async def _claim(self, state_key: str, fingerprint: str) -> Optional[Result]:
+        """키를 선점하면 None, 이미 저장된 결과가 있으면 그 결과"""
+        deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+        pending = json.dumps({"fingerprint": fingerprint}).encode()
+        while True:
+            if self.state.add(state_key, pending, ttl=IDEMPOTENCY_PENDING_SECONDS):
+                return None
+
+            value = self.state.get(state_key)
+            if value is not None:
+                record = json.loads(value)
+                self._check_fingerprint(record["fingerprint"], fingerprint)
+                if "status" in record:
+                    return record["status"], record["body"]
+
+            # 다른 워커에서 실행 중
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                )
+            await asyncio.sleep(IDEMPOTENCY_POLL_SECONDS)
+
+    def _check_fingerprint(self, stored: str, fingerprint: str) -> None:
+        if stored != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request",
+            )
+
+    def _store(self, state_key: str, fingerprint: str, result: Result) -> None:
+        status_code, body = result
+        record = json.dumps(
+            {"fingerprint": fingerprint, "status": status_code, "body": body},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        try:
+            self.state.set(state_key, record, ttl=IDEMPOTENCY_TTL_SECONDS)
+        except Exception as e:
+            # 저장하지 못하면 재시도가 다시 실행되도록 실행 중 표시도 지움
+            logger.warning(f"Idempotency 결과 저장 실패: {e}")
+            self.state.delete(state_key)
+
+
+# 전역 인스턴스
+idempotency_store = IdempotencyStore(shared_state)
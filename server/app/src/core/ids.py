@@ -0,0 +1,210 @@
+"""
+전역 ID 생성 (snowflake 방식)
+=========================
+
+샤드마다 autoincrement를 쓰면 ID가 겹치므로, 애플리케이션에서 64bit ID를 생성합니다.
+
+    0 | 41bit 밀리초 타임스탬프 (ID_EPOCH 기준) | 10bit 노드 ID | 12bit 순번
+
+- 같은 노드에서는 항상 증가 (시계가 뒤로 가도 마지막 시각을 이어서 사용)
+- 노드 ID가 다르면 같은 밀리초에도 겹치지 않음 (노드당 밀리초에 4096개)
+- 노드 ID는 워커 프로세스마다 공유 상태에서 임대 (NODE_ID로 고정 가능)
+  SHARED_STATE_BACKEND=memory는 워커 / 컨테이너끼리 임대를 조정하지 못하므로
+  NODE_ID가 없으면 워커 시작 시 실패 (NODE_ID는 워커가 1개일 때만 사용)
+  → INSERT 전에 ID를 알 수 있어 저장 후 다시 읽지 않아도 되고, ID만으로 정렬/페이징 가능
+- 임대는 백그라운드 스레드가 소유자를 확인하며 갱신 (compare-and-set)
+  다른 프로세스가 가져간 노드 ID는 더 쓰지 않고 새로 임대, 워커 종료 시 반환
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from .shared_state import shared_state
+
+logger = logging.getLogger(__name__)
+
+ID_EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# 노드 ID 임대 시간 (임대 시간의 1/3마다 백그라운드에서 갱신)
+ID_NODE_LEASE_SECONDS = float(os.getenv("ID_NODE_LEASE_SECONDS", "600"))
+
+
+def _lease_key(node_id: int) -> str:
+    return f"ids:node:{node_id}"
+
+
+def _lease_owner() -> bytes:
+    return f"{socket.gethostname()}:{os.getpid()}".encode()
+
+
+def lease_node_id() -> int:
+    """프로세스 ID에서 시작해 비어 있는 노드 ID를 공유 상태에 선점"""
+    if not shared_state.shared:
+        # 워커마다 자기 dict에서 임대하게 되어 같은 노드 ID (→ 같은 PK)가 생길 수 있음
+        raise RuntimeError(
+            "SHARED_STATE_BACKEND=memory에서는 노드 ID를 임대할 수 없습니다. "
+            "NODE_ID를 지정하거나 (워커 1개) SHARED_STATE_BACKEND=redis를 사용하세요."
+        )
+    start = os.getpid() & MAX_NODE_ID
+    for offset in range(MAX_NODE_ID + 1):
+        node_id = (start + offset) & MAX_NODE_ID
+        if shared_state.add(
+            _lease_key(node_id), _lease_owner(), ttl=ID_NODE_LEASE_SECONDS
+        ):
+            return node_id
+    raise RuntimeError("사용 가능한 노드 ID가 없습니다.")
+
+
+class SnowflakeGenerator:
+    """시간 순으로 증가하는 64bit ID 생성기"""
+
+    def __init__(self, node_id: Optional[int] = None):
+        self.reset(node_id)
+
+    def reset(self, node_id: Optional[int] = None) -> None:
+        """
+        노드 ID 변경 (fork된 워커 프로세스용)
+        - node_id가 없으면 NODE_ID 환경변수, 그것도 없으면 처음 ID를 만들 때 임대
+        """
+        if node_id is None and os.getenv("NODE_ID"):
+            node_id = int(os.environ["NODE_ID"])
+        if node_id is not None and not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"노드 ID는 0~{MAX_NODE_ID} 사이여야 합니다: {node_id}")
+        self.node_id = node_id
+        self._leased = node_id is None
+        self._renew_at = 0.0
+        self._lock = threading.Lock()
+        # fork 전 프로세스의 갱신 스레드는 자식에 없으므로 새로 시작
+        self._stop_renewing = threading.Event()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def start(self) -> None:
+        """워커 시작 시 노드 ID를 미리 임대 (설정이 잘못됐으면 요청을 받기 전에 실패)"""
+        with self._lock:
+            self._ensure_node_id()
+
+    def _ensure_node_id(self) -> None:
+        """ID를 만들기 전 노드 ID 확인 (갱신 스레드가 늦었으면 여기서 갱신)"""
+        if not self._leased:
+            return
+        if self.node_id is None:
+            self._lease()
+            threading.Thread(
+                target=self._renew_loop,
+                args=(self._stop_renewing,),
+                name="id-lease-renewer",
+                daemon=True,
+            ).start()
+        elif time.monotonic() >= self._renew_at:
+            self._renew()
+
+    def _lease(self) -> None:
+        self.node_id = lease_node_id()
+        self._renew_at = time.monotonic() + ID_NODE_LEASE_SECONDS / 3
+        logger.info(f"ID 노드 {self.node_id} 임대 (pid={os.getpid()})")
+
+    def _renew(self) -> None:
+        """
+        임대 갱신 (self._lock 안에서 호출)
+        - 저장된 소유자가 이 프로세스일 때만 갱신
+        - 임대가 만료되어 다른 프로세스가 가져갔거나 사라졌으면 새 노드 ID를 임대
+        """
+        try:
+            renewed = shared_state.compare_and_set(
+                _lease_key(self.node_id),
+                _lease_owner(),
+                _lease_owner(),
+                ttl=ID_NODE_LEASE_SECONDS,
+            )
+            if not renewed:
+                previous = self.node_id
+                self._lease()
+                logger.warning(
+                    f"ID 노드 {previous} 임대를 잃어 노드 {self.node_id}로 변경"
+                )
+                return
+        except Exception as e:
+            # 임대 시간이 남아 있는 동안은 같은 노드 ID를 계속 사용
+            logger.warning(f"ID 노드 임대 갱신 실패: {e}")
+        self._renew_at = time.monotonic() + ID_NODE_LEASE_SECONDS / 3
+
+    def _renew_loop(self, stop: threading.Event) -> None:
+        """ID를 만들지 않는 동안에도 임대가 만료되지 않도록 주기적으로 갱신"""
+        while not stop.wait(ID_NODE_LEASE_SECONDS / 3):
+            with self._lock:
+                if self.node_id is not None:
+                    self._renew()
+
+    def release(self) -> None:
+        """
+        갱신을 멈추고 임대한 노드 ID 반환 (워커 종료 시)
+        - 이미 다른 프로세스가 가져간 임대는 삭제하지 않음
+        """
+        self._stop_renewing.set()
+        with self._lock:
+            if not self._leased or self.node_id is None:
+                return
+            try:
+                shared_state.compare_and_delete(
+                    _lease_key(self.node_id), _lease_owner()
+                )
+            except Exception as e:
+                logger.warning(f"ID 노드 임대 반환 실패: {e}")
+            else:
+                logger.info(f"ID 노드 {self.node_id} 반환 (pid={os.getpid()})")
+            self.node_id = None
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._ensure_node_id()
+            now_ms = int(time.time() * 1000)
+            if now_ms < self._last_ms:
+                # 시계가 뒤로 간 경우 (NTP 보정 등) 마지막 시각을 이어서 사용
+                now_ms = self._last_ms
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # 이번 밀리초의 순번을 다 썼으면 다음 밀리초를 미리 사용
+                    now_ms = self._last_ms + 1
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            return (
+                ((now_ms - ID_EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS))
+                | (self.node_id << SEQUENCE_BITS)
+                | self._sequence
+            )
+
+
+def id_to_datetime(value: int) -> datetime:
+    """ID에 기록된 생성 시각 (로컬 시간)"""
+    return datetime.fromtimestamp(
+        ((value >> (NODE_BITS + SEQUENCE_BITS)) + ID_EPOCH_MS) / 1000
+    )
+
+
+def datetime_to_id(value: datetime) -> int:
+    """value 시각에 생성된 ID 중 가장 작은 값 (ID 범위 조회용)"""
+    return int(value.timestamp() * 1000 - ID_EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS)
+
+
+# 전역 인스턴스 (노드 ID는 처음 ID를 만들 때 임대)
+id_generator = SnowflakeGenerator()
+
+# preload_app으로 fork된 워커가 마스터와 같은 노드 ID를 쓰지 않도록
+os.register_at_fork(after_in_child=id_generator.reset)
+
+
+def generate_id() -> int:
+    """새 전역 ID"""
+    return id_generator.next_id()
@@ -0,0 +1,252 @@
+"""
+이벤트 루프 지연 측정 + 부하 차단
+============================
+
+UvicornWorker는 DB 풀이나 CPU가 처리할 수 있는 것보다 훨씬 많은 요청을 동시에 받습니다.
+루프가 포화되면 모든 요청이 한꺼번에 느려지므로, 과부하 신호가 보이면 덜 중요한 요청부터
+503 + Retry-After로 바로 거절해 나머지 요청의 지연 시간을 지킵니다.
+
+과부하 신호 (pressure = 각 값 / 기준값 중 큰 값):
+- 이벤트 루프 지연: LOOP_LAG_INTERVAL_MS마다 sleep이 예정보다 늦게 깨어난 시간
+- 풀 대기 시간: DB 연결을 가져오는 데 걸린 시간 (core/database/pool.py)
+
+우선순위별 차단 (pressure가 시작값을 넘으면 확률적으로, 시작값의 2배에서 전부 차단):
+- LOW (시작 1): 정적 파일, 시크릿 테스트, 메시지 목록 / 여러 세션 최근 메시지 / 내보내기 /
+  사용량 통계 조회
+- NORMAL (시작 2): 그 외 요청 (로그인, 세션 목록, 새 메시지 long-poll 등)
+- HIGH (시작 4): POST /send (가장 마지막에 차단)
+- CRITICAL: /health, /ready, /metrics, 관리자 진단 API (차단하지 않음, 과부하 원인 확인용)
+
+우선순위는 엔드포인트에 load_priority()로 지정하고, 요청 경로에 맞는 라우트로 판단합니다
+(라우터 prefix를 여기서 다시 적지 않음). 라우트 매칭은 과부하일 때만 합니다.
+"""
+
+import asyncio
+import math
+import os
+import random
+from enum import IntEnum
+from typing import Callable, Dict, Optional, TypeVar
+
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute, Match, Mount, Router
+
+from .database.pool import PoolWaitStats, pool_wait_stats
+from .metrics import Metric, counter, gauge, metrics
+
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+LOAD_SHED_ENABLED = os.getenv("LOAD_SHED_ENABLED", "true").lower() == "true"
+# pressure 1.0 기준값
+LOAD_SHED_LAG_MS = float(os.getenv("LOAD_SHED_LAG_MS", "100"))
+LOAD_SHED_POOL_WAIT_MS = float(os.getenv("LOAD_SHED_POOL_WAIT_MS", "50"))
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "1"))
+
+# 새 측정값의 반영 비율
+LAG_SMOOTHING = 0.5
+
+
+class Priority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    CRITICAL = 3
+
+
+# 우선순위별 차단을 시작하는 pressure (CRITICAL은 차단하지 않음)
+SHED_START: Dict[Priority, float] = {
+    Priority.LOW: 1.0,
+    Priority.NORMAL: 2.0,
+    Priority.HIGH: 4.0,
+}
+
+T = TypeVar("T")
+
+
+def load_priority(
+    priority: Priority, long_poll_param: Optional[str] = None
+) -> Callable[[T], T]:
+    """
+    엔드포인트(또는 마운트하는 앱)의 부하 차단 우선순위 지정 (지정하지 않으면 NORMAL)
+    - long_poll_param 쿼리가 있는 요청은 long-poll이므로 NORMAL
+    """
+
+    def decorate(endpoint: T) -> T:
+        endpoint.load_priority = priority
+        endpoint.load_long_poll_query = (
+            long_poll_param.encode() + b"=" if long_poll_param else None
+        )
+        return endpoint
+
+    return decorate
+
+
+def route_priority(route: BaseRoute, query_string: bytes) -> Priority:
+    """라우트의 엔드포인트에 지정한 우선순위"""
+    target = route.app if isinstance(route, Mount) else getattr(route, "endpoint", None)
+    priority = getattr(target, "load_priority", Priority.NORMAL)
+    long_poll_query = getattr(target, "load_long_poll_query", None)
+    if long_poll_query is not None and long_poll_query in query_string:
+        return Priority.NORMAL
+    return priority
+
+
+def request_priority(router: Router, scope) -> Priority:
+    """요청 우선순위 (미들웨어에서 라우팅 전에 요청에 맞는 라우트를 찾아 판단)"""
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route_priority(route, scope.get("query_string", b""))
+    # 없는 경로 / 허용하지 않는 메서드 (404 / 405)
+    return Priority.NORMAL
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정 (워커 프로세스마다 하나)"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """측정 task 시작 (lifespan startup)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(loop.time() - started - self.interval, 0.0))
+
+    def record(self, lag: float) -> None:
+        self.lag += (lag - self.lag) * LAG_SMOOTHING
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+
+
+class LoadShedder:
+    """과부하 정도에 따라 낮은 우선순위 요청부터 차단"""
+
+    def __init__(
+        self,
+        lag_monitor: LoopLagMonitor,
+        pool_wait: PoolWaitStats,
+        lag_threshold: float = LOAD_SHED_LAG_MS / 1000,
+        pool_wait_threshold: float = LOAD_SHED_POOL_WAIT_MS / 1000,
+    ):
+        self.lag_monitor = lag_monitor
+        self.pool_wait = pool_wait
+        self.lag_threshold = lag_threshold
+        self.pool_wait_threshold = pool_wait_threshold
+        self.shed: Dict[Priority, int] = {priority: 0 for priority in Priority}
+
+    @property
+    def overloaded(self) -> bool:
+        """가장 낮은 우선순위의 차단 시작값을 넘었는지"""
+        return self.pressure > min(SHED_START.values())
+
+    @property
+    def pressure(self) -> float:
+        """과부하 정도 (1.0이면 기준값)"""
+        return max(
+            self.lag_monitor.lag / self.lag_threshold,
+            self.pool_wait.average / self.pool_wait_threshold,
+        )
+
+    def shed_probability(self, priority: Priority) -> float:
+        start = SHED_START.get(priority)
+        if start is None:
+            return 0.0
+        return min(max((self.pressure - start) / start, 0.0), 1.0)
+
+    def should_shed(self, priority: Priority) -> bool:
+        probability = self.shed_probability(priority)
+        if probability <= 0 or random.random() >= probability:
+            return False
+        self.shed[priority] += 1
+        return True
+
+    def retry_after(self) -> int:
+        """과부하가 심할수록 길게 (LOAD_SHED_RETRY_AFTER ~ 4배)"""
+        return LOAD_SHED_RETRY_AFTER * min(max(math.ceil(self.pressure / 2), 1), 4)
+
+
+# 전역 인스턴스
+loop_lag_monitor = LoopLagMonitor()
+load_shedder = LoadShedder(loop_lag_monitor, pool_wait_stats)
+
+
+class LoadSheddingMiddleware:
+    """
+    과부하 시 DB 조회 전에 503으로 거절 (ASGI 미들웨어)
+    - router: 우선순위를 판단할 앱의 라우터 (app.router, 미들웨어 추가 후 등록한 라우트도 포함)
+    """
+
+    def __init__(self, app, router: Router, shedder: LoadShedder = load_shedder):
+        self.app = app
+        self.router = router
+        self.shedder = shedder
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not LOAD_SHED_ENABLED
+            or not self.shedder.overloaded
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        priority = request_priority(self.router, scope)
+        if not self.shedder.should_shed(priority):
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            {"detail": "Server is overloaded, please retry later"},
+            status_code=503,
+            headers={"Retry-After": str(self.shedder.retry_after())},
+        )
+        await response(scope, receive, send)
+
+
+@metrics.register
+def collect_load_metrics():
+    yield gauge(
+        "event_loop_lag_seconds", "이벤트 루프 지연 (이동 평균)", loop_lag_monitor.lag
+    )
+    yield gauge(
+        "event_loop_lag_max_seconds",
+        "워커 시작 후 최대 루프 지연",
+        loop_lag_monitor.max_lag,
+    )
+    yield gauge(
+        "db_pool_wait_seconds", "DB 연결 대기 시간 (이동 평균)", pool_wait_stats.average
+    )
+    yield counter(
+        "db_pool_checkouts_total", "DB 연결 가져오기 횟수", pool_wait_stats.count
+    )
+    yield counter(
+        "db_pool_wait_seconds_total",
+        "DB 연결 대기 시간 합계",
+        pool_wait_stats.total_seconds,
+    )
+    yield gauge("load_pressure", "과부하 정도 (1.0 = 기준값)", load_shedder.pressure)
+    yield Metric(
+        "load_shed_requests_total",
+        "counter",
+        "부하 차단으로 거절한 요청 수",
+        [
+            ({"priority": priority.name.lower()}, count)
+            for priority, count in load_shedder.shed.items()
+            if priority in SHED_START
+        ],
+    )
@@ -0,0 +1,268 @@
+"""
+구조화 로그 (JSON, 비동기 출력)
+============================
+
+로그 호출은 레코드를 queue에 넣기만 하고, 별도 스레드가 JSON으로 변환해 stdout에 씁니다.
+→ 느린 로그 파이프(docker 로그 드라이버 등)가 이벤트 루프를 막지 않음
+- 모든 로그에 request_id 포함 (X-Request-ID 헤더 또는 새로 생성, 응답 헤더로 반환)
+- 접근 로그(gunicorn.access): method, path, route, status, duration_ms
+  LOG_SAMPLE_RATES로 route별 샘플링 (5xx / LOG_SLOW_MS 이상 걸린 요청은 항상 기록)
+- SQL 로그는 engine echo 대신 DATABASE_ECHO=true일 때 sqlalchemy.engine 로거로 출력
+- gunicorn은 logconfig_dict로 같은 설정 사용 (gunicorn.py)
+"""
+
+import json
+import logging
+import logging.config
+import os
+import queue
+import random
+import sys
+import time
+import weakref
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# json 또는 text (로컬 개발용)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# 이 시간(ms) 이상 걸린 요청은 샘플링과 관계없이 기록
+LOG_SLOW_MS = float(os.getenv("LOG_SLOW_MS", "1000"))
+# route별 접근 로그 샘플링 비율 ("route=비율,..."), 없는 route는 LOG_SAMPLE_DEFAULT
+LOG_SAMPLE_DEFAULT = float(os.getenv("LOG_SAMPLE_DEFAULT", "1"))
+LOG_SAMPLE_RATES: Dict[str, float] = {
+    route.strip(): float(rate)
+    for route, _, rate in (
+        item.rpartition("=")
+        for item in os.getenv("LOG_SAMPLE_RATES", "/health=0,/ready=0").split(",")
+        if "=" in item
+    )
+}
+# SQL 로그 출력 (engine echo=True는 stdout에 직접 쓰므로 사용하지 않음)
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() == "true"
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(request_id)s %(message)s"
+REQUEST_ID_HEADER = b"x-request-id"
+REQUEST_ID_MAX_LENGTH = 64
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+access_logger = logging.getLogger("gunicorn.access")
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 필드)
+_RECORD_ATTRIBUTES = set(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None))
+) | {"message", "asctime", "request_id"}
+
+
+class RequestContextFilter(logging.Filter):
+    """로그를 남긴 요청의 request_id 기록 (queue에 넣기 전, 호출한 task에서)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체 (extra 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def build_formatter() -> logging.Formatter:
+    """LOG_FORMAT에 맞는 포매터 (dictConfig의 "()" 팩토리)"""
+    if LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+# fork된 워커에서 출력 스레드를 다시 시작할 핸들러
+_async_handlers: "weakref.WeakSet[AsyncStreamHandler]" = weakref.WeakSet()
+
+
+class AsyncStreamHandler(QueueHandler):
+    """
+    queue에 레코드만 넣는 핸들러 (출력 스레드가 포맷 / stream 쓰기)
+    - 호출한 쪽에서는 메시지 인자와 예외만 문자열로 만듦
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.addFilter(RequestContextFilter())
+        self._start()
+        _async_handlers.add(self)
+
+    def _start(self) -> None:
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        # JSON 변환은 출력 스레드에서
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 이 핸들러만 레코드를 쓰므로 복사하지 않고 그대로 넣음
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            formatter = self.target.formatter or logging.Formatter()
+            record.exc_text = formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def restart(self) -> None:
+        """fork된 자식 프로세스에서 출력 스레드 다시 시작 (부모의 스레드는 복제되지 않음)"""
+        self.queue = queue.SimpleQueue()
+        self._start()
+
+    def close(self) -> None:
+        # 남은 레코드를 모두 출력한 뒤 종료
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.target.close()
+        super().close()
+
+
+def _restart_handlers() -> None:
+    for handler in list(_async_handlers):
+        if handler.listener is not None:
+            handler.restart()
+
+
+# preload_app으로 마스터에서 설정한 핸들러를 워커에서도 사용
+os.register_at_fork(after_in_child=_restart_handlers)
+
+
+def logging_config(level: str = LOG_LEVEL) -> dict:
+    """dictConfig 설정 (앱과 gunicorn logconfig_dict에서 공통 사용)"""
+    handler = {"handlers": ["console"], "propagate": False}
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"default": {"()": "src.core.log.build_formatter"}},
+        "handlers": {
+            "console": {
+                "class": "src.core.log.AsyncStreamHandler",
+                "formatter": "default",
+            }
+        },
+        "root": {"level": level, "handlers": ["console"]},
+        "loggers": {
+            "gunicorn.error": {"level": level, **handler},
+            "gunicorn.access": {"level": "INFO", **handler},
+            "sqlalchemy.engine": {"level": "INFO" if DATABASE_ECHO else "WARNING"},
+        },
+    }
+
+
+def setup_logging() -> None:
+    """
+    앱 로그 설정
+    - gunicorn이 logconfig_dict로 이미 설정했으면 그대로 사용
+    - 접근 로그는 RequestLogMiddleware가 남기므로 uvicorn 접근 로그는 끔
+    """
+    root = logging.getLogger()
+    if not any(isinstance(handler, AsyncStreamHandler) for handler in root.handlers):
+        logging.config.dictConfig(logging_config())
+    logging.getLogger("uvicorn.access").disabled = True
+
+
+def sample_rate(route: str) -> float:
+    return LOG_SAMPLE_RATES.get(route, LOG_SAMPLE_DEFAULT)
+
+
+class RequestLogMiddleware:
+    """
+    request_id 지정 + 접근 로그 (ASGI 미들웨어)
+    - 가장 바깥에 두어 압축 / CORS를 포함한 전체 처리 시간 기록
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:REQUEST_ID_MAX_LENGTH]
+                break
+        if not request_id:
+            request_id = os.urandom(8).hex()
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            self._log(scope, status_code, (time.perf_counter() - started) * 1000)
+            request_id_var.reset(token)
+
+    def _log(self, scope, status_code: int, duration_ms: float) -> None:
+        if not access_logger.isEnabledFor(logging.INFO):
+            return
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        rate = sample_rate(route)
+        if (
+            rate < 1
+            and status_code < 500
+            and duration_ms < LOG_SLOW_MS
+            and random.random() >= rate
+        ):
+            return
+        client = scope.get("client")
+        access_logger.info(
+            "%s %s %d %.1fms",
+            scope["method"],
+            scope["path"],
+            status_code,
+            duration_ms,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 2),
+                "client": client[0] if client else None,
+                "sample_rate": rate,
+            },
+        )
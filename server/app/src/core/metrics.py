@@ -0,0 +1,61 @@
+"""
+지표 수집 (/metrics, Prometheus 텍스트 형식)
+=======================================
+
+각 구성 요소가 collector를 등록하면 /metrics 요청마다 현재 값을 읽어 출력합니다.
+- 값은 워커 프로세스별 (모든 지표에 pid 라벨), 수집은 Prometheus에서 워커 합산
+"""
+
+import os
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+Labels = Dict[str, str]
+
+
+class Metric(NamedTuple):
+    name: str
+    kind: str  # gauge / counter
+    help: str
+    samples: List[Tuple[Labels, float]]
+
+
+def gauge(name: str, help: str, value: float, **labels: str) -> Metric:
+    return Metric(name, "gauge", help, [(labels, value)])
+
+
+def counter(name: str, help: str, value: float, **labels: str) -> Metric:
+    return Metric(name, "counter", help, [(labels, value)])
+
+
+Collector = Callable[[], Iterable[Metric]]
+
+
+class MetricsRegistry:
+    """collector 목록 (워커 프로세스마다 하나)"""
+
+    def __init__(self):
+        self._collectors: List[Collector] = []
+
+    def register(self, collector: Collector) -> Collector:
+        """collector 등록 (데코레이터로 사용 가능)"""
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        pid = str(os.getpid())
+        lines = []
+        for collector in self._collectors:
+            for metric in collector():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for labels, value in metric.samples:
+                    label_text = ",".join(
+                        f'{key}="{label}"'
+                        for key, label in {**labels, "pid": pid}.items()
+                    )
+                    lines.append(f"{metric.name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# 전역 인스턴스
+metrics = MetricsRegistry()
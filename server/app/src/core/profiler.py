@@ -0,0 +1,217 @@
+"""
+실행 중인 워커 프로파일링
+=====================
+
+운영 중인 UvicornWorker에서 느린 요청의 원인을 찾기 위한 진단 도구입니다.
+프로파일링 중에만 비용이 발생하고, 평소에는 스레드 / 추적 기능을 켜지 않습니다.
+
+StackSampler (통계적 스택 샘플링):
+- 별도 스레드가 PROFILE_INTERVAL_MS마다 sys._current_frames()로 모든 스레드의 스택을 기록
+- 결과는 collapsed stack 형식 ("스레드;호출자;...;함수 (파일:줄) 횟수")
+  flamegraph.pl, speedscope, py-spy와 같은 형식이라 그대로 flamegraph로 변환 가능
+- 이벤트 루프 대기 / 유휴 스레드 스택은 기본적으로 제외 (idle=True면 포함)
+- uvloop 워커는 이벤트 루프가 C 코드라 루프 대기가 스택에 나타나지 않음
+
+memory_snapshot (tracemalloc):
+- seconds 동안 할당 추적 후 메모리 증가량 상위 위치 반환 (seconds=0이면 현재 사용량 상위)
+- 이미 추적 중이 아니었다면 끝난 뒤 추적을 끔
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+# tracemalloc이 할당마다 저장하는 스택 깊이 (깊을수록 느리고 메모리 사용 증가)
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "10"))
+
+# (파일 이름, 함수 이름): 가장 안쪽 프레임이 이것이면 유휴 상태
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("handlers.py", "dequeue"),
+}
+
+
+class ProfilerBusy(Exception):
+    """이 워커에서 이미 프로파일링 중인 경우"""
+
+
+def _short_path(path: str) -> str:
+    """site-packages / 표준 라이브러리 경로를 줄여서 표시"""
+    for marker in ("site-packages/", "dist-packages/"):
+        index = path.rfind(marker)
+        if index >= 0:
+            return path[index + len(marker) :]
+    prefix = os.path.dirname(os.__file__)
+    if path.startswith(prefix):
+        return path[len(prefix) + 1 :]
+    return os.path.relpath(path) if os.path.isabs(path) else path
+
+
+class StackSampler:
+    """모든 스레드의 스택을 주기적으로 기록 (start ~ stop 사이에만 스레드 실행)"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000, idle=False):
+        self.interval = interval
+        self.idle = idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._record(names.get(ident, str(ident)), frame)
+            self.samples += 1
+
+    def _label(self, code, lineno: int) -> str:
+        key = (code, lineno)
+        label = self._labels.get(key)
+        if label is None:
+            label = f"{code.co_qualname} ({_short_path(code.co_filename)}:{lineno})"
+            self._labels[key] = label
+        return label
+
+    def _record(self, thread_name: str, frame) -> None:
+        leaf = frame.f_code
+        if (
+            not self.idle
+            and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES
+        ):
+            return
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code, frame.f_lineno))
+            frame = frame.f_back
+        labels.append(thread_name)
+        self.stacks[";".join(reversed(labels))] += 1
+
+    def collapsed(self) -> str:
+        """collapsed stack 형식 (많이 나온 스택부터)"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class Profiler:
+    """워커 프로세스의 프로파일링 실행 (동시에 하나만)"""
+
+    def __init__(self, max_seconds: float = PROFILE_MAX_SECONDS):
+        self.max_seconds = max_seconds
+        self._lock = asyncio.Lock()
+
+    def _acquire(self) -> None:
+        if self._lock.locked():
+            raise ProfilerBusy()
+
+    async def sample_stacks(
+        self, seconds: float, interval: float, idle: bool = False
+    ) -> StackSampler:
+        """seconds 동안 스택 샘플링 (요청을 처리하는 이벤트 루프는 막지 않음)"""
+        self._acquire()
+        async with self._lock:
+            sampler = StackSampler(interval=interval, idle=idle)
+            sampler.start()
+            try:
+                await asyncio.sleep(min(seconds, self.max_seconds))
+            finally:
+                await asyncio.to_thread(sampler.stop)
+            return sampler
+
+    async def memory_snapshot(
+        self, seconds: float, limit: int, group_by: str = "lineno"
+    ) -> List[dict]:
+        """tracemalloc 메모리 할당 상위 위치 (seconds > 0이면 그 동안의 증가량 기준)
+
+        스냅샷 / 비교는 힙 크기에 비례해 수 초 걸릴 수 있으므로
+        이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        self._acquire()
+        async with self._lock:
+            started_here = not tracemalloc.is_tracing()
+            if started_here:
+                tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            try:
+                before = None
+                if seconds > 0:
+                    before = await asyncio.to_thread(_snapshot)
+                    await asyncio.sleep(min(seconds, self.max_seconds))
+                after = await asyncio.to_thread(_snapshot)
+            finally:
+                if started_here:
+                    await asyncio.to_thread(tracemalloc.stop)
+
+        return await asyncio.to_thread(_statistics, after, before, limit, group_by)
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    # tracemalloc / import 과정에서 생긴 할당은 제외
+    return tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        )
+    )
+
+
+def _statistics(
+    after: tracemalloc.Snapshot,
+    before: Optional[tracemalloc.Snapshot],
+    limit: int,
+    group_by: str,
+) -> List[dict]:
+    """스냅샷 통계 (before가 있으면 증가량 기준) → 응답용 dict 목록"""
+    if before is None:
+        statistics = after.statistics(group_by)[:limit]
+        return [_statistic(stat) for stat in statistics]
+    statistics = after.compare_to(before, group_by)[:limit]
+    return [
+        {
+            **_statistic(stat),
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+        }
+        for stat in statistics
+    ]
+
+
+def _statistic(stat) -> dict:
+    """tracemalloc.Statistic / StatisticDiff → 응답용 dict"""
+    return {
+        "traceback": [
+            f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback
+        ],
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+
+
+# 전역 인스턴스
+profiler = Profiler()
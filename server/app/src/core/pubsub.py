@@ -0,0 +1,117 @@
+"""
+상담 메시지 알림 Pub/Sub
+=====================
+
+새 메시지가 저장되면 세션 채널로 알림을 발행하고, long-poll 요청은 채널을 구독해
+새 메시지가 올 때까지 대기합니다.
+- 알림 전달은 공유 상태 저장소(core.shared_state)의 Pub/Sub을 사용
+  (SHARED_STATE_BACKEND=redis/mmap이면 모든 gunicorn 워커에 전달)
+- 워커마다 수신기 하나만 두고, 워커 내부 대기자들에게 다시 분배
+- 워커가 종료를 시작하면 대기자는 바로 깨어남 (core/shutdown.py)
+  → long-poll이 graceful_timeout을 넘겨 종료 작업 전에 워커가 강제 종료되지 않음
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from .shared_state import SharedState, shared_state
+from .shutdown import worker_shutdown
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "chat:session:"
+
+
+def session_channel(session_id: int) -> str:
+    """상담 세션 알림 채널 이름"""
+    return f"{CHANNEL_PREFIX}{session_id}"
+
+
+class Subscription:
+    """채널 구독 - 알림이 오면 깨어나는 대기자"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        # 다른 스레드(동기 엔드포인트의 threadpool)에서 발행해도 안전하도록
+        self.loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """알림이 오면 True, 시간 초과 / 워커 종료 시작이면 False"""
+        if worker_shutdown.stopping:
+            return False
+        notified = asyncio.ensure_future(self._event.wait())
+        stopping = asyncio.ensure_future(worker_shutdown.wait())
+        try:
+            await asyncio.wait(
+                (notified, stopping),
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            notified.cancel()
+            stopping.cancel()
+        if not self._event.is_set():
+            return False
+        self._event.clear()
+        return True
+
+
+class MessageBroker:
+    """공유 상태 Pub/Sub 위에서 동작하는 워커 내부 알림 분배기"""
+
+    def __init__(self, state: SharedState):
+        self.state = state
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def publish(self, channel: str, payload: str) -> None:
+        """채널에 알림 발행 (자기 워커의 대기자도 수신기를 통해 깨어남)"""
+        self.state.publish(channel, payload)
+
+    def _dispatch(self, channel: str) -> None:
+        for subscription in list(self._subscriptions.get(channel, ())):
+            subscription.notify()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for channel, _ in self.state.listen(CHANNEL_PREFIX):
+                    self._dispatch(channel)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Pub/Sub 수신 실패, 1초 후 재연결: {e}")
+                await asyncio.sleep(1.0)
+
+    def _ensure_listener(self) -> None:
+        # fork된 워커마다 자기 이벤트 루프에서 수신기를 시작
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        """
+        채널 구독
+        - 새 메시지를 조회하기 전에 구독해야 조회와 대기 사이의 알림을 놓치지 않음
+        """
+        self._ensure_listener()
+        subscription = Subscription(channel)
+        self._subscriptions.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscriptions.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+
+# 전역 인스턴스
+broker = MessageBroker(shared_state)
@@ -0,0 +1,215 @@
+"""
+의존성 상태 확인 (/ready)
+=======================
+
+/health는 프로세스가 살아 있는지만 확인하고 (liveness), /ready는 요청을 처리할 수 있는지 확인합니다.
+- 워커마다 백그라운드 task가 READINESS_CHECK_INTERVAL_SECONDS마다 의존성을 확인하고 결과를 저장
+- /ready는 저장된 결과만 반환 (프로브 요청이 DB / Redis에 직접 접근하지 않음)
+- 결과가 READINESS_STALE_SECONDS보다 오래되었거나 워커가 종료 중이면 준비되지 않음
+- 필수(required) 의존성이 하나라도 실패하면 503
+
+확인 대상:
+- database / shard-N: 풀과 별도의 연결로 SELECT 1 (풀이 가득 차도 DB 장애로 판단하지 않도록)
+- replicas: 복제본 상태 (실패해도 primary로 failover하므로 필수 아님)
+- shared_state: Redis / mmap 공유 상태 ping
+- secrets: 시작 시 AWS Secrets Manager 로드 결과 (실패 시 로컬 환경변수 사용, 필수 아님)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from .database.connection import engine, replica_router
+from .database.sharding import shard_router
+from .metrics import Metric, gauge, metrics
+from .secrets import secrets_status
+from .shared_state import shared_state
+
+logger = logging.getLogger(__name__)
+
+READINESS_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("READINESS_CHECK_INTERVAL_SECONDS", "5")
+)
+READINESS_CHECK_TIMEOUT_SECONDS = float(
+    os.getenv("READINESS_CHECK_TIMEOUT_SECONDS", "2")
+)
+READINESS_STALE_SECONDS = float(
+    os.getenv("READINESS_STALE_SECONDS", READINESS_CHECK_INTERVAL_SECONDS * 3)
+)
+
+# 정상이면 상태 설명(str 또는 dict), 실패하면 예외
+Check = Callable[[], object]
+
+
+class CheckResult(NamedTuple):
+    ok: bool
+    required: bool
+    detail: object
+    seconds: float
+    checked_at: float
+
+
+class ReadinessChecker:
+    """의존성 상태 확인 및 결과 저장 (워커 프로세스마다 하나)"""
+
+    def __init__(
+        self,
+        interval: float = READINESS_CHECK_INTERVAL_SECONDS,
+        timeout: float = READINESS_CHECK_TIMEOUT_SECONDS,
+        stale_after: float = READINESS_STALE_SECONDS,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.accepting = False
+        self.results: Dict[str, CheckResult] = {}
+        self._checks: Dict[str, tuple] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, check: Check, required: bool = True) -> None:
+        self._checks[name] = (check, required)
+
+    async def start(self) -> None:
+        """첫 확인을 끝낸 뒤 주기적 확인 task 시작 (lifespan startup)"""
+        await self.check_all()
+        self.accepting = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """종료 시작: 이후 /ready는 503 (core/shutdown.py 종료 시작 콜백)"""
+        self.accepting = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error(f"의존성 상태 확인 실패: {e}")
+
+    async def check_all(self) -> None:
+        results = await asyncio.gather(
+            *(self._check(check, required) for check, required in self._checks.values())
+        )
+        for name, result in zip(self._checks, results):
+            previous = self.results.get(name)
+            if previous is not None and previous.ok != result.ok:
+                log = logger.info if result.ok else logger.warning
+                log(f"의존성 상태 변경: {name} {'정상' if result.ok else '실패'}")
+            self.results[name] = result
+
+    async def _check(self, check: Check, required: bool) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            # 동기 드라이버 호출이 이벤트 루프를 막지 않도록 스레드에서 실행
+            detail = await asyncio.wait_for(
+                asyncio.to_thread(check), timeout=self.timeout
+            )
+            ok = True
+        except asyncio.TimeoutError:
+            ok, detail = False, f"timeout ({self.timeout}s)"
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        return CheckResult(
+            ok, required, detail, time.perf_counter() - started, time.time()
+        )
+
+    @property
+    def ready(self) -> bool:
+        if not self.accepting or not self.results:
+            return False
+        now = time.time()
+        return all(
+            result.ok and now - result.checked_at <= self.stale_after
+            for result in self.results.values()
+            if result.required
+        )
+
+    def status(self) -> dict:
+        """/ready 응답 (저장된 결과만 사용)"""
+        now = time.time()
+        return {
+            "status": "ready" if self.ready else "not_ready",
+            "accepting": self.accepting,
+            "checks": {
+                name: {
+                    "ok": result.ok,
+                    "required": result.required,
+                    "detail": result.detail,
+                    "latency_ms": round(result.seconds * 1000, 1),
+                    "age_seconds": round(now - result.checked_at, 1),
+                }
+                for name, result in self.results.items()
+            },
+        }
+
+
+def probe_database(source: Engine) -> Check:
+    """source와 같은 DB에 풀을 쓰지 않는 연결로 SELECT 1"""
+    probe = create_engine(source.url, poolclass=NullPool)
+
+    def check() -> str:
+        with probe.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return "ok"
+
+    return check
+
+
+def check_replicas() -> dict:
+    # 제외된 복제본도 복구되면 다시 사용
+    results = replica_router.check_health()
+    if not any(results.values()):
+        raise ConnectionError("no healthy replica")
+    return results
+
+
+def check_shared_state() -> str:
+    if not shared_state.ping():
+        raise ConnectionError("ping failed")
+    return type(shared_state).__name__
+
+
+def check_secrets() -> str:
+    if not secrets_status["secret_name"]:
+        return "skipped (SECRET_NAME not set)"
+    if not secrets_status["loaded"]:
+        raise RuntimeError(secrets_status["error"] or "not loaded")
+    return f"{secrets_status['keys']} keys"
+
+
+# 전역 인스턴스
+readiness_checker = ReadinessChecker()
+readiness_checker.register("database", probe_database(engine))
+for shard_no, shard_engine in enumerate(shard_router.engines):
+    readiness_checker.register(f"shard-{shard_no}", probe_database(shard_engine))
+if replica_router.replicas:
+    readiness_checker.register("replicas", check_replicas, required=False)
+readiness_checker.register("shared_state", check_shared_state)
+readiness_checker.register("secrets", check_secrets, required=False)
+
+
+@metrics.register
+def collect_readiness_metrics():
+    yield gauge(
+        "ready", "요청 처리 가능 여부 (1 = ready)", int(readiness_checker.ready)
+    )
+    yield Metric(
+        "dependency_up",
+        "gauge",
+        "의존성 상태 (마지막 확인 결과)",
+        [
+            ({"dependency": name}, int(result.ok))
+            for name, result in readiness_checker.results.items()
+        ],
+    )
@@ -1,6 +1,7 @@
 import boto3
 import json
 import logging
+import os
 from typing import Dict, Any, Optional
 from botocore.exceptions import ClientError, NoCredentialsError
 
@@ -111,3 +112,39 @@ class SecretsManager:
 
 # 전역 인스턴스
 secrets_manager = SecretsManager()
+
+
+# 시크릿 로드 결과 (readiness에서 사용, core/readiness.py)
+secrets_status: Dict[str, Any] = {
+    "secret_name": None,
+    "loaded": False,
+    "keys": 0,
+    "error": None,
+}
+
+
+def get_secret(secret_name: str) -> Dict[str, Any]:
+    """시크릿 전체 값 (전역 인스턴스 사용)"""
+    return secrets_manager.get_secret(secret_name)
+
+
+def get_secret_value(secret_name: str, key: str) -> str:
+    """시크릿의 특정 키 값 (전역 인스턴스 사용)"""
+    return secrets_manager.get_secret_value(secret_name, key)
+
+
+def load_secrets_to_env(secret_name: str) -> None:
+    """
+    시크릿의 모든 키를 환경변수로 설정합니다.
+    Args: secret_name: 시크릿 이름
+    """
+    secrets_status.update(secret_name=secret_name, loaded=False, keys=0, error=None)
+    try:
+        secret_dict = get_secret(secret_name)
+    except Exception as e:
+        secrets_status["error"] = str(e)
+        raise
+
+    for key, value in secret_dict.items():
+        os.environ[key] = str(value)
+    secrets_status.update(loaded=True, keys=len(secret_dict))
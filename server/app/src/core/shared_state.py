@@ -0,0 +1,602 @@
+"""
+워커 간 공유 상태 (Key/Value + TTL, 카운터, Pub/Sub)
+=============================================
+
+gunicorn은 여러 워커 프로세스를 띄우고 max_requests마다 재시작하므로, 프로세스 내부
+캐시/카운터는 워커마다 다르고 재시작하면 비어 있습니다. 이 모듈은 워커들이 함께 보는
+상태 저장소를 하나의 인터페이스로 제공합니다.
+
+- SHARED_STATE_BACKEND=redis: docker-compose의 redis 서비스 사용 (여러 호스트 가능)
+- SHARED_STATE_BACKEND=mmap: /dev/shm의 공유 메모리 파일 사용 (단일 호스트, 외부 의존성 없음)
+- SHARED_STATE_BACKEND=memory: 프로세스 내부 dict (개발 / 단일 워커용)
+
+값은 bytes로 저장합니다. mmap 백엔드는 고정 크기(512 bytes) 슬롯을 쓰므로
+카운터/플래그/작은 캐시 값에 적합합니다.
+"""
+
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "/dev/shm/intellius-shared-state")
+SHARED_STATE_SLOTS = int(os.getenv("SHARED_STATE_SLOTS", "8192"))
+SHARED_STATE_POLL_INTERVAL = float(os.getenv("SHARED_STATE_POLL_INTERVAL", "0.02"))
+
+
+class SharedState(ABC):
+    """워커 간 공유 상태 인터페이스"""
+
+    # 다른 프로세스와 공유되는 저장소인지 (memory면 워커 간 조정 용도로 쓸 수 없음)
+    shared = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """값 조회 (없거나 만료되면 None)"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """값 저장 (ttl 초 후 만료)"""
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """키가 없을 때만 저장 (저장했으면 True)"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """키 삭제"""
+
+    @abstractmethod
+    def compare_and_set(
+        self, key: str, expected: bytes, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        """현재 값이 expected일 때만 저장 (저장했으면 True, 임대 갱신용)"""
+
+    @abstractmethod
+    def compare_and_delete(self, key: str, expected: bytes) -> bool:
+        """현재 값이 expected일 때만 삭제 (삭제했으면 True, 임대 반환용)"""
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """카운터 증가 후 값 반환 (새로 만들어질 때만 ttl 적용)"""
+
+    @abstractmethod
+    def publish(self, channel: str, payload: str) -> None:
+        """채널에 메시지 발행"""
+
+    @abstractmethod
+    def listen(self, prefix: str) -> AsyncIterator[Tuple[str, str]]:
+        """prefix로 시작하는 채널의 (채널, 메시지)를 계속 수신"""
+
+    def ping(self) -> bool:
+        """저장소 연결 확인"""
+        return True
+
+
+class MemoryState(SharedState):
+    """프로세스 내부 공유 상태 (개발 / 단일 워커용)"""
+
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+        self._listeners: List[Tuple[str, asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+    def _alive(self, key: str) -> Optional[bytes]:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at and expires_at <= time.time():
+            del self._values[key]
+            return None
+        return value
+
+    def _expires_at(self, ttl: Optional[float]) -> float:
+        return time.time() + ttl if ttl else 0.0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._alive(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._values[key] = (value, self._expires_at(ttl))
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._alive(key) is not None:
+                return False
+            self._values[key] = (value, self._expires_at(ttl))
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def compare_and_set(
+        self, key: str, expected: bytes, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        with self._lock:
+            if self._alive(key) != expected:
+                return False
+            self._values[key] = (value, self._expires_at(ttl))
+            return True
+
+    def compare_and_delete(self, key: str, expected: bytes) -> bool:
+        with self._lock:
+            if self._alive(key) != expected:
+                return False
+            del self._values[key]
+            return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        with self._lock:
+            current = self._alive(key)
+            if current is None:
+                value, expires_at = amount, self._expires_at(ttl)
+            else:
+                value, expires_at = int(current) + amount, self._values[key][1]
+            self._values[key] = (str(value).encode(), expires_at)
+            return value
+
+    def publish(self, channel: str, payload: str) -> None:
+        for prefix, loop, queue in list(self._listeners):
+            if channel.startswith(prefix):
+                loop.call_soon_threadsafe(queue.put_nowait, (channel, payload))
+
+    async def listen(self, prefix: str) -> AsyncIterator[Tuple[str, str]]:
+        listener = (prefix, asyncio.get_running_loop(), asyncio.Queue())
+        self._listeners.append(listener)
+        try:
+            while True:
+                yield await listener[2].get()
+        finally:
+            self._listeners.remove(listener)
+
+
+class RedisState(SharedState):
+    """Redis 공유 상태 (docker-compose redis 서비스)"""
+
+    # 비교와 변경을 한 번에 실행하는 Lua 스크립트 (ARGV[3]: ttl 밀리초, 0이면 만료 없음)
+    COMPARE_AND_SET = """
+    if redis.call('get', KEYS[1]) ~= ARGV[1] then
+        return 0
+    end
+    if ARGV[3] == '0' then
+        redis.call('set', KEYS[1], ARGV[2])
+    else
+        redis.call('set', KEYS[1], ARGV[2], 'PX', ARGV[3])
+    end
+    return 1
+    """
+    COMPARE_AND_DELETE = """
+    if redis.call('get', KEYS[1]) ~= ARGV[1] then
+        return 0
+    end
+    return redis.call('del', KEYS[1])
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self.url = url
+        # redis-py 연결 풀은 fork 후 자식 프로세스에서 자동으로 다시 연결됨
+        self._client = redis.Redis.from_url(url)
+        self._compare_and_set = self._client.register_script(self.COMPARE_AND_SET)
+        self._compare_and_delete = self._client.register_script(self.COMPARE_AND_DELETE)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(
+            self._client.set(key, value, px=int(ttl * 1000) if ttl else None, nx=True)
+        )
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def compare_and_set(
+        self, key: str, expected: bytes, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        return bool(
+            self._compare_and_set(
+                keys=[key], args=[expected, value, int(ttl * 1000) if ttl else 0]
+            )
+        )
+
+    def compare_and_delete(self, key: str, expected: bytes) -> bool:
+        return bool(self._compare_and_delete(keys=[key], args=[expected]))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        value = self._client.incrby(key, amount)
+        if ttl and value == amount:
+            self._client.pexpire(key, int(ttl * 1000), nx=True)
+        return value
+
+    def publish(self, channel: str, payload: str) -> None:
+        self._client.publish(channel, payload)
+
+    async def listen(self, prefix: str) -> AsyncIterator[Tuple[str, str]]:
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.psubscribe(f"{prefix}*")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        yield (
+                            message["channel"].decode("utf-8"),
+                            message["data"].decode("utf-8"),
+                        )
+        finally:
+            await client.aclose()
+
+    def ping(self) -> bool:
+        return bool(self._client.ping())
+
+
+class MmapState(SharedState):
+    """
+    공유 메모리(mmap) 공유 상태 (단일 호스트)
+
+    파일 구조:
+    - 헤더: magic, 슬롯 수, Pub/Sub 발행 순번
+    - 슬롯 영역: 선형 탐사(open addressing) 해시 테이블, 슬롯마다 고정 크기
+      삭제 / 만료된 슬롯은 tombstone을 남기지 않고 backward-shift로 비움
+      → 짧게 쓰이는 키가 계속 바뀌어도 탐사 길이는 살아 있는 키 수에만 비례
+      항목은 home 슬롯에서 MAX_PROBES 이내에만 저장 (조회 비용 상한)
+      쓰기마다 SWEEP_SLOTS개 슬롯을 차례로 확인해 탐사되지 않는 만료 항목도 회수
+    - 링 버퍼: 최근 RING_SIZE개의 Pub/Sub 메시지 (워커들이 주기적으로 확인)
+
+    모든 변경은 flock(프로세스 간) + threading.Lock(스레드 간)으로 직렬화합니다.
+    gunicorn preload_app으로 fork된 워커가 부모와 같은 파일 디스크립터(같은 flock)를
+    공유하지 않도록, 프로세스마다 파일을 다시 엽니다.
+    """
+
+    MAGIC = b"INTLST01"
+    HEADER = struct.Struct("<8sIIQ")  # magic, slots, ring_size, ring_seq
+    HEADER_SIZE = 64
+    SLOT_HEADER = struct.Struct(
+        "<BxxxIdHH"
+    )  # state, hash, expires_at, key_len, value_len
+    SLOT_SIZE = 512
+    RING_SIZE = 1024
+    RING_HEADER = struct.Struct("<QHH")  # seq, channel_len, payload_len
+    RING_ENTRY_SIZE = 256
+
+    # DELETED는 이전 버전이 남긴 tombstone (읽을 때 만료된 항목처럼 비움)
+    EMPTY, USED, DELETED = 0, 1, 2
+    MAX_PROBES = 256
+    SWEEP_SLOTS = 8
+
+    def __init__(self, path: str, slots: int):
+        self.path = path
+        self.slots = slots
+        self.size = (
+            self.HEADER_SIZE
+            + self.slots * self.SLOT_SIZE
+            + self.RING_SIZE * self.RING_ENTRY_SIZE
+        )
+        self._ring_offset = self.HEADER_SIZE + self.slots * self.SLOT_SIZE
+        self.max_probes = min(self.slots, self.MAX_PROBES)
+        self._sweep_cursor = 0
+        self._thread_lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+
+    # --- 파일 / 잠금 ---
+
+    def _open(self) -> None:
+        if self._pid == os.getpid():
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+            memory = mmap.mmap(fd, self.size)
+            magic, slots, ring_size, _ = self.HEADER.unpack_from(memory, 0)
+            if magic != self.MAGIC:
+                self.HEADER.pack_into(
+                    memory, 0, self.MAGIC, self.slots, self.RING_SIZE, 0
+                )
+            elif slots != self.slots or ring_size != self.RING_SIZE:
+                raise RuntimeError(
+                    f"공유 상태 파일 '{self.path}'의 슬롯 구성이 다릅니다. "
+                    "모든 워커를 재시작하고 파일을 삭제하세요."
+                )
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd, self._map, self._pid = fd, memory, os.getpid()
+
+    class _Locked:
+        def __init__(self, state: "MmapState"):
+            self.state = state
+
+        def __enter__(self):
+            self.state._thread_lock.acquire()
+            try:
+                self.state._open()
+                fcntl.flock(self.state._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self.state._thread_lock.release()
+                raise
+            return self.state._map
+
+        def __exit__(self, *exc):
+            fcntl.flock(self.state._fd, fcntl.LOCK_UN)
+            self.state._thread_lock.release()
+
+    def _locked(self) -> "_Locked":
+        return self._Locked(self)
+
+    # --- 해시 테이블 ---
+
+    def _slot_offset(self, index: int) -> int:
+        return self.HEADER_SIZE + index * self.SLOT_SIZE
+
+    def _find(self, memory, key: bytes) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (키가 있는 슬롯, 새로 쓸 수 있는 슬롯) 반환
+        - 탐사 중 만난 만료 / tombstone 슬롯은 그 자리에서 비움 (backward-shift)
+        - home 슬롯에서 max_probes 안에 빈 슬롯이 없으면 쓸 수 있는 슬롯은 None
+        """
+        key_hash = zlib.crc32(key)
+        now = time.time()
+        probe = 0
+        while probe < self.max_probes:
+            index = (key_hash + probe) % self.slots
+            offset = self._slot_offset(index)
+            state, slot_hash, expires_at, key_len, _ = self.SLOT_HEADER.unpack_from(
+                memory, offset
+            )
+            if state == self.EMPTY:
+                return None, index
+            if state == self.DELETED or (expires_at and expires_at <= now):
+                # 뒤의 항목이 이 슬롯으로 당겨질 수 있으므로 같은 슬롯을 다시 확인
+                self._remove(memory, index)
+                continue
+            data_offset = offset + self.SLOT_HEADER.size
+            if (
+                slot_hash == key_hash
+                and memory[data_offset : data_offset + key_len] == key
+            ):
+                return index, None
+            probe += 1
+        return None, None
+
+    def _remove(self, memory, index: int) -> None:
+        """
+        슬롯을 비우고 같은 클러스터의 뒤 항목을 앞으로 당김 (backward-shift deletion)
+        - home 슬롯보다 앞으로는 옮기지 않으므로 모든 항목이 탐사 경로 안에 남음
+        """
+        hole = index
+        for step in range(1, self.slots):
+            current = (index + step) % self.slots
+            offset = self._slot_offset(current)
+            state, slot_hash, _, _, _ = self.SLOT_HEADER.unpack_from(memory, offset)
+            if state == self.EMPTY:
+                break
+            home = slot_hash % self.slots
+            if (current - home) % self.slots >= (current - hole) % self.slots:
+                hole_offset = self._slot_offset(hole)
+                memory[hole_offset : hole_offset + self.SLOT_SIZE] = memory[
+                    offset : offset + self.SLOT_SIZE
+                ]
+                hole = current
+        memory[self._slot_offset(hole)] = self.EMPTY
+
+    def _sweep(self, memory) -> None:
+        """다음 SWEEP_SLOTS개 슬롯의 만료 / tombstone 항목 회수 (워커마다 다른 위치부터)"""
+        now = time.time()
+        for _ in range(self.SWEEP_SLOTS):
+            index = self._sweep_cursor
+            state, _, expires_at, _, _ = self.SLOT_HEADER.unpack_from(
+                memory, self._slot_offset(index)
+            )
+            if state == self.DELETED or (
+                state == self.USED and expires_at and expires_at <= now
+            ):
+                # 당겨진 항목을 다음 차례에 다시 확인하도록 커서를 옮기지 않음
+                self._remove(memory, index)
+            else:
+                self._sweep_cursor = (index + 1) % self.slots
+
+    def _read(self, memory, index: int) -> bytes:
+        offset = self._slot_offset(index)
+        _, _, _, key_len, value_len = self.SLOT_HEADER.unpack_from(memory, offset)
+        start = offset + self.SLOT_HEADER.size + key_len
+        return bytes(memory[start : start + value_len])
+
+    def _expires(self, memory, index: int) -> float:
+        return self.SLOT_HEADER.unpack_from(memory, self._slot_offset(index))[2]
+
+    def _write(self, memory, index, key: bytes, value: bytes, expires_at: float):
+        if self.SLOT_HEADER.size + len(key) + len(value) > self.SLOT_SIZE:
+            raise ValueError(
+                f"mmap 공유 상태 값이 너무 큽니다 (key+value 최대 "
+                f"{self.SLOT_SIZE - self.SLOT_HEADER.size} bytes)"
+            )
+        if index is None:
+            raise RuntimeError(
+                "mmap 공유 상태 슬롯이 가득 찼습니다. SHARED_STATE_SLOTS를 늘리세요."
+            )
+        offset = self._slot_offset(index)
+        data_offset = offset + self.SLOT_HEADER.size
+        memory[data_offset : data_offset + len(key) + len(value)] = key + value
+        self.SLOT_HEADER.pack_into(
+            memory,
+            offset,
+            self.USED,
+            zlib.crc32(key),
+            expires_at,
+            len(key),
+            len(value),
+        )
+
+    def _expires_at(self, ttl: Optional[float]) -> float:
+        return time.time() + ttl if ttl else 0.0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._locked() as memory:
+            index, _ = self._find(memory, key.encode())
+            return None if index is None else self._read(memory, index)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        encoded = key.encode()
+        with self._locked() as memory:
+            self._sweep(memory)
+            index, free = self._find(memory, encoded)
+            self._write(
+                memory,
+                index if index is not None else free,
+                encoded,
+                value,
+                self._expires_at(ttl),
+            )
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        encoded = key.encode()
+        with self._locked() as memory:
+            self._sweep(memory)
+            index, free = self._find(memory, encoded)
+            if index is not None:
+                return False
+            self._write(memory, free, encoded, value, self._expires_at(ttl))
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._locked() as memory:
+            index, _ = self._find(memory, key.encode())
+            if index is not None:
+                self._remove(memory, index)
+
+    def compare_and_set(
+        self, key: str, expected: bytes, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        encoded = key.encode()
+        with self._locked() as memory:
+            index, _ = self._find(memory, encoded)
+            if index is None or self._read(memory, index) != expected:
+                return False
+            self._write(memory, index, encoded, value, self._expires_at(ttl))
+            return True
+
+    def compare_and_delete(self, key: str, expected: bytes) -> bool:
+        with self._locked() as memory:
+            index, _ = self._find(memory, key.encode())
+            if index is None or self._read(memory, index) != expected:
+                return False
+            self._remove(memory, index)
+            return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        encoded = key.encode()
+        with self._locked() as memory:
+            self._sweep(memory)
+            index, free = self._find(memory, encoded)
+            if index is None:
+                value, expires_at, index = amount, self._expires_at(ttl), free
+            else:
+                value = int(self._read(memory, index)) + amount
+                expires_at = self._expires(memory, index)
+            self._write(memory, index, encoded, str(value).encode(), expires_at)
+            return value
+
+    # --- Pub/Sub 링 버퍼 ---
+
+    def _ring_seq(self, memory) -> int:
+        return self.HEADER.unpack_from(memory, 0)[3]
+
+    def publish(self, channel: str, payload: str) -> None:
+        encoded_channel, encoded_payload = channel.encode(), payload.encode()
+        if (
+            self.RING_HEADER.size + len(encoded_channel) + len(encoded_payload)
+            > self.RING_ENTRY_SIZE
+        ):
+            raise ValueError("mmap Pub/Sub 메시지가 너무 큽니다.")
+
+        with self._locked() as memory:
+            seq = self._ring_seq(memory) + 1
+            offset = self._ring_offset + (seq % self.RING_SIZE) * self.RING_ENTRY_SIZE
+            data_offset = offset + self.RING_HEADER.size
+            data = encoded_channel + encoded_payload
+            memory[data_offset : data_offset + len(data)] = data
+            self.RING_HEADER.pack_into(
+                memory, offset, seq, len(encoded_channel), len(encoded_payload)
+            )
+            self.HEADER.pack_into(
+                memory, 0, self.MAGIC, self.slots, self.RING_SIZE, seq
+            )
+
+    def _read_ring(self, last_seq: int) -> Tuple[int, List[Tuple[str, str]]]:
+        with self._locked() as memory:
+            seq = self._ring_seq(memory)
+            # 링 버퍼 크기보다 뒤처진 메시지는 덮어써졌으므로 건너뜀
+            start = max(last_seq + 1, seq - self.RING_SIZE + 1)
+            messages = []
+            for current in range(start, seq + 1):
+                offset = (
+                    self._ring_offset
+                    + (current % self.RING_SIZE) * self.RING_ENTRY_SIZE
+                )
+                _, channel_len, payload_len = self.RING_HEADER.unpack_from(
+                    memory, offset
+                )
+                data_offset = offset + self.RING_HEADER.size
+                channel = bytes(memory[data_offset : data_offset + channel_len])
+                payload = bytes(
+                    memory[
+                        data_offset
+                        + channel_len : data_offset
+                        + channel_len
+                        + payload_len
+                    ]
+                )
+                messages.append((channel.decode(), payload.decode()))
+            return seq, messages
+
+    async def listen(self, prefix: str) -> AsyncIterator[Tuple[str, str]]:
+        # 구독 시점 이후의 메시지만 전달
+        last_seq, _ = self._read_ring(last_seq=2**63)
+        while True:
+            await asyncio.sleep(SHARED_STATE_POLL_INTERVAL)
+            last_seq, messages = self._read_ring(last_seq)
+            for channel, payload in messages:
+                if channel.startswith(prefix):
+                    yield channel, payload
+
+    def ping(self) -> bool:
+        with self._locked():
+            return True
+
+
+def create_shared_state() -> SharedState:
+    if SHARED_STATE_BACKEND == "redis":
+        return RedisState(REDIS_URL)
+    if SHARED_STATE_BACKEND == "mmap":
+        return MmapState(SHARED_STATE_PATH, SHARED_STATE_SLOTS)
+    return MemoryState()
+
+
+# 전역 인스턴스
+shared_state = create_shared_state()
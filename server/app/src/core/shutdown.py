@@ -0,0 +1,81 @@
+"""
+워커 종료 시작 알림
+===============
+
+uvicorn은 종료 신호(SIGTERM / max_requests)를 받으면 먼저 진행 중인 연결이 끝나기를 기다리고,
+그 다음에야 lifespan shutdown을 실행합니다. lifespan에서만 종료를 처리하면
+- long-poll처럼 오래 열린 요청 때문에 graceful_timeout이 지나 종료 작업 전에 강제 종료되고
+- 새 요청 거절 / 종료 작업 시간 계산이 연결 대기가 끝난 뒤에야 시작됩니다.
+
+그래서 gunicorn worker(core/workers.py)가 서버 종료를 시작할 때 begin()을 호출합니다.
+- on_begin()으로 등록한 콜백 실행 (/ready 503, 새 /send 거절)
+- wait()로 기다리는 요청(long-poll)은 바로 응답
+- 진행 중인 요청은 WORKER_REQUEST_DRAIN_SECONDS까지만 기다림 (uvicorn timeout_graceful_shutdown)
+- lifespan 종료 작업은 remaining()으로 종료 시작부터 남은 시간을 계산
+
+uvicorn 단독 실행 / TestClient에서는 lifespan shutdown에서 begin()을 호출합니다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 종료 시작부터 프로세스가 끝나야 하는 시간 (gunicorn graceful_timeout)
+WORKER_SHUTDOWN_SECONDS = float(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# 진행 중인 요청을 기다리는 시간 (남은 시간은 응답 대기 / 버퍼 저장 등 lifespan 종료 작업)
+WORKER_REQUEST_DRAIN_SECONDS = float(
+    os.getenv("WORKER_REQUEST_DRAIN_SECONDS", max(WORKER_SHUTDOWN_SECONDS - 15, 1))
+)
+
+
+class WorkerShutdown:
+    """워커 종료 시작 시각 / 알림 (워커 프로세스마다 하나)"""
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self._event = asyncio.Event()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def stopping(self) -> bool:
+        return self.started_at is not None
+
+    def on_begin(self, callback: Callable[[], None]) -> None:
+        """종료를 시작할 때 실행할 콜백 등록"""
+        self._callbacks.append(callback)
+
+    def reset(self) -> None:
+        """워커 시작 (lifespan startup, 같은 프로세스에서 앱을 다시 시작하는 테스트 포함)"""
+        self.started_at = None
+        self._event = asyncio.Event()
+
+    def begin(self) -> None:
+        """종료 시작 (여러 번 호출해도 처음 한 번만 실행)"""
+        if self.stopping:
+            return
+        self.started_at = time.monotonic()
+        self._event.set()
+        logger.info(f"워커 종료 시작 (pid={os.getpid()})")
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"워커 종료 콜백 실패: {e}")
+
+    async def wait(self) -> None:
+        """종료가 시작될 때까지 대기"""
+        await self._event.wait()
+
+    def remaining(self, seconds: float) -> float:
+        """종료 시작부터 seconds가 지날 때까지 남은 시간 (시작 전이면 seconds)"""
+        if self.started_at is None:
+            return seconds
+        return max(self.started_at + seconds - time.monotonic(), 0.0)
+
+
+# 전역 인스턴스
+worker_shutdown = WorkerShutdown()
@@ -0,0 +1,60 @@
+"""
+gunicorn worker 클래스
+===================
+
+UvicornWorker는 uvloop / httptools가 설치되어 있으면 자동으로 사용합니다 (loop/http = auto).
+벤치마크에서 이벤트 루프 / HTTP 파서 조합을 비교할 수 있도록 고정한 worker 클래스입니다.
+- gunicorn.py의 WORKER_TYPE으로 선택 (scripts/bench-workers.py 참고)
+
+모든 worker는 종료를 graceful_timeout 안에 끝내도록 설정합니다 (core/shutdown.py).
+- 서버가 종료를 시작하면 바로 앱에 알림 (연결이 모두 끝나기를 기다리지 않음)
+- 진행 중인 요청은 WORKER_REQUEST_DRAIN_SECONDS까지만 기다리고 취소
+  (uvicorn 기본값은 무제한 → graceful_timeout이 지나 lifespan 종료 전에 강제 종료됨)
+"""
+
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from .shutdown import WORKER_REQUEST_DRAIN_SECONDS, worker_shutdown
+
+
+class NotifyingServer(Server):
+    """종료를 시작할 때 (연결 대기 전) 앱에 알리는 uvicorn 서버"""
+
+    async def shutdown(self, sockets=None) -> None:
+        worker_shutdown.begin()
+        await super().shutdown(sockets=sockets)
+
+
+class GracefulUvicornWorker(UvicornWorker):
+    """UvicornWorker + 종료 시작 알림 / 요청 대기 시간 제한"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = min(
+            WORKER_REQUEST_DRAIN_SECONDS, self.cfg.graceful_timeout
+        )
+
+    async def _serve(self) -> None:
+        # UvicornWorker._serve와 같고 Server만 NotifyingServer로 변경
+        self.config.app = self.wsgi
+        server = NotifyingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+
+class AsyncioH11Worker(GracefulUvicornWorker):
+    """표준 asyncio 루프 + 순수 Python HTTP 파서 (h11)"""
+
+    CONFIG_KWARGS = {"loop": "asyncio", "http": "h11"}
+
+
+class UvloopHttptoolsWorker(GracefulUvicornWorker):
+    """uvloop 루프 + httptools HTTP 파서 (uvicorn[standard] 필요)"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
@@ -1,41 +1,102 @@
+import asyncio
 import logging
-from tracemalloc import Statistic
+from contextlib import asynccontextmanager
 import redis
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 import os
 
 from .core.model import Base
 from .apps.router import api_router as api_router_v1
-from .core.database.connection import engine
-from .core.secrets import load_secrets_to_env, get_secret_value
+from .core.database.connection import engine, replica_engines
+from .core.database.pool import warm_up
+from .core.database.sharding import shard_router
+from .apps.repository.chat import message_write_buffer
+from .core.database.write_buffer import WRITE_BUFFER_DRAIN_SECONDS
+from .apps.service.message_window import message_windows
+from .apps.service.reply import REPLY_DRAIN_SECONDS, reply_service
+from .core.http import setup_compression
+from .core.ids import id_generator
+from .core.idempotency import idempotency_store
+from .core.load import LoadSheddingMiddleware, Priority, load_priority, loop_lag_monitor
+from .core.log import RequestLogMiddleware, setup_logging
+from .core.metrics import counter, gauge, metrics
+from .core.readiness import readiness_checker
+from .core.secrets import load_secrets_to_env
+from .core.shutdown import worker_shutdown
+
+# 구조화 로그 설정 (gunicorn에서 실행하면 logconfig_dict 설정 사용)
+setup_logging()
+logger = logging.getLogger(__name__)
 
 # AWS Secrets Manager에서 시크릿 로드
 try:
     # 환경변수에서 시크릿 이름 가져오기 (기본값: intellius-secrets)
     secret_name = os.getenv("SECRET_NAME", None)
     if not secret_name:
-        print("❌ SECRET_NAME 환경변수가 설정되지 않았습니다.")
         raise Exception("❌ SECRET_NAME 환경변수가 설정되지 않았습니다.")
-    print(f"시크릿 '{secret_name}'에서 환경변수 로드 시작")
+    logger.info(f"시크릿 '{secret_name}'에서 환경변수 로드 시작")
     load_secrets_to_env(secret_name)
-    print(f"시크릿 '{secret_name}'에서 환경변수 로드 완료")
+    logger.info(f"시크릿 '{secret_name}'에서 환경변수 로드 완료")
 except Exception as e:
-    print(f"시크릿 로드 실패: {e}")
-    print("로컬 환경변수 또는 .env 파일을 사용합니다.")
+    logger.warning(
+        f"시크릿 로드 실패: {e} (로컬 환경변수 또는 .env 파일을 사용합니다.)"
+    )
 
 # 데이터베이스 테이블 생성
 try:
     Base.metadata.create_all(bind=engine)
-    print("데이터베이스 테이블 생성 완료")
+    shard_router.create_tables()
+    logger.info("데이터베이스 테이블 생성 완료")
 except Exception as e:
-    print(f"데이터베이스 연결 실패: {e}")
-    print("Docker Compose로 데이터베이스 실행: docker-compose up -d database")
+    logger.error(
+        f"데이터베이스 연결 실패: {e} "
+        "(Docker Compose로 데이터베이스 실행: docker-compose up -d database)"
+    )
+
 
-app = FastAPI(title="Intellius Chat Service API", version="1.0.0", debug=True)
+# 서버가 종료를 시작하면 (진행 중인 요청을 기다리기 전에) /ready 503, 새 /send 거절
+worker_shutdown.on_begin(readiness_checker.stop)
+worker_shutdown.on_begin(reply_service.stop)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    worker_shutdown.reset()
+    # 워커 시작 (요청을 받기 전): ID 노드 임대 → DB 연결 미리 생성 → 의존성 상태 확인
+    await asyncio.to_thread(id_generator.start)
+    opened = await asyncio.to_thread(
+        warm_up, [engine, *replica_engines, *shard_router.engines]
+    )
+    logger.info(f"DB 연결 {opened}개 미리 생성")
+    await readiness_checker.start()
+    # 루프 지연 측정, 다른 워커가 끝내지 못한 AI 상담사 응답 처리 시작
+    loop_lag_monitor.start()
+    reply_service.start()
+    yield
+    # 워커 종료 (종료 시작부터 graceful_timeout 안에서, core/shutdown.py):
+    # 종료 시작 → /ready 503, 새 /send 거절, long-poll 응답 → 진행 중인 요청 대기 (uvicorn)
+    # → 진행 중인 응답 대기 / 재시도 큐 저장 → 버퍼에 남은 메시지 저장
+    # (gunicorn worker가 아니면 여기서 종료 시작)
+    worker_shutdown.begin()
+    await reply_service.drain(timeout=worker_shutdown.remaining(REPLY_DRAIN_SECONDS))
+    await message_write_buffer.drain(
+        timeout=max(worker_shutdown.remaining(WRITE_BUFFER_DRAIN_SECONDS), 1)
+    )
+    loop_lag_monitor.stop()
+    # 다음 워커가 바로 쓸 수 있도록 ID 노드 임대 반환 (마지막 메시지 저장 후)
+    id_generator.release()
+
+
+app = FastAPI(
+    title="Intellius Chat Service API", version="1.0.0", debug=True, lifespan=lifespan
+)
+
+# 과부하 시 낮은 우선순위 요청부터 503 (CORS 헤더가 붙도록 CORS 안쪽에 둠)
+app.add_middleware(LoadSheddingMiddleware, router=app.router)
 
 # CORS 설정
 app.add_middleware(
@@ -51,8 +112,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# 응답 압축 설정 (RESPONSE_COMPRESSION / COMPRESSION_MINIMUM_SIZE)
+setup_compression(app)
+
+# request_id / 접근 로그 (가장 바깥 미들웨어)
+app.add_middleware(RequestLogMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -60,19 +128,76 @@ async def root():
 
 
 @app.get("/health")
+@load_priority(Priority.CRITICAL)
 async def health_check():
+    """프로세스 동작 확인 (liveness, 의존성 상태는 /ready)"""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+@load_priority(Priority.CRITICAL)
+async def readiness_check():
+    """요청 처리 가능 여부 (readiness, 백그라운드에서 확인한 의존성 상태 반환)"""
+    return JSONResponse(
+        readiness_checker.status(), status_code=200 if readiness_checker.ready else 503
+    )
+
+
+@metrics.register
+def collect_app_metrics():
+    yield gauge(
+        "chat_reply_in_flight", "진행 중인 AI 상담사 응답 수", reply_service.in_flight
+    )
+    yield gauge(
+        "chat_write_buffer_pending",
+        "write-behind 버퍼에서 저장을 기다리는 메시지 수",
+        message_write_buffer.pending,
+    )
+    yield counter(
+        "chat_write_buffer_flushed_rows_total",
+        "write-behind 버퍼로 저장한 메시지 수",
+        message_write_buffer.flushed_rows,
+    )
+    yield counter(
+        "chat_write_buffer_flushed_batches_total",
+        "write-behind 버퍼의 묶음 저장 횟수",
+        message_write_buffer.flushed_batches,
+    )
+    yield counter(
+        "message_window_hits_total", "메시지 윈도우 캐시 적중", message_windows.hits
+    )
+    yield counter(
+        "message_window_misses_total",
+        "메시지 윈도우 캐시 미스",
+        message_windows.misses,
+    )
+    yield gauge(
+        "message_window_cached_messages",
+        "메시지 윈도우 캐시에 있는 메시지 수",
+        message_windows.cached_messages,
+    )
+    yield gauge(
+        "idempotency_in_flight",
+        "Idempotency-Key로 실행 중인 요청 수",
+        idempotency_store.in_flight,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+@load_priority(Priority.CRITICAL)
+async def metrics_endpoint():
+    """워커 지표 (Prometheus 텍스트 형식, 값은 요청을 처리한 워커 기준)"""
+    return metrics.render()
+
+
 @app.get("/secrets/test")
+@load_priority(Priority.LOW)
 async def test_secrets():
     """시크릿 테스트 엔드포인트 (개발용)"""
     try:
         secret_name = os.getenv("SECRET_NAME", None)
         if not secret_name:
-            print("❌ SECRET_NAME 환경변수가 설정되지 않았습니다.")
             raise Exception("❌ SECRET_NAME 환경변수가 설정되지 않았습니다.")
-        print(f"시크릿 '{secret_name}'에서 환경변수 로드 시작")
         from .core.secrets import get_secret
 
         # 시크릿에서 모든 키 가져오기 (값은 마스킹)
@@ -101,6 +226,7 @@ templates = Jinja2Templates(directory="templates")
 
 # 정적 파일 확인 페이지
 @app.get("/static-files", response_class=HTMLResponse)
+@load_priority(Priority.LOW)
 async def static_files_browser(request: Request):
     static_dir = "static"
     files = []
@@ -124,7 +250,11 @@ async def static_files_browser(request: Request):
 
 
 # 정적 파일 마운트
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount(
+    "/static",
+    load_priority(Priority.LOW)(StaticFiles(directory="static")),
+    name="static",
+)
 
 # template
 templates = Jinja2Templates(directory="templates")